@@ -0,0 +1,269 @@
+##############################################################################################
+# ApproximateLinkPrediction.py
+# Purpose: script estimates neighborhood similarity scores with MinHash signatures and LSH banding
+# version 1.0.0
+# date: 10.19.2026
+##############################################################################################
+
+
+# import module/script dependencies
+import argparse
+import random
+import time
+import networkx as nx
+import numpy as np
+import GraphLoader
+import LinkPrediction
+
+
+# prime modulus of the MinHash hash functions (h(x) = (a * x + b) mod PRIME)
+PRIME = 2 ** 31 - 1
+
+# number of hash functions evaluated at once when signatures are built
+HASH_CHUNK = 16
+
+# number of pairs whose signatures are compared at once
+PAIR_CHUNK = 100000
+
+
+
+class MinHashIndex:
+    '''
+    Class stores a MinHash signature of the neighborhood of every node of a graph. The probability that two nodes have
+    the same value in a row of their signatures is the Jaccard similarity of their neighborhoods, so the Jaccard
+    similarity (and from it the number of common neighbors) of any pair can be estimated from the signatures alone.
+    LSH banding splits the signatures into bands of rows: nodes whose rows agree in a whole band fall in the same bucket,
+    so the pairs which share a bucket in at least one band are the candidates most likely to be similar, found without
+    comparing every pair. A pair with similarity s becomes a candidate with probability 1 - (1 - s^rows)^bands.
+    :param graph: networkx graph or GraphLoader.CSRGraph (the undirected neighborhoods are used)
+    :param permutations: integer representing the number of hash functions (rows of each signature)
+    :param seed: integer used to seed the hash functions
+    '''
+
+    def __init__(self, graph, permutations=128, seed=None):
+        self.name, self.index, self.indptr, indices = GraphLoader.CSRArrays(graph)
+        self.indices = indices.astype(np.int64)
+        self.degree = np.diff(self.indptr).astype(np.int64)
+        self.permutations = permutations
+
+        rng = np.random.RandomState(seed)
+        a = rng.randint(1, PRIME, size=permutations).astype(np.int64)
+        b = rng.randint(0, PRIME, size=permutations).astype(np.int64)
+
+        # nodes without neighbors keep a signature of PRIME (larger than any hash value)
+        self.signatures = np.empty((len(self.degree), permutations), dtype=np.int64)
+        self.signatures.fill(PRIME)
+        active = np.flatnonzero(self.degree)
+
+        if len(active):
+            starts = self.indptr[active]
+
+            for start in xrange(0, permutations, HASH_CHUNK):
+                rows = slice(start, start + HASH_CHUNK)
+                hashed = (a[rows, None] * self.indices[None, :] + b[rows, None]) % PRIME
+                self.signatures[active, rows] = np.minimum.reduceat(hashed, starts, axis=1).T
+
+    def Pairs(self, edges):
+        '''
+        Function converts a list of edges into arrays of node integers.
+        :param edges: list of tuples
+        :return: tuple of two numpy arrays of integers storing the first and second node of each edge
+        '''
+        pairs = np.array([(self.index(u), self.index(v)) for u, v in edges], dtype=np.int64).reshape(-1, 2)
+
+        return pairs[:, 0], pairs[:, 1]
+
+    def Jaccard(self, first, second):
+        '''
+        Function estimates the Jaccard similarity of the neighborhoods of pairs of nodes as the fraction of the rows of
+        their signatures which agree. Pairs with a node without neighbors are given 0, as in LinkPrediction.Jaccard.
+        :param first: numpy array of integers representing the first node of each pair
+        :param second: numpy array of integers representing the second node of each pair
+        :return: numpy array of floats, one per pair
+        '''
+        scores = np.zeros(len(first))
+
+        for start in xrange(0, len(first), PAIR_CHUNK):
+            i, j = first[start:start + PAIR_CHUNK], second[start:start + PAIR_CHUNK]
+            agree = (self.signatures[i] == self.signatures[j]).sum(axis=1)
+            scores[start:start + PAIR_CHUNK] = agree / float(self.permutations)
+
+        scores[(self.degree[first] == 0) | (self.degree[second] == 0)] = 0.0
+
+        return scores
+
+    def CommonNeighbors(self, first, second, jaccard=None):
+        '''
+        Function estimates the number of common neighbors of pairs of nodes from their estimated Jaccard similarity J
+        and their degrees, using |N(u) & N(v)| = J * (|N(u)| + |N(v)|) / (1 + J).
+        :param first: numpy array of integers representing the first node of each pair
+        :param second: numpy array of integers representing the second node of each pair
+        :param jaccard: numpy array of the estimated Jaccard similarity of each pair (None estimates it)
+        :return: numpy array of floats, one per pair
+        '''
+        jaccard = self.Jaccard(first, second) if jaccard is None else jaccard
+
+        return jaccard * (self.degree[first] + self.degree[second]) / (1.0 + jaccard)
+
+    def Candidates(self, bands=32, max_bucket=None, include_edges=False):
+        '''
+        Function finds the pairs of nodes which fall in the same bucket in at least one band of their signatures.
+        Nodes without neighbors are never candidates.
+        :param bands: integer representing the number of bands (must divide the number of hash functions; more bands
+        of fewer rows find pairs with lower similarity, at the cost of more candidates)
+        :param max_bucket: integer representing the largest bucket whose pairs are generated (None generates every
+        bucket; large buckets are nodes with identical neighborhoods, e.g., leaves of the same hub, and add pairs
+        quadratically)
+        :param include_edges: boolean indicating whether pairs which are already edges of the graph are returned
+        :return: tuple of two numpy arrays of integers storing the first and second node of each pair (first < second)
+        '''
+        if self.permutations % bands:
+            raise ValueError(str(bands) + ' bands do not divide ' + str(self.permutations) + ' hash functions')
+
+        rows = self.permutations / bands
+        active = np.flatnonzero(self.degree)
+        weights = np.random.RandomState(0).randint(1, 2 ** 62, size=rows).astype(np.uint64)
+        found = []
+
+        for band in xrange(bands):
+            # the rows of the band are combined into one 64-bit bucket key per node
+            values = self.signatures[active, band * rows:(band + 1) * rows].astype(np.uint64)
+            keys = (values * weights).sum(axis=1) if rows > 1 else values[:, 0]
+            order = np.argsort(keys, kind='mergesort')
+            keys, nodes = keys[order], active[order]
+
+            # every node is paired with the nodes after it in its bucket
+            starts = np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1])
+            sizes = np.diff(np.concatenate([starts, [len(keys)]]))
+            ends = np.repeat(starts + sizes, sizes)
+
+            if max_bucket is not None:
+                ends = np.where(np.repeat(sizes, sizes) > max_bucket, np.arange(len(keys)) + 1, ends)
+
+            counts = ends - np.arange(len(keys)) - 1
+            total = int(counts.sum())
+
+            if total:
+                position = np.repeat(np.arange(len(keys)), counts)
+                partner = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + position + 1
+                i, j = nodes[position], nodes[partner]
+                found.append(np.unique(np.minimum(i, j) << 32 | np.maximum(i, j)))
+
+        pairs = np.unique(np.concatenate(found)) if found else np.zeros(0, dtype=np.int64)
+
+        if not include_edges:
+            source = np.repeat(np.arange(len(self.degree), dtype=np.int64), self.degree)
+            edges = np.minimum(source, self.indices) << 32 | np.maximum(source, self.indices)
+            pairs = pairs[~np.in1d(pairs, edges)]
+
+        return pairs >> 32, pairs & 0xFFFFFFFF
+
+
+def ApproximateScores(graph, edges=None, permutations=128, bands=32, threshold=0.0, max_bucket=None, seed=None):
+    '''
+    Function estimates the Jaccard and Common Neighbors scores of candidate edges from MinHash signatures (see
+    MinHashIndex). When no edges are given, the candidates are the non-edges found by LSH banding, which are far fewer
+    than nx.non_edges for a large graph and include most pairs with a high similarity.
+    :param graph: networkx graph or GraphLoader.CSRGraph
+    :param edges: list of tuples (None uses the non-edges found by LSH banding)
+    :param permutations: integer representing the number of hash functions
+    :param bands: integer representing the number of LSH bands
+    :param threshold: float representing the smallest estimated Jaccard similarity returned
+    :param max_bucket: integer representing the largest LSH bucket whose pairs are generated (None generates every
+    bucket)
+    :param seed: integer used to seed the hash functions
+    :return: a list of dictionaries: list[0] stores the estimated Jaccard scores and list[1] the estimated Common
+    Neighbors scores of the edges
+    '''
+    index = MinHashIndex(graph, permutations, seed)
+
+    if edges is None:
+        first, second = index.Candidates(bands, max_bucket)
+        edges = zip(map(index.name, first.tolist()), map(index.name, second.tolist()))
+    else:
+        edges = list(edges)
+        first, second = index.Pairs(edges)
+
+    jaccard = index.Jaccard(first, second)
+    common = index.CommonNeighbors(first, second, jaccard)
+    keep = np.flatnonzero(jaccard >= threshold).tolist()
+
+    return [dict([(edges[k], jaccard[k]) for k in keep]), dict([(edges[k], common[k]) for k in keep])]
+
+
+def Evaluate(graph, settings, threshold=0.5, sample=None, seed=0):
+    '''
+    Function measures the accuracy and speed of the estimates against the exact LinkPrediction.Jaccard and
+    LinkPrediction.CommonNeighbors scores of the non-edges of a graph.
+    :param graph: undirected networkx graph
+    :param settings: list of tuples storing the number of hash functions and the number of bands
+    :param threshold: float representing the Jaccard similarity of the pairs the LSH recall is measured for
+    :param sample: integer representing the number of non-edges scored exactly (None scores every non-edge)
+    :param seed: integer used to sample the non-edges and seed the hash functions
+    :return: list of dictionaries, one per setting, storing the time to build the signatures, find the LSH candidates,
+    and estimate the sampled non-edges, the mean absolute error of the Jaccard and Common Neighbors estimates, the
+    number of LSH candidates, and the fraction of the sampled non-edges with a Jaccard similarity of at least the
+    threshold which are LSH candidates (recall)
+    '''
+    edges = list(nx.non_edges(graph))
+    edges = random.Random(seed).sample(edges, sample) if sample is not None and sample < len(edges) else edges
+
+    start = time.time()
+    jaccard = LinkPrediction.Jaccard(graph, edges)
+    common = LinkPrediction.CommonNeighbors(graph, edges)
+    exact_time = time.time() - start
+    exact = np.array([jaccard[edge] for edge in edges])
+    exact_common = np.array([common[edge] for edge in edges])
+    results = []
+
+    for permutations, bands in settings:
+        start = time.time()
+        index = MinHashIndex(graph, permutations, seed)
+        build_time = time.time() - start
+
+        start = time.time()
+        first, second = index.Candidates(bands)
+        lsh_time = time.time() - start
+
+        start = time.time()
+        i, j = index.Pairs(edges)
+        estimate = index.Jaccard(i, j)
+        estimate_common = index.CommonNeighbors(i, j, estimate)
+        estimate_time = time.time() - start
+
+        similar = exact >= threshold
+        candidates = np.in1d(np.minimum(i, j) << 32 | np.maximum(i, j), first << 32 | second)
+
+        results.append({'permutations': permutations, 'bands': bands, 'candidates': len(first),
+                        'build_seconds': build_time, 'lsh_seconds': lsh_time, 'estimate_seconds': estimate_time,
+                        'exact_seconds': exact_time, 'jaccard_mae': float(np.mean(np.abs(estimate - exact))),
+                        'common_neighbors_mae': float(np.mean(np.abs(estimate_common - exact_common))),
+                        'recall': float(candidates[similar].mean()) if similar.any() else None})
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the accuracy and speed of MinHash/LSH estimates of the '
+                                                 'Jaccard and Common Neighbors scores against the exact scores.')
+    parser.add_argument('network', help='GML network file')
+    parser.add_argument('-s', '--settings', nargs='+', default=['64:16', '128:32', '128:16', '256:32'],
+                        help='hash functions:bands settings (default: 64:16 128:32 128:16 256:32)')
+    parser.add_argument('-t', '--threshold', type=float, default=0.5,
+                        help='Jaccard similarity of the pairs the LSH recall is measured for (default: 0.5)')
+    parser.add_argument('-n', '--sample', type=int, default=None, help='number of non-edges scored exactly')
+    parser.add_argument('-r', '--seed', type=int, default=0, help='seed of the sample and hash functions')
+    args = parser.parse_args()
+
+    graph = nx.read_gml(args.network).to_undirected()
+    settings = [tuple([int(x) for x in setting.split(':')]) for setting in args.settings]
+    columns = ['permutations', 'bands', 'candidates', 'recall', 'jaccard_mae', 'common_neighbors_mae',
+               'build_seconds', 'lsh_seconds', 'estimate_seconds', 'exact_seconds']
+
+    print '\t'.join(columns)
+    for result in Evaluate(graph, settings, args.threshold, args.sample, args.seed):
+        print '\t'.join([('%.4f' % result[x]) if isinstance(result[x], float) else str(result[x]) for x in columns])
+
+
+if __name__ == '__main__':
+    main()
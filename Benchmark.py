@@ -0,0 +1,453 @@
+##########################################################################################################
+# Benchmark.py
+# Purpose: script times the OWL-NETS pipeline on synthetic queries and query results and stores baselines
+# version 1.0.2
+# date: 10.19.2026
+##########################################################################################################
+
+
+## import module/script dependencies
+import argparse
+import json
+import os
+import random
+import sys
+import networkx as nx
+import BindingTable
+import EvaluationMetrics
+import GraphLoader
+import Instrumentation
+import LinkPrediction
+import LocalEndpoint
+import NETSRepresentation
+import NetworkInference
+import OWLRepresentation
+import QueryParser
+
+
+# prefixes used by the synthetic queries (mirror those used in Example_Data/Angiogenesis_query)
+PREFIXES = ['PREFIX obo: <http://purl.obolibrary.org/obo/>',
+            'PREFIX owl: <http://www.w3.org/2002/07/owl#>',
+            'PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>',
+            'PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>']
+
+NAMESPACES = {'obo': 'http://purl.obolibrary.org/obo/',
+              'owl': 'http://www.w3.org/2002/07/owl#',
+              'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+              'rdfs': 'http://www.w3.org/2000/01/rdf-schema#'}
+
+# relations used to connect NETS nodes
+PROPERTIES = ['obo:RO_0000057', 'obo:RO_0002331', 'obo:RO_0002434', 'obo:BFO_0000050']
+
+# benchmark scenarios - query shape and result set size
+SCENARIOS = {'small': dict(nets_nodes=3, restriction_depth=1, ice_depth=1, shape='chain', rows=1000, entities=100),
+             'medium': dict(nets_nodes=4, restriction_depth=2, ice_depth=1, shape='chain', rows=10000, entities=500),
+             'large': dict(nets_nodes=5, restriction_depth=2, ice_depth=2, shape='star', rows=50000, entities=2000)}
+
+# link prediction methods which are timed (the matrix methods are skipped unless requested)
+SCORERS = [('DegreeProduct', LinkPrediction.DegreeProduct),
+           ('ShortestPath', LinkPrediction.ShortestPath),
+           ('CommonNeighbors', LinkPrediction.CommonNeighbors),
+           ('AdamicAdar', LinkPrediction.AdamicAdar),
+           ('Jaccard', LinkPrediction.Jaccard),
+           ('LHN', LinkPrediction.LHN),
+           ('ResourceAllocation', LinkPrediction.ResourceAllocation),
+           ('Sorensen', LinkPrediction.Sorensen)]
+
+
+
+def SyntheticQuery(nets_nodes=3, restriction_depth=1, ice_depth=1, shape='chain'):
+    '''
+    Function generates the text of a SPARQL query with the structure expected by OWL-NETS. Each NETS node is denoted by
+    a chain of ice_depth IAO_0000219 (IAO:denotes) triples and pairs of NETS nodes are connected through
+    restriction_depth nested owl:Restriction classes. The NETS nodes are connected as a chain or as a star.
+    :param nets_nodes: integer representing the number of NETS nodes in the query
+    :param restriction_depth: integer representing the number of nested restrictions between connected NETS nodes
+    :param ice_depth: integer representing the number of IAO_0000219 triples used to denote each NETS node
+    :param shape: string indicating how the NETS nodes are connected ('chain' or 'star')
+    :return: string containing the SPARQL query
+    '''
+    triples = []
+
+    # NETS nodes and their ICEs
+    for i in range(nets_nodes):
+        node = '?node' + str(i)
+        triples.append([node, 'rdfs:subClassOf', 'obo:CHEBI_36080'])
+
+        for k in range(ice_depth):
+            triples.append([node + 'ICE' + str(k + 1), 'obo:IAO_0000219', node + 'ICE' + str(k) if k else node])
+
+    # restrictions connecting pairs of NETS nodes
+    if shape == 'star':
+        pairs = [(0, i) for i in range(1, nets_nodes)]
+    else:
+        pairs = [(i, i + 1) for i in range(nets_nodes - 1)]
+
+    for (i, j) in pairs:
+        edge = str(i) + '_' + str(j)
+        triples.append(['?anon' + edge + '_0', 'rdfs:subClassOf', '?node' + str(i)])
+
+        for k in range(restriction_depth):
+            rest = '?rest' + edge + '_' + str(k)
+            triples.append(['?anon' + edge + '_' + str(k), 'rdfs:subClassOf', rest])
+            triples.append([rest, 'owl:onProperty', PROPERTIES[(i + j + k) % len(PROPERTIES)]])
+            triples.append([rest, 'rdf:type', 'owl:Restriction'])
+
+            if k + 1 < restriction_depth:
+                triples.append([rest, 'owl:someValuesFrom', '?anon' + edge + '_' + str(k + 1)])
+            else:
+                triples.append([rest, 'owl:someValuesFrom', '?sub' + edge])
+
+        triples.append(['?sub' + edge, 'rdfs:subClassOf', '?node' + str(j)])
+
+    return '\n'.join(PREFIXES) + '\n\nSELECT DISTINCT *\n\nWHERE {\n\n' + \
+           ''.join([' ' + ' '.join(triple) + ' .\n' for triple in triples]) + '\n }'
+
+
+def QueryAnalysis(input1):
+    '''
+    Function runs the query analysis steps of NETSNetworkBuilder (parsing, NETS nodes, NETS edges, edge direction,
+    edge metadata, and query rewriting) for a query file.
+    :param input1: string containing file path/name for SPARQL query
+    :return: a list where list[0] is the list of NETS edges, list[1] is the NETS edge metadata, and list[2] is the
+    output of QueryParser.NETSQueryParser
+    '''
+    query_text = QueryParser.QueryParser(input1)
+    graph = NETSRepresentation.GraphMaker(query_text[0])
+    NETS_nodes = NETSRepresentation.NETSNodeFinder(graph)
+    keep = [node for node in graph.nodes() if graph.out_degree(node) > 0 or node in NETS_nodes]
+    sub_graph = graph.subgraph(keep)
+    NETS_edges = NETSRepresentation.NETSEdgeFinder(NETS_nodes, sub_graph)
+    NETS_edge_order = NETSRepresentation.EdgeDirection(graph, sub_graph, NETS_edges)
+
+    # metadata is built for the directed edges so that it covers the edges used by both builders
+    NETS_edge_metadata = NETSRepresentation.EdgeMetadata(graph, sub_graph, NETS_edge_order + NETS_edges)
+
+    return NETS_edge_order, NETS_edge_metadata, QueryParser.NETSQueryParser(query_text, NETS_nodes,
+                                                                            NETS_edge_metadata)
+
+
+def Expand(term):
+    '''
+    Function takes a prefixed name (e.g., obo:RO_0000057) and returns the full URI.
+    :param term: string containing a prefixed name
+    :return: string containing the full URI or the original string if it is not a known prefixed name
+    '''
+    prefix, _, name = term.partition(':')
+
+    return NAMESPACES[prefix] + name if prefix in NAMESPACES else term
+
+
+def SyntheticResults(input1, rows=1000, entities=100, seed=0):
+    '''
+    Function generates a SPARQL JSON result set for the rewritten version of a query. Values for the NETS nodes are
+    drawn from a pool of entities (so that entities are shared across rows and form a network), each NETS node entity
+    has its own ICE identifier and label, and all other variables are drawn from a pool of anonymous classes.
+    :param input1: string containing file path/name for SPARQL query
+    :param rows: integer representing the number of bindings in the result set
+    :param entities: integer representing the size of the pool of values for each variable
+    :param seed: integer used to seed the random number generator
+    :return: dictionary with the same structure as the SPARQL JSON result format
+    '''
+    rng = random.Random(seed)
+    NETS_edges, NETS_edge_metadata, updated_query_text = QueryAnalysis(input1)
+
+    # NETS nodes, their labels, and the ICEs denoting them
+    NETS = sorted(set([x.strip('?') for y in NETS_edges for x in y]))
+    labels = dict([(x.split(' ')[0].strip('?'), x.split(' ')[2].strip('?')) for x in updated_query_text[1]])
+    ids = dict([(x.split(' ')[2].strip('?'), x.split(' ')[0].strip('?')) for x in updated_query_text[2]])
+
+    # constants are bound to themselves, variables are drawn from the pool
+    constants = {}
+    variables = set(labels.values() + ids.values() + [x[-1].strip('?') for x in NETS_edge_metadata[0].values()])
+
+    for item in updated_query_text[3]:
+        if item.startswith('('):
+            constants[item.split('?')[-1].strip(')')] = Expand(item.strip('(').split(' ')[0])
+        else:
+            variables.add(item.strip('?'))
+
+    bindings = []
+
+    for row in xrange(rows):
+        res = {}
+
+        for var in sorted(variables):
+            res[var] = {'type': 'uri', 'value': 'http://purl.obolibrary.org/obo/' + var + '_' +
+                                                str(rng.randint(0, entities - 1))}
+
+        for node in NETS:
+            entity = str(rng.randint(0, entities - 1))
+            res[node] = {'type': 'uri', 'value': 'http://kabob.ucdenver.edu/bio/BIO_' + node + '_' + entity}
+            res[ids[node]] = {'type': 'uri', 'value': 'http://kabob.ucdenver.edu/iao/' + node + '_' + entity + '_ICE'}
+            res[labels[node]] = {'type': 'literal', 'value': node.upper() + entity}
+
+        for var in [x[-1].strip('?') for x in NETS_edge_metadata[0].values()]:
+            res[var] = {'type': 'literal', 'value': var.replace('_Name', '').replace('_', ' ')}
+
+        for var, value in constants.items():
+            res[var] = {'type': 'uri', 'value': value}
+
+        bindings.append(res)
+
+    return {'head': {'vars': sorted(bindings[0].keys())}, 'results': {'bindings': bindings}}
+
+
+def Triple(terms):
+    '''
+    Function takes a list of three SPARQL JSON result terms and returns an N-Triples statement.
+    :param terms: list of dictionaries storing the type and value of each term
+    :return: string containing the N-Triples statement
+    '''
+    statement = []
+
+    for term in terms:
+        if term['type'] == 'literal':
+            statement.append('"' + term['value'].replace('\\', '\\\\').replace('"', '\\"') + '"' +
+                             ('^^<' + term['datatype'] + '>' if 'datatype' in term else ''))
+        else:
+            statement.append('<' + term['value'] + '>')
+
+    return ' '.join(statement) + ' .\n'
+
+
+def SyntheticTriples(input1, results):
+    '''
+    Function generates the N-Triples needed for an endpoint to answer the rewritten version of a query with the
+    synthetic results. Each triple pattern of the query (including the node and edge label patterns added by OWL-NETS)
+    is instantiated with the values of every binding. Variables other than the NETS nodes, their ICEs, and labels are
+    made unique to each binding, so bindings do not join through shared anonymous classes. Bindings still join through
+    the NETS nodes they share, so the endpoint returns more results than there are bindings (e.g., about 11 times as
+    many for the small scenario); TimeEndpoint records the number of results.
+    :param input1: string containing file path/name for SPARQL query
+    :param results: dictionary with the same structure as the SPARQL JSON result format
+    :return: set of strings containing N-Triples statements
+    '''
+    NETS_edges, NETS_edge_metadata, updated_query_text = QueryAnalysis(input1)
+    query_text = QueryParser.QueryParser(input1)
+
+    # variables which are shared across bindings
+    shared = set([x.strip('?') for y in NETS_edges for x in y])
+    shared |= set([x.split(' ')[2].strip('?') for x in updated_query_text[1]])
+    shared |= set([x.split(' ')[0].strip('?') for x in updated_query_text[2]])
+    shared |= set([x[-1].strip('?') for x in NETS_edge_metadata[0].values()])
+
+    patterns = [x.split(' ')[0:3] for x in query_text[0] + updated_query_text[1]]
+    patterns += [x for x in NETS_edge_metadata[0].values()]
+
+    triples = set()
+
+    for row, res in enumerate(results['results']['bindings']):
+        for pattern in patterns:
+            terms = []
+
+            for item in pattern:
+                if item.startswith('?'):
+                    term = dict(res[item.strip('?')])
+                    if item.strip('?') not in shared and term['type'] == 'uri':
+                        term['value'] += '_' + str(row)
+                    terms.append(term)
+                elif ':' in item:
+                    terms.append({'type': 'uri', 'value': Expand(item.strip('*'))})
+                elif item.isdigit():
+                    terms.append({'type': 'literal', 'value': item,
+                                  'datatype': 'http://www.w3.org/2001/XMLSchema#integer'})
+                else:
+                    terms.append({'type': 'literal', 'value': item.strip('"')})
+
+            triples.add(Triple(terms))
+
+    return triples
+
+
+def WriteScenario(location, name, config):
+    '''
+    Function writes the synthetic query, query results, and the N-Triples fixture an endpoint (e.g., LocalEndpoint)
+    needs to answer the query for a benchmark scenario to disk. The results are written where the network builders
+    look for existing query results, so the endpoint is never contacted unless the results are removed.
+    :param location: string containing the directory where the files should be written
+    :param name: string containing the name of the scenario
+    :param config: dictionary of the query shape and result set size for the scenario
+    :return: string containing file path/name for the synthetic SPARQL query
+    '''
+    if not os.path.exists(location):
+        os.makedirs(location)
+
+    input1 = os.path.join(location, name + '_query')
+
+    with open(input1, 'w') as outfile:
+        outfile.write(SyntheticQuery(config['nets_nodes'], config['restriction_depth'], config['ice_depth'],
+                                     config['shape']))
+
+    results = SyntheticResults(input1, config['rows'], config['entities'])
+
+    BindingTable.FromJSON(results).Write(input1 + '_results.csv')
+
+    with open(input1 + '.nt', 'w') as outfile:
+        outfile.writelines(sorted(SyntheticTriples(input1, results)))
+
+    return input1
+
+
+def TimeEndpoint(input1, bindings):
+    '''
+    Function times the evaluation of the rewritten query of a benchmark scenario against its N-Triples fixture with
+    the LocalEndpoint triple store, and records the number of results the endpoint returns next to the number of
+    bindings of the synthetic results.
+    :param input1: string containing file path/name for SPARQL query
+    :param bindings: integer representing the number of bindings of the synthetic results
+    :return: an Instrumentation.PipelineProfiler storing a Query stage
+    '''
+    profiler = Instrumentation.PipelineProfiler()
+    store = LocalEndpoint.TripleStore()
+    store.Load(input1 + '.nt')
+
+    with profiler.Stage('Query') as stage:
+        variables, rows = store.Query(QueryAnalysis(input1)[2][0])
+        stage['rows'] = len(rows)
+        stage['bindings'] = bindings
+
+    print 'Endpoint results: ' + str(len(rows)) + ' (' + str(bindings) + ' synthetic bindings)'
+
+    return profiler
+
+
+def TimePrediction(input1, scorers, candidates, seed=0):
+    '''
+    Function times the link prediction scoring functions and evaluation metrics on the undirected version of the
+    OWL-NETS network built for a benchmark scenario. The non-existent edges are sampled so that the number of scored
+    pairs (and the run time of the benchmark) stays bounded. The evaluation metrics are timed on the scores of each
+    scoring function ("<scorer> AUC" and "<scorer> KPrecision"), as their run time depends on the number of scores.
+    :param input1: string containing file path/name for SPARQL query
+    :param scorers: list of tuples where tuple[0] is the name of a scoring function and tuple[1] is the function
+    :param candidates: integer representing the maximum number of non-existent edges to score
+    :param seed: integer used to seed the random number generator used to sample testing edges
+    :return: an Instrumentation.PipelineProfiler storing a stage for each scoring function and for each evaluation
+    metric of each scoring function
+    '''
+    random.seed(seed)
+    profiler = Instrumentation.PipelineProfiler()
+    network = GraphLoader.LoadGraph(input1 + '_NETS_network.json')[1].to_undirected()
+    nonexist_edges = list(nx.non_edges(network))
+    nonexist_edges = random.sample(nonexist_edges, min(candidates, len(nonexist_edges)))
+    training_graph, testing_edges = NetworkInference.GraphMaker(network, 0.7)
+
+    for name, scorer in scorers:
+        with profiler.Stage(name) as stage:
+            missing_scores = scorer(training_graph, testing_edges)
+            nonexist_scores = scorer(training_graph, nonexist_edges)
+            stage['nodes'] = len(training_graph.nodes())
+            stage['edges'] = len(testing_edges) + len(nonexist_edges)
+
+        with profiler.Stage(name + ' AUC') as stage:
+            auc = EvaluationMetrics.AUC(nonexist_scores, missing_scores)
+            stage['edges'] = len(missing_scores) + len(nonexist_scores)
+
+        with profiler.Stage(name + ' KPrecision') as stage:
+            EvaluationMetrics.KPrecision(auc, dict(missing_scores, **nonexist_scores), testing_edges)
+            stage['edges'] = len(missing_scores) + len(nonexist_scores)
+
+    return profiler
+
+
+def RunScenario(location, name, config, scorers, candidates):
+    '''
+    Function generates a benchmark scenario and times each stage of NETSNetworkBuilder, OWLNetworkBuilder, the link
+    prediction scoring functions, the evaluation metrics, and the evaluation of the query against the fixture.
+    :param location: string containing the directory where the scenario files should be written
+    :param name: string containing the name of the scenario
+    :param config: dictionary of the query shape and result set size for the scenario
+    :param scorers: list of tuples where tuple[0] is the name of a scoring function and tuple[1] is the function
+    :param candidates: integer representing the maximum number of non-existent edges to score
+    :return: dictionary keyed by "<component>.<stage>" where the values are the stage records
+    '''
+    input1 = WriteScenario(location, name, config)
+    timings = {}
+
+    for component, profiler in [('NETSNetworkBuilder', NETSRepresentation.NETSNetworkBuilder(input1)),
+                                ('OWLNetworkBuilder', OWLRepresentation.OWLNetworkBuilder(input1)),
+                                ('LinkPrediction', TimePrediction(input1, scorers, candidates)),
+                                ('LocalEndpoint', TimeEndpoint(input1, config['rows']))]:
+        for record in profiler.stages:
+            timings[component + '.' + record['stage']] = record
+
+    return timings
+
+
+def Compare(results, baselines, tolerance):
+    '''
+    Function compares the wall time of each stage to the stored baseline and prints the ratio between them. Stages
+    which are slower than the baseline by more than the tolerance are flagged as regressions.
+    :param results: dictionary keyed by scenario name where the values are dictionaries of stage records
+    :param baselines: dictionary with the same structure as results storing the baseline stage records
+    :param tolerance: float representing the allowed ratio of the current to the baseline wall time
+    :return: list of strings naming the "<scenario>/<stage>" pairs which regressed
+    '''
+    regressions = []
+
+    for scenario in sorted(results):
+        print 'Scenario: ' + scenario
+
+        for stage in sorted(results[scenario]):
+            current = results[scenario][stage]['wall_time']
+
+            if stage not in baselines.get(scenario, {}):
+                print '  {0:<45} {1:>10.3f}s   (no baseline)'.format(stage, current)
+                continue
+
+            baseline = baselines[scenario][stage]['wall_time']
+            ratio = current / baseline if baseline > 0 else 1.0
+            flag = '  REGRESSION' if ratio > tolerance and current - baseline > 0.01 else ''
+
+            if flag:
+                regressions.append(scenario + '/' + stage)
+
+            print '  {0:<45} {1:>10.3f}s {2:>10.3f}s {3:>7.2f}x{4}'.format(stage, current, baseline, ratio, flag)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Times each OWL-NETS pipeline stage on synthetic queries and results.')
+    parser.add_argument('-s', '--scenarios', nargs='+', default=['small'], choices=sorted(SCENARIOS),
+                        help='benchmark scenarios to run (default: small)')
+    parser.add_argument('-o', '--output', default='Benchmarks', help='directory for scenario files and baselines')
+    parser.add_argument('-b', '--baselines', default=None, help='baseline file (default: <output>/baselines.json)')
+    parser.add_argument('--save', action='store_true', help='store the timings as the new baselines')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='ratio to the baseline wall time above which a stage is a regression (default: 1.25)')
+    parser.add_argument('--candidates', type=int, default=20000,
+                        help='maximum number of non-existent edges scored by each link prediction method')
+    parser.add_argument('--all-methods', action='store_true', help='also time Katz and Rooted Page Rank')
+    args = parser.parse_args()
+
+    baseline_file = args.baselines or os.path.join(args.output, 'baselines.json')
+    scorers = SCORERS + ([('Katz', LinkPrediction.katz), ('RPR', LinkPrediction.RPR)] if args.all_methods else [])
+
+    # the matrix methods score all pairs from the graph alone
+    scorers = [(name, scorer if name not in ('Katz', 'RPR') else lambda graph, edges, f=scorer: f(graph))
+               for name, scorer in scorers]
+
+    results = {}
+    for name in args.scenarios:
+        results[name] = RunScenario(os.path.join(args.output, 'Synthetic_Data'), name, SCENARIOS[name], scorers,
+                                    args.candidates)
+
+    baselines = json.load(open(baseline_file)) if os.path.isfile(baseline_file) else {}
+    regressions = Compare(results, baselines, args.tolerance)
+
+    if args.save:
+        baselines.update(results)
+
+        with open(baseline_file, 'w') as outfile:
+            json.dump(baselines, outfile, indent=2, sort_keys=True)
+
+        print 'Baselines written to: ' + baseline_file
+
+    if regressions:
+        print str(len(regressions)) + ' stage(s) regressed: ' + ', '.join(regressions)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+##########################################################################################################
+# BindingTable.py
+# Purpose: script stores SPARQL query results as a columnar table and reads/writes compact result formats
+# version 1.3.0
+# date: 10.19.2026
+##########################################################################################################
+
+
+## import module/script dependencies
+import csv
+import json
+import re
+from array import array
+from itertools import izip
+import GraphWriter
+
+
+# escape sequences allowed in SPARQL TSV literals
+TSV_ESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', '"': '"', "'": "'", '\\': '\\'}
+
+# characters which require a CSV field to be quoted
+CSV_SPECIAL = re.compile('[,"\r\n]')
+
+# a CSV field, quoted or not (used to tell an empty string ("") from an unbound variable (an empty field))
+CSV_FIELD = re.compile(r'"(?:[^"]|"")*"|[^,"\r\n]*')
+
+
+
+class BindingTable:
+    '''
+    Class stores the results of a SPARQL query as one dictionary-encoded column per variable. Every distinct value is
+    stored once, as a utf8 encoded string, in a string pool shared by all of the columns, and each column is an array
+    of integer codes into the pool. Code 0 is reserved for unbound variables (its value is None). Values are stored
+    without their RDF term type (uri, literal, bnode) because the network builders only use the values.
+    :param variables: list of strings containing the selected variables (without '?')
+    '''
+
+    def __init__(self, variables):
+        self.variables = list(variables)
+        self.columns = dict([(var, array('i')) for var in self.variables])
+        self.pool = [None]
+        self.index = {None: 0}
+
+    def __len__(self):
+        return len(self.columns[self.variables[0]]) if self.variables else 0
+
+    def Encode(self, value):
+        '''
+        Function returns the code of a value, adding the value to the string pool the first time it is seen.
+        :param value: string containing the value (None for an unbound variable)
+        :return: integer representing the code of the value
+        '''
+        code = self.index.get(value)
+
+        if code is None:
+            code = self.index[value] = len(self.pool)
+            self.pool.append(value)
+
+        return code
+
+    def Append(self, row):
+        '''
+        Function adds a result to the table.
+        :param row: list of values ordered like the variables of the table (None for unbound variables)
+        '''
+        for var, value in izip(self.variables, row):
+            self.columns[var].append(self.Encode(value))
+
+    def Column(self, var):
+        '''
+        Function returns the codes of the values bound to a variable in every result.
+        :param var: string containing the variable (with or without '?')
+        :return: array of integers
+        '''
+        return self.columns[var.strip('?')]
+
+    def Values(self, var):
+        '''
+        Function returns the values bound to a variable in every result.
+        :param var: string containing the variable (with or without '?')
+        :return: list of strings (None where the variable is unbound)
+        '''
+        pool = self.pool
+
+        return [pool[code] for code in self.Column(var)]
+
+    def Codes(self, *variables):
+        '''
+        Function returns the results as tuples of the codes of the values bound to the requested variables (all
+        variables when none are given), in the order of the variables.
+        :param variables: strings containing the variables (with or without '?')
+        :return: iterator of tuples of integers
+        '''
+        return izip(*[self.Column(var) for var in (variables or self.variables)])
+
+    def Rows(self, *variables):
+        '''
+        Function returns the results as tuples of the values bound to the requested variables (all variables when
+        none are given), in the order of the variables.
+        :param variables: strings containing the variables (with or without '?')
+        :return: iterator of tuples of strings
+        '''
+        pool = self.pool
+
+        return (tuple([pool[code] for code in codes]) for codes in self.Codes(*variables))
+
+    def Rename(self, names):
+        '''
+        Function renames variables of the table (e.g., to use the results of an equivalent query).
+        :param names: dictionary where the keys are variables (without '?') and the values are their new names
+        (variables which are not keys keep their names)
+        :return: the table
+        '''
+        self.columns = dict([(names.get(var, var), column) for var, column in self.columns.items()])
+        self.variables = [names.get(var, var) for var in self.variables]
+
+        return self
+
+    def Write(self, output):
+        '''
+        Function writes the table to a file in the SPARQL CSV result format (a header of variables followed by one
+        line of values per result). Unbound variables are written as empty fields and empty strings as "", so that
+        ReadCSV keeps them apart. Each distinct value is formatted once. The file is replaced atomically (see
+        GraphWriter.AtomicFile).
+        :param output: file path and name where the table should be written
+        :return: string containing the file path and name of the table
+        '''
+        fields = [CSVField(value) for value in self.pool]
+
+        with GraphWriter.Open(output, False) as outfile:
+            outfile.write(','.join([CSVField(var) for var in self.variables]) + '\r\n')
+
+            for codes in self.Codes():
+                outfile.write(','.join([fields[code] for code in codes]) + '\r\n')
+
+        return output
+
+
+def CSVField(value):
+    '''
+    Function formats a value as a CSV field, quoting it only when needed (like csv.QUOTE_MINIMAL) or when it is empty.
+    :param value: string containing the value (None for an unbound variable)
+    :return: string containing the CSV field (an empty string for an unbound variable)
+    '''
+    if value is None:
+        return ''
+
+    return '"' + value.replace('"', '""') + '"' if not value or CSV_SPECIAL.search(value) else value
+
+
+def QuotedFields(text):
+    '''
+    Function finds which fields of a CSV record are quoted.
+    :param text: string containing the lines of the record
+    :return: list of booleans, one per field
+    '''
+    quoted = []
+    position = 0
+
+    while True:
+        field = CSV_FIELD.match(text, position).group(0)
+        quoted.append(field.startswith('"'))
+        position += len(field)
+
+        if text[position:position + 1] != ',':
+            return quoted
+
+        position += 1
+
+
+def FromJSON(results):
+    '''
+    Function converts query results in the SPARQL JSON result format into a BindingTable.
+    :param results: dictionary with the same structure as the SPARQL JSON result format
+    :return: a BindingTable storing the results
+    '''
+    table = BindingTable([str(var) for var in results['head']['vars']])
+
+    for res in results['results']['bindings']:
+        table.Append([res[var]['value'].encode('utf8') if var in res else None for var in table.variables])
+
+    return table
+
+
+def TSVTerm(term):
+    '''
+    Function converts an RDF term written in the SPARQL TSV result format into its value.
+    :param term: string containing the term (e.g., <http://...>, "label"@en, "1"^^<...#integer>, _:b0, 42)
+    :return: string containing the value of the term (None for an empty cell)
+    '''
+    if not term:
+        return None
+
+    if term[0] == '<':
+        return term[1:-1]
+
+    if term[0] == '"':
+        value = term[1:term.rindex('"')]
+        return re.sub(r'\\(.)', lambda x: TSV_ESCAPES.get(x.group(1), x.group(0)), value) if '\\' in value else value
+
+    if term.startswith('_:'):
+        return term[2:]
+
+    return term
+
+
+def ReadTSV(lines):
+    '''
+    Function parses query results in the SPARQL TSV result format one line at a time, so a response can be parsed as
+    it is read from the endpoint.
+    :param lines: iterable of strings, one per line, where the first line is the header of variables
+    :return: a BindingTable storing the results
+    :raises ValueError: if a line does not have one value per variable (e.g., a truncated response)
+    '''
+    lines = iter(lines)
+    table = BindingTable([var.strip().lstrip('?') for var in next(lines).rstrip('\r\n').split('\t')])
+    columns = [table.columns[var] for var in table.variables]
+    encode = table.Encode
+
+    for number, line in enumerate(lines, 2):
+        line = line.rstrip('\r\n')
+
+        if not line:
+            continue
+
+        terms = line.split('\t')
+
+        if len(terms) != len(columns):
+            raise ValueError('Line ' + str(number) + ' of the TSV results has ' + str(len(terms)) + ' values for ' +
+                             str(len(columns)) + ' variables')
+
+        for column, term in izip(columns, terms):
+            column.append(encode(TSVTerm(term)))
+
+    return table
+
+
+def ReadCSV(lines):
+    '''
+    Function parses query results in the SPARQL CSV result format (also used for the on-disk result cache) one line at
+    a time, so a response can be parsed as it is read from the endpoint. An empty field is an unbound variable (None)
+    and a quoted empty field ("") is an empty string, as written by BindingTable.Write.
+    :param lines: iterable of strings, one per line, where the first line is the header of variables
+    :return: a BindingTable storing the results
+    :raises ValueError: if a line does not have one value per variable (e.g., a truncated response)
+    '''
+    # the lines of the current record, read again for records with empty fields
+    record = []
+
+    def Lines():
+        for line in lines:
+            record.append(line)
+            yield line
+
+    reader = csv.reader(Lines())
+    table = BindingTable([var.strip().lstrip('?') for var in next(reader)])
+    columns = [table.columns[var] for var in table.variables]
+    encode = table.Encode
+    del record[:]
+
+    for row in reader:
+        text = ''.join(record)
+        del record[:]
+
+        if not row:
+            continue
+
+        if len(row) != len(columns):
+            raise ValueError('Line ' + str(reader.line_num) + ' of the CSV results has ' + str(len(row)) +
+                             ' values for ' + str(len(columns)) + ' variables')
+
+        if '' in row:
+            quoted = QuotedFields(text)
+            quoted = quoted if len(quoted) == len(row) else [False] * len(row)
+            row = [value or ('' if is_quoted else None) for value, is_quoted in izip(row, quoted)]
+
+        for column, value in izip(columns, row):
+            column.append(encode(value))
+
+    return table
+
+
+def Load(location):
+    '''
+    Function reads query results stored on disk in the SPARQL CSV, TSV, or JSON result format. The format is chosen
+    from the file extension.
+    :param location: string containing the file path and name of the results
+    :return: a BindingTable storing the results
+    '''
+    if location.endswith('.json'):
+        with open(location) as json_data:
+            return FromJSON(json.load(json_data))
+
+    with open(location, 'rb') as infile:
+        if location.endswith('.tsv'):
+            return ReadTSV(infile)
+
+        return ReadCSV(infile)
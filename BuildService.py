@@ -0,0 +1,546 @@
+##########################################################################################################
+# BuildService.py
+# Purpose: script runs OWL-NETS network builds as jobs of a long-lived local service with a pool of warm workers
+# version 1.0.1
+# date: 10.19.2026
+##########################################################################################################
+
+
+## import module/script dependencies
+import argparse
+import json
+import multiprocessing
+import os
+import Queue
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import urllib2
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+
+
+# network builders run for each kind of network a job can request
+NETWORKS = {'nets': ['NETSNetworkBuilder'], 'owl': ['OWLNetworkBuilder'],
+            'both': ['NETSNetworkBuilder', 'OWLNetworkBuilder']}
+
+# job fields returned when jobs are listed (the stage timings are only returned for a single job)
+SUMMARY = ['id', 'query', 'network', 'status', 'worker', 'queue_seconds', 'run_seconds', 'error']
+
+# job fields sent to the worker which runs the job
+TASK = ['id', 'query', 'network', 'compress', 'edgelist', 'log']
+
+# seconds the service waits for a job event before it checks that the workers are alive
+POLL = 0.5
+
+
+
+def Worker(inbox, events, settings, inherited=()):
+    '''
+    Function runs the network builds the service sends to the worker until it receives None. The builders are imported,
+    the endpoint client is configured, and the query analysis cache is opened once, so every job after the first runs
+    in a warm process: imports, the pooled endpoint connections, and the in-memory cache of query analyses and
+    canonical forms are reused across jobs. The output of each job (including progress bars) is written to its log
+    file. The start and end of each job, the stage timings of each build, and the traceback of a job that fails are
+    sent to the service through the event queue.
+    :param inbox: multiprocessing.Queue of job dictionaries read only by this worker (None stops the worker)
+    :param events: multiprocessing.Queue the job events are sent to
+    :param settings: dictionary storing the authentication file, result stream and format settings, cache directory,
+    and log directory of the service
+    :param inherited: list of file descriptors inherited from the service which the worker closes (e.g., the listening
+    socket, which a worker started in place of one which died would otherwise keep open)
+    '''
+    for descriptor in inherited:
+        os.close(descriptor)
+
+    import Instrumentation
+    import NETSRepresentation
+    import OWLRepresentation
+    import QueryRunner
+
+    builders = {'NETSNetworkBuilder': NETSRepresentation.NETSNetworkBuilder,
+                'OWLNetworkBuilder': OWLRepresentation.OWLNetworkBuilder}
+
+    # an interrupt stops the service, which lets the workers finish the queued jobs (see BuildService.Stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if os.path.isfile(settings['authentication']):
+        QueryRunner.Configure(settings['authentication'], stream=settings['stream'],
+                              result_format=settings['results_format'])
+
+    cache = NETSRepresentation.AnalysisCache(settings['cache'])
+
+    while True:
+        job = inbox.get()
+
+        if job is None:
+            break
+
+        events.put(('started', job['id'], os.getpid(), time.time()))
+        builds, error = [], None
+
+        # the output of the job is redirected at the file descriptor level, so progress bars are captured as well
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved = os.dup(1), os.dup(2)
+        log = open(job['log'], 'w')
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+
+        try:
+            for name in NETWORKS[job['network']]:
+                profiler = builders[name](job['query'], Instrumentation.PipelineProfiler(), settings['authentication'],
+                                          job['compress'], job['edgelist'], cache)
+                builds.append({'builder': name, 'stages': profiler.stages})
+        except Exception:
+            error = traceback.format_exc()
+            print error
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved[0], 1)
+            os.dup2(saved[1], 2)
+            os.close(saved[0])
+            os.close(saved[1])
+            log.close()
+
+        events.put(('finished', job['id'], time.time(), builds, error))
+
+    QueryRunner.CloseClients()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    '''
+    Class handles the JSON API of a build service:
+      POST /jobs       submits jobs ({"queries": [paths], "network": "nets", "owl", or "both", "compress": bool,
+                       "edgelist": bool}) and returns their ids
+      GET  /jobs       lists every job with its status and timings
+      GET  /jobs/<id>  returns a job with the stage timings of each build
+      GET  /status     returns the state of the service
+      POST /shutdown   finishes the queued jobs and stops the service
+    '''
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+    def Respond(self, status, value):
+        body = json.dumps(value, indent=2, sort_keys=True)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.rstrip('/')
+
+        if path == '/status':
+            return self.Respond(200, self.server.Status())
+
+        if path == '/jobs':
+            return self.Respond(200, {'jobs': self.server.Jobs()})
+
+        if path.startswith('/jobs/') and path[6:].isdigit():
+            job = self.server.Job(int(path[6:]))
+            return self.Respond(200, job) if job else self.Respond(404, {'error': 'Unknown job: ' + path[6:]})
+
+        self.Respond(404, {'error': 'Unknown resource: ' + self.path})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.getheader('Content-Length') or 0))
+        path = self.path.rstrip('/')
+
+        if path == '/shutdown':
+            self.Respond(200, self.server.Status())
+            threading.Thread(target=self.server.Stop).start()
+            return
+
+        if path != '/jobs':
+            return self.Respond(404, {'error': 'Unknown resource: ' + self.path})
+
+        try:
+            request = json.loads(body or '{}')
+            ids = self.server.Submit(request.get('queries', []), request.get('network', 'nets'),
+                                     bool(request.get('compress')), bool(request.get('edgelist')))
+        except ValueError as error:
+            return self.Respond(400, {'error': str(error)})
+
+        self.Respond(202, {'jobs': ids})
+
+
+class BuildService(ThreadingMixIn, HTTPServer):
+    '''
+    Class is a local HTTP service which runs OWL-NETS network builds as jobs. Jobs wait in a queue until one of the
+    worker processes is free; the workers live as long as the service, so interpreter startup, imports, endpoint
+    connections, and caches are paid for once rather than once per build (see Worker). Workers share the on-disk query
+    analysis cache, so the analysis and results of a query are reused by later equivalent queries whichever worker ran
+    it. The status of every job (queued, running, finished, or failed), the time it waited and ran, and the stage
+    timings of its builds are kept by the service. Each worker is sent one job at a time, so the service knows which
+    job every worker runs: when a worker dies its job fails and a new worker takes its place. Jobs on the same query
+    file write the same files, so they run one after another.
+    :param port: integer representing the port to listen on (0 picks a free port)
+    :param workers: integer representing the number of worker processes (builds run concurrently)
+    :param authentication: string containing file path/name for the endpoint authentication file
+    :param cache: string containing the path of the query analysis cache directory (None uses a temporary directory
+    which is removed when the service stops)
+    :param logs: string containing the directory the job logs are written to (None uses <cache>.logs)
+    :param stream: boolean indicating whether query results are parsed as they are read from the endpoint
+    :param results_format: string containing the format query results are requested in
+    '''
+
+    daemon_threads = True
+
+    def __init__(self, port=0, workers=2, authentication='SPARQL_Queries/authentication', cache=None, logs=None,
+                 stream=False, results_format='json', verbose=False):
+        # the logs are kept outside the cache directory, where they would be taken for a stale cache version
+        self.temporary = tempfile.mkdtemp() if cache is None else None
+        cache = os.path.join(self.temporary, 'cache') if cache is None else cache
+        self.settings = {'authentication': authentication, 'stream': stream, 'results_format': results_format,
+                         'cache': cache, 'logs': logs or cache.rstrip(os.sep) + '.logs'}
+        self.verbose = verbose
+        self.jobs = {}
+        self.queue = []
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.accepting = True
+        self.stopping = False
+
+        if not os.path.isdir(self.settings['logs']):
+            os.makedirs(self.settings['logs'])
+
+        # the builders are imported before the workers are started, so every worker starts warm
+        import NETSRepresentation
+        import OWLRepresentation
+
+        # workers are started before the socket is opened so they do not inherit it
+        self.events = multiprocessing.Queue()
+        self.workers = [self.Start() for _ in xrange(workers)]
+        self.collector = threading.Thread(target=self.Collect)
+        self.collector.daemon = True
+        self.collector.start()
+
+        HTTPServer.__init__(self, ('127.0.0.1', port), ServiceHandler)
+
+    def URL(self):
+        return 'http://127.0.0.1:' + str(self.server_address[1])
+
+    def Start(self):
+        # starts a worker process with its own inbox (a worker which dies can only leave its own inbox locked)
+        inbox = multiprocessing.Queue()
+        inherited = [self.fileno()] if hasattr(self, 'socket') else []
+        process = multiprocessing.Process(target=Worker, args=(inbox, self.events, self.settings, inherited))
+        process.start()
+
+        return {'process': process, 'inbox': inbox, 'job': None}
+
+    def Output(self, job_id):
+        # returns the prefix of the files a job writes (the results, networks, and reports of its query)
+        return self.jobs[job_id]['query'].rpartition('.')[-1]
+
+    def Dispatch(self):
+        # sends the next queued jobs to the idle workers (called with the lock held) - a job whose query is being built
+        # by another job waits for that job, so two jobs never write the same files at once
+        busy = set([self.Output(worker['job']) for worker in self.workers if worker['job'] is not None])
+
+        for worker in self.workers:
+            ready = [job_id for job_id in self.queue if self.Output(job_id) not in busy]
+
+            if ready and worker['job'] is None:
+                worker['job'] = ready[0]
+                self.queue.remove(ready[0])
+                busy.add(self.Output(ready[0]))
+                worker['inbox'].put(dict([(key, self.jobs[worker['job']][key]) for key in TASK]))
+
+    def Submit(self, queries, network='nets', compress=False, edgelist=False):
+        '''
+        Function adds a job to the queue for each query.
+        :param queries: list of strings containing the file path/names of SPARQL queries (readable by the service)
+        :param network: string containing the networks to build ('nets', 'owl', or 'both')
+        :param compress: boolean indicating whether the GML files should be gzip compressed
+        :param edgelist: boolean indicating whether tab-delimited edge lists are also written
+        :return: list of integers representing the ids of the jobs
+        '''
+        if network not in NETWORKS:
+            raise ValueError('Unknown network: ' + str(network) + ' (expected one of ' + ', '.join(NETWORKS) + ')')
+
+        if not queries or [query for query in queries if not os.path.isfile(query)]:
+            raise ValueError('Query files not found: ' + ', '.join([str(x) for x in queries if not os.path.isfile(x)]))
+
+        ids = []
+
+        with self.lock:
+            if not self.accepting:
+                raise ValueError('The service is shutting down')
+
+            for query in queries:
+                job_id = len(self.jobs) + 1
+                self.jobs[job_id] = {'id': job_id, 'query': os.path.abspath(query), 'network': network,
+                                     'compress': compress, 'edgelist': edgelist, 'status': 'queued',
+                                     'submitted': time.time(), 'started': None, 'finished': None, 'worker': None,
+                                     'queue_seconds': None, 'run_seconds': None, 'builds': [], 'error': None,
+                                     'log': os.path.join(self.settings['logs'], 'job-' + str(job_id) + '.log')}
+                self.queue.append(job_id)
+                ids.append(job_id)
+
+            self.Dispatch()
+
+        return ids
+
+    def Collect(self):
+        # records the job events sent by the workers and checks on the workers (runs on its own thread until None is
+        # received)
+        while True:
+            try:
+                event = self.events.get(timeout=POLL)
+            except Queue.Empty:
+                event = ()
+
+            if event is None:
+                break
+
+            with self.lock:
+                if event and event[0] == 'started':
+                    job = self.jobs[event[1]]
+                    job.update(status='running', worker=event[2], started=event[3],
+                               queue_seconds=event[3] - job['submitted'])
+
+                elif event:
+                    job = self.jobs[event[1]]
+                    job.update(status='failed' if event[4] else 'finished', finished=event[2],
+                               run_seconds=event[2] - job['started'], builds=event[3], error=event[4])
+
+                    for worker in self.workers:
+                        if worker['job'] == event[1]:
+                            worker['job'] = None
+
+                self.Replace()
+                self.Dispatch()
+
+    def Replace(self):
+        # fails the job of every worker which died and starts a new worker in its place (called with the lock held)
+        for i, worker in enumerate(self.workers):
+            if worker['process'].is_alive() or self.stopping:
+                continue
+
+            job = self.jobs.get(worker['job'])
+
+            # the job may have finished just before the worker died (its event is then already recorded)
+            if job and job['status'] in ('queued', 'running'):
+                job.update(status='failed', finished=time.time(),
+                           run_seconds=time.time() - job['started'] if job['started'] else None,
+                           error='Worker ' + str(worker['process'].pid) + ' died (exit code ' +
+                                 str(worker['process'].exitcode) + ') while running the job')
+
+            self.workers[i] = self.Start()
+
+    def Job(self, job_id):
+        with self.lock:
+            return dict(self.jobs[job_id]) if job_id in self.jobs else None
+
+    def Jobs(self):
+        with self.lock:
+            return [dict([(key, self.jobs[job_id][key]) for key in SUMMARY]) for job_id in sorted(self.jobs)]
+
+    def Status(self):
+        '''
+        Function returns the state of the service.
+        :return: dictionary storing the URL, uptime, number of workers, number of jobs by status, and the settings
+        '''
+        with self.lock:
+            counts = {}
+
+            for job in self.jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+
+            workers = len([worker for worker in self.workers if worker['process'].is_alive()])
+
+        return {'url': self.URL(), 'uptime_seconds': time.time() - self.started, 'accepting': self.accepting,
+                'workers': workers, 'jobs': counts, 'settings': self.settings}
+
+    def Stop(self):
+        '''
+        Function stops accepting jobs, waits for the workers to finish the queued jobs, and stops the service.
+        '''
+        with self.lock:
+            if not self.accepting:
+                return
+
+            self.accepting = False
+
+        while True:
+            with self.lock:
+                if not self.queue and not [worker for worker in self.workers if worker['job'] is not None]:
+                    self.stopping = True
+                    break
+
+            time.sleep(POLL)
+
+        for worker in self.workers:
+            worker['inbox'].put(None)
+            worker['process'].join()
+
+        self.events.put(None)
+        self.collector.join()
+        self.shutdown()
+
+    def Close(self):
+        self.server_close()
+
+        if self.temporary:
+            shutil.rmtree(self.temporary, ignore_errors=True)
+
+
+def Request(url, path, value=None):
+    '''
+    Function sends a request to a build service.
+    :param url: string containing the URL of the service (e.g., http://127.0.0.1:8790)
+    :param path: string containing the resource (e.g., /jobs)
+    :param value: dictionary sent as the JSON body of a POST request (None sends a GET request)
+    :return: dictionary storing the JSON response
+    '''
+    body = json.dumps(value) if value is not None else None
+    request = urllib2.Request(url.rstrip('/') + path, body, {'Content-Type': 'application/json'})
+
+    try:
+        return json.load(urllib2.urlopen(request))
+    except urllib2.HTTPError as error:
+        raise ValueError(json.load(error).get('error', str(error)))
+
+
+def Wait(url, ids, interval=0.2):
+    '''
+    Function waits until jobs of a build service have finished or failed.
+    :param url: string containing the URL of the service
+    :param ids: list of integers representing the ids of the jobs
+    :param interval: float representing the seconds between status requests
+    :return: list of dictionaries storing the jobs
+    '''
+    jobs = []
+
+    for job_id in ids:
+        job = Request(url, '/jobs/' + str(job_id))
+
+        while job['status'] in ('queued', 'running'):
+            time.sleep(interval)
+            job = Request(url, '/jobs/' + str(job_id))
+
+        jobs.append(job)
+
+    return jobs
+
+
+def PrintJobs(jobs):
+    print '{0:>5} {1:<9} {2:>8} {3:>9} {4:>9}  {5}'.format('id', 'status', 'worker', 'queue s', 'run s', 'query')
+
+    for job in jobs:
+        print '{0:>5} {1:<9} {2:>8} {3:>9} {4:>9}  {5}'.format(
+            job['id'], job['status'], job['worker'] or '-',
+            '%.3f' % job['queue_seconds'] if job['queue_seconds'] is not None else '-',
+            '%.3f' % job['run_seconds'] if job['run_seconds'] is not None else '-', job['query'])
+
+
+def Client(args):
+    '''Function sends the request of a submit, status, or shutdown command to a running service '''
+
+    if args.command == 'submit':
+        ids = Request(args.url, '/jobs', {'queries': [os.path.abspath(x) for x in args.queries],
+                                         'network': args.network, 'compress': args.compress,
+                                         'edgelist': args.edgelist})['jobs']
+        print 'Submitted jobs: ' + ', '.join([str(x) for x in ids])
+
+        if args.wait:
+            jobs = Wait(args.url, ids)
+            PrintJobs(jobs)
+
+            for job in jobs:
+                for build in job['builds']:
+                    print '\n' + str(job['id']) + ' ' + build['builder']
+
+                    for record in build['stages']:
+                        print '  {0:<20} {1:>10.3f}'.format(record['stage'], record['wall_time'])
+
+                if job['error']:
+                    print '\n' + str(job['id']) + ' failed (log: ' + job['log'] + ')\n' + job['error']
+
+    elif args.command == 'status':
+        if args.jobs:
+            PrintJobs([Request(args.url, '/jobs/' + str(x)) for x in args.jobs])
+        else:
+            print json.dumps(Request(args.url, '/status'), indent=2, sort_keys=True)
+            PrintJobs(Request(args.url, '/jobs')['jobs'])
+
+    else:
+        print json.dumps(Request(args.url, '/shutdown', {}), indent=2, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs OWL-NETS network builds as jobs of a local service with a pool '
+                                                 'of warm worker processes, or sends requests to a running service.')
+    commands = parser.add_subparsers(dest='command')
+
+    serve = commands.add_parser('serve', help='run the service')
+    serve.add_argument('-p', '--port', type=int, default=8790, help='port to listen on (default: 8790)')
+    serve.add_argument('-w', '--workers', type=int, default=multiprocessing.cpu_count(),
+                       help='number of worker processes (default: number of CPUs)')
+    serve.add_argument('-g', '--authentication', default='SPARQL_Queries/authentication',
+                       help='name/path to endpoint authentication file (default: SPARQL_Queries/authentication)')
+    serve.add_argument('-m', '--cache', default=None,
+                       help='query analysis cache directory (default: a temporary directory)')
+    serve.add_argument('-o', '--logs', default=None, help='job log directory (default: <cache>.logs)')
+    serve.add_argument('-i', '--stream', action='store_true',
+                       help='parse query results as they are read from the endpoint')
+    serve.add_argument('-j', '--results-format', choices=['json', 'tsv', 'csv'], default='json',
+                       help='format query results are requested in from the endpoint (default: json)')
+    serve.add_argument('-v', '--verbose', action='store_true', help='log each request')
+
+    submit = commands.add_parser('submit', help='submit query files as jobs')
+    submit.add_argument('queries', nargs='+', help='SPARQL query files')
+    submit.add_argument('-n', '--network', choices=sorted(NETWORKS), default='nets',
+                        help='networks to build (default: nets)')
+    submit.add_argument('-k', '--compress', action='store_true', help='gzip compress the GML network files')
+    submit.add_argument('-l', '--edgelist', action='store_true',
+                        help='also write each network as a tab-delimited edge list')
+    submit.add_argument('-w', '--wait', action='store_true', help='wait for the jobs and print their timings')
+
+    status = commands.add_parser('status', help='print the status of the service or of jobs')
+    status.add_argument('jobs', nargs='*', type=int, help='job ids (default: every job)')
+
+    commands.add_parser('shutdown', help='finish the queued jobs and stop the service')
+
+    for command in [submit, status, commands.choices['shutdown']]:
+        command.add_argument('-u', '--url', default='http://127.0.0.1:8790',
+                             help='URL of the service (default: http://127.0.0.1:8790)')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        service = BuildService(args.port, args.workers, args.authentication, args.cache, args.logs, args.stream,
+                               args.results_format, args.verbose)
+        print 'Serving OWL-NETS builds at: ' + service.URL() + ' (' + str(args.workers) + ' workers)'
+
+        # an interrupt or termination request stops the service once the queued jobs are finished
+        for number in [signal.SIGINT, signal.SIGTERM]:
+            signal.signal(number, lambda *_: threading.Thread(target=service.Stop).start())
+
+        try:
+            service.serve_forever()
+        finally:
+            service.Close()
+
+    else:
+        try:
+            Client(args)
+        except (ValueError, urllib2.URLError) as error:
+            print >> sys.stderr, 'Request to ' + args.url + ' failed: ' + str(error)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,330 @@
+##############################################################################################
+# DistributedSweep.py
+# Purpose: script runs link prediction sweeps on several machines with a coordinator and workers
+# version 1.0.2
+# date: 10.19.2026
+##############################################################################################
+
+
+# import module/script dependencies
+import argparse
+import multiprocessing
+import os
+import Queue
+import socket
+import time
+import traceback
+from datetime import datetime
+from multiprocessing.managers import BaseManager
+import networkx as nx
+import NetworkInference
+import ResultStore
+
+
+# maximum number of results appended to the result store in one transaction
+BATCH = 100
+
+# seconds the coordinator waits for a result before it checks on the workers
+POLL = 5
+
+
+
+class SweepManager(BaseManager):
+    '''
+    Class serves the task and result queues and the settings of a distributed sweep over TCP (see
+    multiprocessing.managers.BaseManager). The coordinator registers the objects it serves and workers connect to its
+    address with the same authentication key.
+    '''
+    pass
+
+
+SweepManager.register('tasks')
+SweepManager.register('results')
+SweepManager.register('settings')
+
+
+def Address(text):
+    '''
+    Function converts a "host:port" string into the address of a coordinator.
+    :param text: string containing the host and port separated by a colon
+    :return: tuple storing the host and the port
+    '''
+
+    host, _, port = text.rpartition(':')
+
+    return host or 'localhost', int(port)
+
+
+def Push(results, graph, method, step, iteration, auc, precision, seconds, seed=None):
+    '''
+    Function sends the result of one sweep iteration to the coordinator (used as the record function of the FracAUC
+    functions run by a worker).
+    :param results: proxy of the coordinator's result queue
+    :param graph: string containing the name of the graph
+    :param method: string containing the name of the method
+    :param step: float representing the fraction of edges sampled
+    :param iteration: integer representing the iteration
+    :param auc: float representing the AUC of the iteration
+    :param precision: float representing the precision of the iteration
+    :param seconds: float representing the wall time of the iteration
+    :param seed: integer representing the seed of the iteration
+    '''
+
+    results.put(('result', (graph, method, step, iteration, seed, auc, precision, seconds)))
+
+
+def Worker(address, authkey):
+    '''
+    Function connects to a coordinator, loads the network of the sweep once, and runs tasks from the coordinator's
+    queue until it is empty. The result of every iteration is sent to the coordinator as soon as it finishes, and a
+    task which fails is reported to the coordinator (with the iterations whose results were not sent) rather than
+    stopping the worker. The worker stops when the queue is empty or the coordinator has shut down. The network file
+    must be readable by the worker at the path given to the coordinator (e.g., on a shared file system).
+    :param address: tuple storing the host and port of the coordinator
+    :param authkey: string containing the authentication key of the coordinator
+    :return: integer representing the number of tasks run
+    '''
+
+    manager = SweepManager(address=address, authkey=authkey)
+
+    try:
+        manager.connect()
+        settings = manager.settings().copy()
+        tasks, results = manager.tasks(), manager.results()
+    except (EOFError, IOError):
+        # the coordinator has finished (or is not running)
+        print 'No coordinator is running at ' + address[0] + ':' + str(address[1])
+        return 0
+
+    name = socket.gethostname() + ':' + str(multiprocessing.current_process().pid)
+
+    # the network is loaded once per worker, the same way NetworkInference.main loads it
+    network = nx.read_gml(settings['network']).to_undirected()
+    nonexist_edges = list(nx.non_edges(network))
+    sent = []
+    count = 0
+
+    def Record(method, step, iteration, *args, **kwargs):
+        # sends a result and remembers its iteration, so a task which fails only reports the iterations not sent
+        Push(results, settings['graph'], method, step, iteration, *args, **kwargs)
+        sent.append(iteration)
+
+    print 'Worker ' + name + ' loaded ' + settings['network']
+
+    while True:
+        try:
+            method, step, iterations = tasks.get_nowait()
+        except (Queue.Empty, EOFError, IOError):
+            break
+
+        del sent[:]
+
+        try:
+            dict(NetworkInference.METHODS)[method](network, nonexist_edges, iterations, step, Record,
+                                                   settings['seed'])
+        except Exception:
+            failed = [iteration for iteration in iterations if iteration not in set(sent)]
+            results.put(('error', (name, method, step, failed, traceback.format_exc())))
+
+        count += 1
+
+    print 'Worker ' + name + ' finished ' + str(count) + ' tasks'
+
+    return count
+
+
+def Coordinator(network, graph, store, methods=None, steps=NetworkInference.STEPS, iterations=100, seed=None,
+                address=('localhost', 50000), authkey=None, chunk=10, workers=0, timeout=600):
+    '''
+    Function coordinates a distributed sweep. The iterations which are not recorded in the result store are split
+    into tasks of up to chunk iterations and served to workers over TCP together with the network file, the graph
+    name, and the root seed. Only the coordinator writes to the result store: each result is appended when the worker
+    sends it, so a sweep which is stopped resumes (see NetworkInference.Sweep) when the coordinator is restarted. Every
+    iteration derives its seed from the root seed, so the results do not depend on the number of workers or which
+    worker ran a task.
+
+    A worker which dies while running a task never sends the rest of its results. Local workers which die are
+    replaced, and once the queue is empty and either a local worker has died or no result has arrived for timeout
+    seconds, the iterations still missing are served again (results of an iteration which arrive twice are recorded
+    once). If no result arrives for timeout seconds after that, or for twice the timeout while tasks are waiting for
+    workers, the coordinator stops and returns the iterations recorded so far; the rest are run when it is restarted.
+    :param network: string containing the file path/name of the GML network (readable by every worker)
+    :param graph: string containing the name of the graph in the result store
+    :param store: string containing the file path/name of the result store
+    :param methods: list of method names (see NetworkInference.METHODS; None runs NetworkInference.DEFAULT_METHODS)
+    :param steps: list of percent of edges to sample
+    :param iterations: integer representing the number of iterations of each method and step
+    :param seed: integer representing the root seed (None uses the seed stored for the graph or draws a new one)
+    :param address: tuple storing the host and port the coordinator listens on
+    :param authkey: string containing the key workers authenticate with (None generates a random key, which is printed
+    for the workers on other machines; the connections are pickled, so anyone who has the key can run code)
+    :param chunk: integer representing the maximum number of iterations of a task
+    :param workers: integer representing the number of worker processes started on this machine
+    :param timeout: float representing the seconds without results after which the missing iterations are served again
+    :return: integer representing the number of iterations recorded
+    '''
+
+    seed, tasks = NetworkInference.PendingTasks(store, graph, methods, steps, iterations, seed, chunk)
+    expected = sum([len(task[2]) for task in tasks])
+    task_queue, result_queue = Queue.Queue(), Queue.Queue()
+    settings = {'network': network, 'graph': graph, 'seed': seed}
+    missing = {}
+
+    for task in tasks:
+        task_queue.put(task)
+        missing.setdefault(task[:2], set()).update(task[2])
+
+    print 'Root seed: ' + str(seed)
+    print str(expected) + ' iterations to run in ' + str(len(tasks)) + ' tasks'
+
+    if not expected:
+        return 0
+
+    if authkey is None:
+        authkey = os.urandom(16).encode('hex')
+        print 'Authentication key: ' + authkey
+
+    # the queues are served by a process forked from this one
+    SweepManager.register('tasks', callable=lambda: task_queue)
+    SweepManager.register('results', callable=lambda: result_queue)
+    SweepManager.register('settings', callable=lambda: settings)
+    manager = SweepManager(address=address, authkey=authkey)
+    manager.start()
+    local = [multiprocessing.Process(target=Worker, args=(address, authkey)) for _ in xrange(workers)]
+
+    for process in local:
+        process.start()
+
+    print 'Coordinator listening on ' + address[0] + ':' + str(address[1])
+
+    tasks, results = manager.tasks(), manager.results()
+    store = ResultStore.ResultStore(store)
+    count, last, lost, retried = 0, time.time(), False, False
+
+    try:
+        while count < expected:
+            try:
+                batch = [results.get(timeout=POLL)]
+            except Queue.Empty:
+                batch = []
+
+            while batch and len(batch) < BATCH:
+                try:
+                    batch.append(results.get_nowait())
+                except Queue.Empty:
+                    break
+
+            rows = []
+
+            for kind, value in batch:
+                if kind == 'result' and value[3] in missing[value[1:3]]:
+                    missing[value[1:3]].remove(value[3])
+                    rows.append(value)
+
+            count += store.Append(rows)
+
+            for name, method, step, failed, trace in [value for kind, value in batch if kind == 'error']:
+                print 'Worker ' + name + ' failed to run ' + method + ' (step ' + str(step) + ')\n' + trace
+                failed = missing[(method, step)].intersection(failed)
+                missing[(method, step)] -= failed
+                expected -= len(failed)
+
+            if batch:
+                last, retried = time.time(), False
+                print str(count) + '/' + str(expected) + ' iterations recorded ' + time.strftime('%H:%M:%S')
+                continue
+
+            # no result arrived - replace the local workers which died while running a task
+            for i, process in enumerate(local):
+                if process.exitcode not in (None, 0):
+                    print 'Local worker ' + str(process.pid) + ' died (exit code ' + str(process.exitcode) + ')'
+                    local[i] = multiprocessing.Process(target=Worker, args=(address, authkey))
+                    local[i].start()
+                    lost = True
+
+            stalled = time.time() - last > timeout
+
+            if retried and stalled:
+                print 'No results for ' + str(timeout) + 's after retrying; ' + str(expected - count) + \
+                      ' iterations are left for a restart of the coordinator'
+                break
+
+            # tasks are waiting but no worker has sent a result - the workers get one more timeout
+            if stalled and not tasks.empty():
+                print 'No results for ' + str(timeout) + 's while tasks are waiting for workers'
+                last, retried = time.time(), True
+
+            elif tasks.empty() and (lost or stalled):
+                for (method, step), pending in sorted(missing.items()):
+                    pending = sorted(pending)
+
+                    for start in xrange(0, len(pending), chunk):
+                        tasks.put((method, step, pending[start:start + chunk]))
+
+                # local workers stop when the queue is empty, so those which have stopped are started again
+                for i, process in enumerate(local):
+                    if not process.is_alive():
+                        local[i] = multiprocessing.Process(target=Worker, args=(address, authkey))
+                        local[i].start()
+
+                print 'Serving the ' + str(expected - count) + ' missing iterations again'
+                last, lost, retried = time.time(), False, True
+    finally:
+        store.Close()
+
+        # workers still running after the results are recorded only repeat iterations which were served again
+        for process in local:
+            process.join(POLL)
+
+            if process.is_alive():
+                process.terminate()
+
+        manager.shutdown()
+
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Runs link prediction sweeps with a coordinator which serves tasks '
+                                                 'and records results, and workers on any number of machines.')
+    parser.add_argument('role', choices=['coordinator', 'worker'], help='run the coordinator or a worker')
+    parser.add_argument('-a', '--address', type=Address, default=('localhost', 50000),
+                        help='host:port the coordinator listens on / workers connect to (default: localhost:50000)')
+    parser.add_argument('-k', '--authkey', default=None,
+                        help='authentication key shared by the coordinator and workers (required by workers; a '
+                             'coordinator without one generates and prints a random key)')
+    parser.add_argument('-n', '--network', default='Network_Data/Trametinib_query_NETS_network.gml',
+                        help='GML network file (readable by every worker)')
+    parser.add_argument('-g', '--graph', default='NETS_Tram', help='name of the graph in the result store')
+    parser.add_argument('-o', '--store', default='Results/Trametinib/link_prediction.sqlite',
+                        help='SQLite result store (written by the coordinator only)')
+    parser.add_argument('-m', '--methods', nargs='+', choices=[name for name, _ in NetworkInference.METHODS],
+                        default=NetworkInference.DEFAULT_METHODS, help='methods to run (default: all but SimRank)')
+    parser.add_argument('-s', '--steps', nargs='+', type=float, default=NetworkInference.STEPS,
+                        help='fractions of edges sampled')
+    parser.add_argument('-i', '--iterations', type=int, default=100, help='iterations of each method and step')
+    parser.add_argument('-r', '--seed', type=int, default=None,
+                        help='root seed (default: the seed stored for the graph, or a new seed)')
+    parser.add_argument('-c', '--chunk', type=int, default=10, help='maximum number of iterations of a task')
+    parser.add_argument('-w', '--workers', type=int, default=0,
+                        help='number of worker processes the coordinator starts on its own machine')
+    parser.add_argument('-t', '--timeout', type=float, default=600,
+                        help='seconds without results after which missing iterations are served again (default: 600)')
+    args = parser.parse_args()
+
+    if args.role == 'worker':
+        if args.authkey is None:
+            parser.error('a worker needs the --authkey of the coordinator')
+
+        Worker(args.address, args.authkey)
+        return
+
+    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    count = Coordinator(args.network, args.graph, args.store, args.methods, args.steps, args.iterations, args.seed,
+                        args.address, args.authkey, args.chunk, args.workers, args.timeout)
+    print 'Recorded ' + str(count) + ' iterations'
+    print str('Finished running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,18 @@
 #########################################################################################
 # EvaluationMetrics.py
 # Purpose: script contains methods for evaluating link prediction algorithm performance
-# version 1.0
-# date: 01.28.2017
+# version 1.1
+# date: 10.19.2026
 #########################################################################################
 
 
 # import module/script dependencies
 import random
-import heapq
+import numpy as np
 
 
 
-def AUC(nonexist_scores, missing_scores):
+def AUC(nonexist_scores, missing_scores, rng=random):
     '''
     Function calculates the probability that a randomly chosen missing link is given a higher score than a randomly
     chosen nonexistent link using procedures described by Lu & Zhou (2010)
@@ -20,16 +20,20 @@ def AUC(nonexist_scores, missing_scores):
     edges, and predictions, and returns an AUC score. Current method is currently set to perform 1,000 comparisons.
     :param nonexist_scores: list of nonexistent edges and scores
     :param missing_scores: list of test edges and scores
+    :param rng: random number generator used to sample the edges (e.g., a RandomStreams.Stream; defaults to the random
+    module)
     :return: an integer which is the AUC score for that comparison
     '''
 
     # comparisons = len(nonexist_scores)*len(missing_scores) #HOW MANY??
     comparisons = 1000
     count = 0.0
+    nonexist_values = nonexist_scores.values()
+    missing_values = missing_scores.values()
 
     for i in xrange(comparisons):
-        TN = random.sample(nonexist_scores.values(), 1)
-        TP = random.sample(missing_scores.values(), 1)
+        TN = rng.sample(nonexist_values, 1)
+        TP = rng.sample(missing_values, 1)
 
         if TP > TN:
             count += 1.0
@@ -41,12 +45,115 @@ def AUC(nonexist_scores, missing_scores):
     return auc
 
 
+def PairAUC(scores, nonexist_edges, testing_edges, rng=random, comparisons=1000):
+    '''
+    Function calculates the AUC (see AUC) from a single dictionary of scores by sampling pairs of a non-existent and a
+    testing edge, where edges without a score are scored 0.0 (e.g., for Katz, SimRank, and Rooted PageRank scores).
+    :param scores: dictionary where the keys are edges and the values are scores
+    :param nonexist_edges: list of nonexistent edges
+    :param testing_edges: list or set of testing edges
+    :param rng: random number generator used to sample the edges (e.g., a RandomStreams.Stream; defaults to the random
+    module)
+    :param comparisons: integer representing the number of sampled pairs
+    :return: float representing the AUC
+    '''
+
+    count = 0.0
+    nonexist_edges = list(nonexist_edges)
+    testing_edges = list(testing_edges)
+
+    for i in xrange(comparisons):
+        TN = rng.sample(nonexist_edges, 1)[0]
+        TP = rng.sample(testing_edges, 1)[0]
+        TN_val = scores.get((TN[0], TN[1]), 0.0)
+        TP_val = scores.get((TP[0], TP[1]), 0.0)
+
+        if TP_val > TN_val:
+            count += 1.0
+        if TP_val == TN_val:
+            count += 0.5
+
+    return count/comparisons
+
+
+
+def Canonical(edge):
+    '''
+    Function returns an undirected edge with its nodes in sorted order, so that both orientations of an edge compare
+    equal.
+    :param edge: tuple storing the nodes of an edge
+    :return: tuple storing the nodes in sorted order
+    '''
+
+    return (edge[0], edge[1]) if edge[0] <= edge[1] else (edge[1], edge[0])
+
+
+def Labels(edges, testing_edges):
+    '''
+    Function labels each scored edge as a missing (testing) edge or not, in either orientation. The testing edges are
+    canonicalized once into a set, so each edge is labeled with a single lookup.
+    :param edges: list of scored edges
+    :param testing_edges: list or set of testing edges
+    :return: numpy array of booleans, one per edge (True for testing edges)
+    '''
+
+    testing = set([Canonical(edge) for edge in testing_edges])
+
+    return np.fromiter((Canonical(edge) in testing for edge in edges), dtype=bool, count=len(edges))
+
+
+def TopK(values, k, largest=True):
+    '''
+    Function selects the k largest (or smallest) values with numpy.argpartition in linear time. Values tied with the
+    k-th value are taken in the order they are stored, so the selection matches heapq.nlargest/nsmallest.
+    :param values: numpy array of scores
+    :param k: integer representing the number of values selected
+    :param largest: boolean indicating whether the largest (True) or smallest (False) values are selected
+    :return: numpy array storing the positions of the selected values
+    '''
+
+    k = min(k, len(values))
+
+    if k == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    keys = -values if largest else values
+    threshold = keys[np.argpartition(keys, k - 1)[k - 1]]
+    above = np.flatnonzero(keys < threshold)
+
+    return np.concatenate([above, np.flatnonzero(keys == threshold)[:k - len(above)]])
+
+
+def RankingMetrics(values, labels, ks, largest=True):
+    '''
+    Function calculates precision@k and recall@k for several values of k and the average precision from one stable
+    ranking of the scores.
+    :param values: numpy array of scores
+    :param labels: numpy array of booleans, one per score (True for testing edges)
+    :param ks: list of integers representing the numbers of top ranked edges evaluated
+    :param largest: boolean indicating whether the largest (True) or smallest (False) scores are ranked first
+    :return: dictionary where 'precision' and 'recall' are numpy arrays (one value per k) and 'average_precision' is a
+    float
+    '''
+
+    order = np.argsort(-values if largest else values, kind='mergesort')
+    hits = np.cumsum(labels[order])
+    positives = float(hits[-1]) if len(hits) else 0.0
+    ks = np.minimum(np.asarray(ks, dtype=np.int64), len(values))
+    found = np.where(ks > 0, hits[np.maximum(ks, 1) - 1] if len(hits) else 0, 0)
+    ranks = np.flatnonzero(labels[order]) + 1.0
+
+    return {'precision': found / np.maximum(ks, 1).astype(float),
+            'recall': found / positives if positives else np.zeros(len(ks)),
+            'average_precision': float(np.mean(np.arange(1, len(ranks) + 1) / ranks)) if len(ranks) else 0.0}
+
 
 def KPrecision(auc, scores, testing_edges):
     '''
     Function calculates the ratio of relevant items selected from the top n items using procedures described by Lu &
     Zhou (2010) (doi:http://dx.doi.org/10.1016/j.physa.2010.11.027T). The function takes a list containing missing and
-    non-existent edges, the list of all predictions, and returns a top k-precision score for 20% of scores.
+    non-existent edges, the list of all predictions, and returns a top k-precision score for 20% of scores. The top
+    edges are selected with TopK and labeled with Labels.
     :param auc: integer representing AUC score - to indicate whether the top or bottom of list should be assessed
     :param scores: list of test edges and scores
     :param testing_edges: list of nonexistent edges and scores
@@ -56,13 +163,10 @@ def KPrecision(auc, scores, testing_edges):
     #get 20% of edges
     links = [int(len(scores)*0.20) if int(len(scores)*0.20) >= 1 else 1][0]
 
-    if auc < 0.5:
-        # pred_list = heapq.nsmallest(links, set([x[1] for x in scores.items()])) #returns n highest likelihood scores
-        pred_list = heapq.nsmallest(links, scores, key=lambda k: scores[k])
-    else:
-        # pred_list = heapq.nlargest(links, set([x[1] for x in scores.items()])) #returns n highest likelihood scores
-        pred_list = heapq.nlargest(links, scores, key=lambda k: scores[k])
+    edges = list(scores)
+    values = np.fromiter((scores[edge] for edge in edges), dtype=float, count=len(edges))
 
-    y_pred = [0 if (i[0], i[1]) in testing_edges else 0 if (i[1], i[0]) in testing_edges else 1 for i in pred_list]
+    # the top links when AUC >= 0.5 and the bottom links otherwise
+    selected = TopK(values, links, largest=auc >= 0.5)
 
-    return float(y_pred.count(0))/links
\ No newline at end of file
+    return float(np.count_nonzero(Labels([edges[i] for i in selected], testing_edges)))/links
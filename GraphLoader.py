@@ -1,13 +1,16 @@
 #######################################################################################
 ## QueryParser.py
-## Purpose: script extracts a graph with corresponding edge metadata from a json file
-## version 1.0.0
-## date: 07.17.2017
+## Purpose: script extracts a graph with corresponding edge metadata from a json file and stores/loads graphs as
+## memory-mapped CSR arrays
+## version 1.1.0
+## date: 10.19.2026
 #######################################################################################
 
 
 ## import module/script dependencies
+import argparse
 import json
+import numpy as np
 from networkx import nx
 
 
@@ -27,4 +30,311 @@ def LoadGraph(location):
     graph.add_nodes_from(data['network']['nodes'])
     graph.add_edges_from(data['network']['edges'])
 
-    return edge_metadata, graph
\ No newline at end of file
+    return edge_metadata, graph
+
+
+
+class NeighborView:
+    '''
+    Class is a read-only view of the neighbors of a node in a CSRGraph which supports the parts of the networkx
+    adjacency interface used by the link prediction and statistics code (keys, iteration, len, and membership).
+    '''
+
+    def __init__(self, graph, index):
+        self.graph = graph
+        self.index = index
+
+    def __len__(self):
+        return self.graph.Degree(self.index)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, node):
+        return self.graph.Index(node) in self.graph.Neighbors(self.index)
+
+    def keys(self):
+        return [self.graph.Name(x) for x in self.graph.Neighbors(self.index)]
+
+
+class CSRGraph:
+    '''
+    Class is a graph stored on disk (see WriteCSR) as compressed sparse row (CSR) arrays and a string table of node
+    names, opened with numpy.memmap. Nothing is read until it is used and the pages are shared through the page cache,
+    so several worker processes can use one copy of a graph. Nodes are numbered by the sorted order of their names.
+    The arrays (indptr, indices) can be used directly by vectorized code and the class also supports the parts of the
+    networkx graph interface used by the link prediction scorers (graph[node].keys(), graph.degree(node)). A networkx
+    graph is only built by ToNetworkX.
+    :param location: string containing the file path/name prefix the graph was written to
+    :param undirected: boolean indicating whether the undirected (symmetric) adjacency is used (always used for graphs
+    which were undirected when written)
+    '''
+
+    def __init__(self, location, undirected=False):
+        self.location = location
+        self.meta = json.load(open(location + '.meta'))
+        self.undirected = undirected or not self.meta['directed']
+        undirected = self.undirected
+
+        dtype = np.dtype(str(self.meta['dtype']))
+        prefix = location + ('.undirected' if undirected else '')
+        self.indptr = np.memmap(prefix + '.indptr', dtype=dtype, mode='r')
+        self.indices = self.Map(prefix + '.indices', dtype)
+        self.indegree = None if undirected else self.Map(location + '.indegree', dtype)
+        self.offsets = np.memmap(location + '.offsets', dtype=np.int64, mode='r')
+        self.names = self.Map(location + '.names', np.uint8)
+
+    @staticmethod
+    def Map(location, dtype):
+        # numpy cannot map empty files (e.g., a graph without edges)
+        try:
+            return np.memmap(location, dtype=dtype, mode='r')
+        except ValueError:
+            return np.zeros(0, dtype=dtype)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __contains__(self, node):
+        return self.Index(node) is not None
+
+    def __iter__(self):
+        return (self.Name(x) for x in xrange(len(self)))
+
+    def __getitem__(self, node):
+        index = self.Index(node)
+
+        if index is None:
+            raise KeyError(node)
+
+        return NeighborView(self, index)
+
+    def Name(self, index):
+        '''
+        Function returns the name of a node.
+        :param index: integer representing the node
+        :return: string containing the name of the node
+        '''
+        return self.names[self.offsets[index]:self.offsets[index + 1]].tostring()
+
+    def Index(self, node):
+        '''
+        Function returns the integer representing a node by binary search of the sorted string table.
+        :param node: string containing the name of the node
+        :return: integer representing the node (None if the node is not in the graph)
+        '''
+        node = node.encode('utf8') if isinstance(node, unicode) else str(node)
+        low, high = 0, len(self)
+
+        while low < high:
+            middle = (low + high) / 2
+            if self.Name(middle) < node:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low if low < len(self) and self.Name(low) == node else None
+
+    def Neighbors(self, index):
+        '''
+        Function returns the neighbors (successors of a directed graph) of a node without copying them.
+        :param index: integer representing the node
+        :return: numpy array of integers representing the neighbors
+        '''
+        return self.indices[self.indptr[index]:self.indptr[index + 1]]
+
+    def Degree(self, index):
+        '''
+        Function returns the degree of a node (in-degree plus out-degree for a directed graph and self-loops counted
+        twice, as in networkx).
+        :param index: integer representing the node
+        :return: integer representing the degree of the node
+        '''
+        degree = int(self.indptr[index + 1] - self.indptr[index])
+
+        if not self.undirected:
+            return degree + int(self.indegree[index])
+
+        if self.meta['self_loops'] and index in self.Neighbors(index):
+            return degree + 1
+
+        return degree
+
+    def degree(self, node, weight=None):
+        return self.Degree(self.Index(node))
+
+    def nodes(self):
+        return list(self)
+
+    def number_of_nodes(self):
+        return len(self)
+
+    def number_of_edges(self):
+        if self.undirected:
+            return (len(self.indices) - self.meta['self_loops']) / 2 + self.meta['self_loops']
+
+        return len(self.indices)
+
+    def edges(self):
+        sources = np.repeat(np.arange(len(self)), np.diff(self.indptr))
+
+        return [(self.Name(u), self.Name(v)) for u, v in zip(sources, self.indices) if not self.undirected or u <= v]
+
+    def is_directed(self):
+        return not self.undirected
+
+    def to_undirected(self):
+        return CSRGraph(self.location, True)
+
+    def ToNetworkX(self):
+        '''
+        Function builds a networkx graph (without node or edge attributes) from the CSR arrays.
+        :return: networkx DiGraph (or Graph when the undirected adjacency is used)
+        '''
+        graph = nx.Graph() if self.undirected else nx.DiGraph()
+        graph.add_nodes_from(self.nodes())
+        graph.add_edges_from(self.edges())
+
+        return graph
+
+
+def WriteCSR(graph, output):
+    '''
+    Function writes the structure of a networkx graph to disk as CSR arrays and a string table so that it can be opened
+    with LoadCSR. Node and edge attributes are not written. The files written are: output.meta (counts and integer
+    type), output.names and output.offsets (node names sorted and concatenated, and the offset of each name),
+    output.indptr and output.indices (out-edges of a directed graph), output.indegree (in-degree of each node), and
+    output.undirected.indptr and output.undirected.indices (the symmetric adjacency).
+    :param graph: networkx graph
+    :param output: string containing the file path/name prefix the graph is written to
+    :return: string containing the file path/name prefix
+    '''
+    names = sorted([x.encode('utf8') if isinstance(x, unicode) else str(x) for x in graph.nodes()])
+    index = dict(zip(names, xrange(len(names))))
+    key = lambda x: index[x.encode('utf8') if isinstance(x, unicode) else str(x)]
+    n = len(names)
+
+    edges = np.array([(key(u), key(v)) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+    if not graph.is_directed():
+        edges = np.vstack([edges, edges[:, ::-1]])
+
+    dtype = np.int32 if max(n, len(edges) * 2) < 2 ** 31 else np.int64
+
+    # directed adjacency - an undirected graph stores each edge in both directions
+    directed = np.unique(edges[:, 0] * n + edges[:, 1]) if len(edges) else np.zeros(0, dtype=np.int64)
+    undirected = np.unique(np.concatenate([directed, (directed % n) * n + directed / n])) if n else directed
+
+    for prefix, pairs in [(output, directed), (output + '.undirected', undirected)]:
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(pairs / n, minlength=n) if n else [])])
+        indptr.astype(dtype).tofile(prefix + '.indptr')
+        (pairs % n if n else pairs).astype(dtype).tofile(prefix + '.indices')
+
+    np.bincount(directed % n if n else directed, minlength=n).astype(dtype).tofile(output + '.indegree')
+
+    offsets = np.concatenate([[0], np.cumsum([len(x) for x in names])]).astype(np.int64)
+    offsets.tofile(output + '.offsets')
+
+    with open(output + '.names', 'wb') as outfile:
+        outfile.write(''.join(names))
+
+    self_loops = int(np.sum(directed / n == directed % n)) if n else 0
+    json.dump({'nodes': n, 'edges': len(directed), 'self_loops': self_loops, 'directed': graph.is_directed(),
+               'dtype': np.dtype(dtype).name}, open(output + '.meta', 'w'))
+
+    return output
+
+
+def CSRArrays(graph, directed=False):
+    '''
+    Function builds the adjacency of a graph as CSR arrays in memory. Nodes are numbered by the sorted order of their
+    names, as in WriteCSR, and parallel edges are stored once. The arrays of a CSRGraph are used as they are.
+    :param graph: networkx graph or CSRGraph
+    :param directed: boolean indicating whether the successors of a directed graph are stored (False stores the
+    undirected, symmetric, adjacency)
+    :return: a list where list[0] is a function returning the name of a node, list[1] is a function returning the integer
+    representing a node, list[2] is the indptr array, and list[3] is the indices array
+    '''
+    if isinstance(graph, CSRGraph):
+        graph = graph if graph.undirected or directed else graph.to_undirected()
+        return [graph.Name, graph.Index, np.asarray(graph.indptr), np.asarray(graph.indices)]
+
+    names = sorted(graph.nodes())
+    index = dict(zip(names, xrange(len(names))))
+    n = len(names)
+
+    edges = np.array([(index[u], index[v]) for u, v in graph.edges_iter()], dtype=np.int64).reshape(-1, 2)
+    pairs = edges[:, 0] * n + edges[:, 1]
+    if not (directed and graph.is_directed()):
+        pairs = np.concatenate([pairs, edges[:, 1] * n + edges[:, 0]])
+    pairs = np.unique(pairs)
+    dtype = np.int32 if max(n, len(pairs)) < 2 ** 31 else np.int64
+
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(pairs / n, minlength=n) if n else [])]).astype(dtype)
+
+    return [names.__getitem__, index.__getitem__, indptr, (pairs % n if n else pairs).astype(dtype)]
+
+
+def BFS(indptr, indices, source, depth=None, targets=None):
+    '''
+    Function runs a breadth-first search over CSR arrays one level at a time. The neighbors of every node in the
+    frontier are gathered with a single vectorized index rather than node by node.
+    :param indptr: numpy array storing the offset of the neighbors of each node in indices
+    :param indices: numpy array storing the neighbors of every node
+    :param source: integer representing the node the search starts from
+    :param depth: integer representing the largest distance searched (None searches the whole component)
+    :param targets: numpy array of integers representing nodes whose distances are needed (the search stops once they
+    have all been reached; None searches the whole component)
+    :return: numpy array of integers storing the distance of every node from the source (-1 if it was not reached)
+    '''
+    distance = np.empty(len(indptr) - 1, dtype=np.int32)
+    distance.fill(-1)
+    distance[source] = 0
+    frontier = np.array([source])
+    level = 0
+
+    while len(frontier) and (depth is None or level < depth):
+        if targets is not None and (distance[targets] >= 0).all():
+            break
+
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+
+        if not total:
+            break
+
+        # position of every neighbor of the frontier in indices
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+        neighbors = indices[offsets + np.arange(total)]
+        frontier = np.unique(neighbors[distance[neighbors] < 0])
+
+        level += 1
+        distance[frontier] = level
+
+    return distance
+
+
+def LoadCSR(location, undirected=False):
+    '''
+    Function opens a graph written by WriteCSR with numpy.memmap.
+    :param location: string containing the file path/name prefix the graph was written to
+    :param undirected: boolean indicating whether the undirected (symmetric) adjacency is used
+    :return: a CSRGraph
+    '''
+
+    return CSRGraph(location, undirected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Writes an OWL-NETS network as memory-mapped CSR arrays.')
+    parser.add_argument('network', help='network file (OWL-NETS .json, or .gml)')
+    parser.add_argument('output', help='file path/name prefix for the CSR files')
+    args = parser.parse_args()
+
+    graph = LoadGraph(args.network)[1] if args.network.endswith('.json') else nx.read_gml(args.network)
+
+    print 'CSR graph written to: ' + WriteCSR(graph, args.output)
+
+
+if __name__ == '__main__':
+    main()
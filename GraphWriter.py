@@ -0,0 +1,288 @@
+##########################################################################################################
+# GraphWriter.py
+# Purpose: script writes networks to GML (optionally gzip compressed) and tab-delimited edge list files
+# version 1.1.0
+# date: 10.19.2026
+##########################################################################################################
+
+
+## import module/script dependencies
+import gzip
+import multiprocessing
+import os
+import re
+import tempfile
+import networkx as nx
+
+
+# characters networkx escapes in GML strings (unprintable or non-ASCII characters, double quotes, and ampersands)
+UNSAFE = re.compile('[^ -~]|[&"]')
+
+# GML keys must start with a letter and only contain letters and digits
+VALID_KEY = re.compile('^[A-Za-z][0-9A-Za-z]*$')
+
+# number of lines joined into a single write
+BUFFER = 10000
+
+# edges of the graph being written by WriteEdgeList (inherited by the worker processes)
+EDGES = []
+
+
+
+def Escape(text):
+    '''
+    Function escapes a string the same way as networkx.readwrite.gml.escape (unprintable or non-ASCII characters,
+    double quotes, and ampersands are replaced by XML character references). Strings which do not need escaping are
+    returned without running the substitution.
+    :param text: string or unicode string
+    :return: string containing the escaped text
+    '''
+    if UNSAFE.search(text):
+        text = UNSAFE.sub(lambda x: '&#' + str(ord(x.group(0))) + ';', text)
+
+    return text if isinstance(text, str) else str(text)
+
+
+def Stringize(key, value, ignored_keys, indent, cache, in_list=False):
+    '''
+    Function converts an attribute into GML lines following the rules of networkx.generate_gml: integers and floats
+    are written as numbers, dictionaries as nested lists, non-empty lists as one line per item, and strings are quoted
+    and escaped. Attribute names are only validated the first time they are seen.
+    :param key: string containing the attribute name
+    :param value: attribute value
+    :param ignored_keys: set of attribute names which are not written
+    :param indent: string containing the indentation of the lines
+    :param cache: dictionary where the keys are validated attribute names and the values are the names as strings
+    :param in_list: boolean indicating whether the value is an item of a list
+    :return: list of strings containing the GML lines
+    '''
+    if key in ignored_keys:
+        return []
+
+    if key not in cache:
+        if not isinstance(key, (str, unicode)) or not VALID_KEY.match(key):
+            raise nx.NetworkXError('%r is not a valid key' % (key,))
+        cache[key] = str(key)
+
+    name = cache[key]
+
+    if isinstance(value, (str, unicode)):
+        return [indent + name + ' "' + Escape(value) + '"']
+
+    if isinstance(value, (int, long)):
+        return [indent + name + ' ' + str(value)]
+
+    if isinstance(value, float):
+        text = repr(value).upper()
+        epos = text.rfind('E')
+        if epos != -1 and text.find('.', 0, epos) == -1:
+            text = text[:epos] + '.' + text[epos:]
+        return [indent + name + ' ' + text]
+
+    if isinstance(value, dict):
+        lines = [indent + name + ' [']
+        for item_key, item in value.items():
+            lines.extend(Stringize(item_key, item, (), indent + '  ', cache))
+        return lines + [indent + ']']
+
+    if isinstance(value, list) and value and not in_list:
+        lines = []
+        for item in value:
+            lines.extend(Stringize(key, item, (), indent + '  ', cache, True))
+        return lines
+
+    raise nx.NetworkXError('%r is not a string' % (value,))
+
+
+def GMLLines(nodes, edges, directed=True, graph_attributes=None):
+    '''
+    Function generates the lines of a GML file from node and edge iterators. Nodes are numbered in the order they are
+    generated and the output is identical to networkx.generate_gml for the same graph (multigraphs are not supported).
+    :param nodes: iterable of tuples where tuple[0] is a node and tuple[1] is a dictionary of node attributes
+    :param edges: iterable of tuples where tuple[0] and tuple[1] are nodes and tuple[2] is a dictionary of edge
+    attributes
+    :param directed: boolean indicating whether the graph is directed
+    :param graph_attributes: dictionary of graph attributes
+    :return: generator of strings, one per line (without newlines)
+    '''
+    cache = {}
+    node_id = {}
+
+    yield 'graph ['
+
+    if directed:
+        yield '  directed 1'
+
+    for attr, value in (graph_attributes or {}).items():
+        for line in Stringize(attr, value, set(['directed', 'multigraph', 'node', 'edge']), '  ', cache):
+            yield line
+
+    ignored_keys = set(['id', 'label'])
+
+    for node, attrs in nodes:
+        node_id[node] = str(len(node_id))
+
+        yield '  node ['
+        yield '    id ' + node_id[node]
+
+        for line in Stringize('label', node, (), '    ', cache):
+            yield line
+
+        for attr, value in attrs.items():
+            for line in Stringize(attr, value, ignored_keys, '    ', cache):
+                yield line
+
+        yield '  ]'
+
+    ignored_keys = set(['source', 'target'])
+
+    for u, v, attrs in edges:
+        yield '  edge ['
+        yield '    source ' + node_id[u]
+        yield '    target ' + node_id[v]
+
+        for attr, value in attrs.items():
+            for line in Stringize(attr, value, ignored_keys, '    ', cache):
+                yield line
+
+        yield '  ]'
+
+    yield ']'
+
+
+class AtomicFile:
+    '''
+    Class writes a file through a temporary file in the same directory, which replaces the file when it is closed
+    without an error (and is removed otherwise). A process reading the file (e.g., another job of BuildService) sees
+    either the previous file or the complete new one, never a partly written file.
+    :param output: file path and name where the file should be written
+    :param compress: boolean indicating whether the file should be gzip compressed
+    '''
+
+    def __init__(self, output, compress=False):
+        self.name = output
+        handle, self.temporary = tempfile.mkstemp(dir=os.path.dirname(output) or '.',
+                                                  prefix='.' + os.path.basename(output) + '.', suffix='.tmp')
+        self.raw = os.fdopen(handle, 'wb')
+        self.file = gzip.GzipFile(output, 'wb', fileobj=self.raw) if compress else self.raw
+
+    def write(self, data):
+        self.file.write(data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, value, trace):
+        if self.file is not self.raw:
+            self.file.close()
+
+        self.raw.close()
+
+        if kind is not None:
+            os.remove(self.temporary)
+            return False
+
+        # mkstemp creates files only their owner can read, so the file gets the permissions of a newly opened file
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(self.temporary, 0666 & ~umask)
+        os.rename(self.temporary, self.name)
+
+        return False
+
+
+def Open(output, compress):
+    '''
+    Function opens a file for writing, compressing it with gzip when compress is True or the file name ends in .gz. The
+    file is written atomically (see AtomicFile), so it must be used in a with statement.
+    :param output: file path and name where the file should be written
+    :param compress: boolean indicating whether the file should be gzip compressed
+    :return: AtomicFile object
+    '''
+    if compress or output.endswith('.gz'):
+        return AtomicFile(output if output.endswith('.gz') else output + '.gz', True)
+
+    return AtomicFile(output)
+
+
+def WriteGML(graph, output, compress=False):
+    '''
+    Function writes a networkx graph to a GML file. The output is byte-identical to networkx.write_gml, but lines are
+    generated without the per-value checks of the networkx writer and are written in large buffered blocks.
+    Multigraphs are passed to networkx.write_gml.
+    :param graph: networkx graph
+    :param output: file path and name where the GML file should be written
+    :param compress: boolean indicating whether the file should be gzip compressed (".gz" is added to the name)
+    :return: string containing the file path and name of the GML file
+    '''
+    if graph.is_multigraph():
+        with Open(output, compress) as outfile:
+            nx.write_gml(graph, outfile)
+
+        return outfile.name
+
+    with Open(output, compress) as outfile:
+        block = []
+
+        for line in GMLLines(graph.node.iteritems(), graph.edges_iter(data=True), graph.is_directed(), graph.graph):
+            block.append(line)
+
+            if len(block) == BUFFER:
+                outfile.write('\n'.join(block) + '\n')
+                block = []
+
+        if block:
+            outfile.write('\n'.join(block) + '\n')
+
+        return outfile.name
+
+
+def EdgeListChunk(bounds):
+    '''
+    Function formats a slice of the edges being written by WriteEdgeList as tab-delimited lines (source, target, and a
+    dictionary of edge attributes readable by networkx.read_edgelist with delimiter='\t').
+    :param bounds: tuple storing the index of the first edge and the index after the last edge of the slice
+    :return: string containing the lines for the slice
+    '''
+    lines = []
+
+    for u, v, attrs in EDGES[bounds[0]:bounds[1]]:
+        if '\t' in u + v or '\n' in u + v:
+            raise ValueError('Node names written to an edge list cannot contain tabs or newlines: %r, %r' % (u, v))
+        lines.append(u + '\t' + v + '\t' + repr(attrs) + '\n')
+
+    return ''.join(lines)
+
+
+def WriteEdgeList(graph, output, processes=1, compress=False):
+    '''
+    Function writes the edges of a networkx graph to a tab-delimited edge list, which is much cheaper to parse than
+    GML (node attributes are not written). The edges are formatted in chunks by a pool of worker processes and written
+    in order.
+    :param graph: networkx graph whose nodes are strings
+    :param output: file path and name where the edge list should be written
+    :param processes: integer representing the number of worker processes (1 formats the edges in this process)
+    :param compress: boolean indicating whether the file should be gzip compressed (".gz" is added to the name)
+    :return: string containing the file path and name of the edge list
+    '''
+    global EDGES
+    EDGES = graph.edges(data=True)
+    chunks = [(start, start + BUFFER) for start in xrange(0, len(EDGES), BUFFER)]
+
+    with Open(output, compress) as outfile:
+        if processes > 1 and len(chunks) > 1:
+            # workers are forked after EDGES is set, so the edges are shared rather than sent to each worker
+            pool = multiprocessing.Pool(processes=processes)
+            try:
+                for block in pool.imap(EdgeListChunk, chunks):
+                    outfile.write(block)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for chunk in chunks:
+                outfile.write(EdgeListChunk(chunk))
+
+    EDGES = []
+
+    return outfile.name
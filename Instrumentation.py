@@ -0,0 +1,194 @@
+##########################################################################################
+# Instrumentation.py
+# Purpose: script records timing, memory, and item count information for pipeline stages
+# version 1.1.0
+# date: 10.19.2026
+##########################################################################################
+
+
+## import module/script dependencies
+import cProfile
+import csv
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+
+
+def PeakRSS():
+    '''
+    Function returns the peak resident set size of the current process in megabytes. The units of ru_maxrss differ by
+    platform (bytes on OS X, kilobytes on Linux), so the value is normalized before it is returned.
+    :return: float representing the peak resident set size of the current process in megabytes
+    '''
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if sys.platform == 'darwin':
+        return peak / (1024.0 * 1024.0)
+    else:
+        return peak / 1024.0
+
+
+def CPUTime():
+    '''
+    Function returns the user plus system CPU time (in seconds) consumed by the current process.
+    :return: float representing the CPU time consumed by the current process
+    '''
+    times = os.times()
+
+    return times[0] + times[1]
+
+
+def ProcessStart():
+    '''
+    Function returns the time the current process was started (including interpreter startup), read from /proc on
+    Linux.
+    :return: float representing the start time in seconds since the epoch or None where /proc is not available
+    '''
+    try:
+        with open('/proc/self/stat') as stat:
+            ticks = float(stat.read().rpartition(')')[2].split()[19])
+
+        with open('/proc/uptime') as uptime:
+            boot = time.time() - float(uptime.read().split()[0])
+
+        return boot + ticks / os.sysconf('SC_CLK_TCK')
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+
+
+class PipelineProfiler:
+    '''
+    Class records wall time, CPU time, peak RSS delta, and item counts (e.g., triples, bindings, nodes, edges) for each
+    stage of a pipeline. Stages are entered with the Stage context manager and must not be nested. When profile is
+    True, each stage is also run under its own cProfile profiler so that the stats for the hottest stage can be dumped.
+    '''
+
+    FIELDS = ['stage', 'wall_time', 'cpu_time', 'peak_rss_delta', 'triples', 'bindings', 'nodes', 'edges']
+
+    def __init__(self, profile=False, report_format='json'):
+        self.profile = profile
+        self.report_format = report_format
+        self.stages = []
+        self.profiles = {}
+
+    @contextmanager
+    def Stage(self, name):
+        '''
+        Function is a context manager that records the resource usage of the code run within it as a pipeline stage.
+        The stage record is yielded so that item counts can be added to it while the stage runs.
+        :param name: string containing the name of the pipeline stage
+        :return: a dictionary storing the stage record
+        '''
+        record = {'stage': name}
+        profiler = cProfile.Profile() if self.profile else None
+
+        rss_start = PeakRSS()
+        cpu_start = CPUTime()
+        wall_start = time.time()
+
+        if profiler:
+            profiler.enable()
+
+        try:
+            yield record
+
+        finally:
+            if profiler:
+                profiler.disable()
+                self.profiles[name] = profiler
+
+            record['wall_time'] = time.time() - wall_start
+            record['cpu_time'] = CPUTime() - cpu_start
+            record['peak_rss_delta'] = PeakRSS() - rss_start
+            self.stages.append(record)
+
+    def Record(self, name, wall_time, cpu_time, peak_rss_delta, **counts):
+        '''
+        Function adds a stage which was measured outside of the profiler (e.g., process startup and module imports,
+        which happen before the profiler is created).
+        :param name: string containing the name of the pipeline stage
+        :param wall_time: float representing the wall time of the stage in seconds
+        :param cpu_time: float representing the CPU time of the stage in seconds
+        :param peak_rss_delta: float representing the peak RSS increase of the stage in megabytes
+        :param counts: keyword arguments where the keys are count names and the values are integers
+        '''
+        record = {'stage': name, 'wall_time': wall_time, 'cpu_time': cpu_time, 'peak_rss_delta': peak_rss_delta}
+        record.update(counts)
+        self.stages.append(record)
+
+    def Count(self, name, **counts):
+        '''
+        Function adds item counts to a stage which has already been recorded (e.g., number of nodes and edges in a
+        graph that was built inside of the stage).
+        :param name: string containing the name of the pipeline stage
+        :param counts: keyword arguments where the keys are count names and the values are integers
+        '''
+        for record in self.stages:
+            if record['stage'] == name:
+                record.update(counts)
+
+    def HottestStage(self):
+        '''
+        Function returns the name of the stage with the largest wall time.
+        :return: string containing the name of the stage with the largest wall time
+        '''
+        if not self.stages:
+            return None
+
+        return max(self.stages, key=lambda x: x['wall_time'])['stage']
+
+    def Summary(self):
+        '''
+        Function prints a table of the recorded stages, where each row contains the wall time, CPU time, and peak RSS
+        delta for a single stage.
+        '''
+        print 'Pipeline stage timings (wall s / cpu s / peak rss delta MB)'
+
+        for record in self.stages:
+            print '{0:<20} {1:>10.3f} {2:>10.3f} {3:>10.1f}'.format(record['stage'], record['wall_time'],
+                                                                   record['cpu_time'], record['peak_rss_delta'])
+        print '\n'
+
+    def WriteReport(self, output):
+        '''
+        Function writes the recorded stages to a JSON or CSV file, depending on the report_format of the profiler. The
+        file extension is appended to the output.
+        :param output: file path and name (without extension) where the report should be written
+        :return: string containing the file path and name of the report
+        '''
+        if self.report_format == 'csv':
+            report = output + '.csv'
+
+            with open(report, 'wb') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=self.FIELDS, restval='', extrasaction='ignore')
+                writer.writeheader()
+
+                for record in self.stages:
+                    writer.writerow(record)
+
+        else:
+            report = output + '.json'
+
+            with open(report, 'w') as outfile:
+                json.dump({'stages': self.stages, 'hottest_stage': self.HottestStage()}, outfile, indent=2)
+
+        return report
+
+    def DumpProfile(self, output):
+        '''
+        Function writes the cProfile stats for the hottest stage to a file which can be read with pstats.
+        :param output: file path and name where the stats should be written
+        :return: string containing the file path and name of the stats file or None if profiling was not enabled
+        '''
+        hottest = self.HottestStage()
+
+        if hottest not in self.profiles:
+            return None
+
+        self.profiles[hottest].dump_stats(output)
+
+        return output
@@ -1,8 +1,8 @@
 ##########################################################################################
 # LinkPrediction.py  - http://www.research.rutgers.edu/~ss2078/papers/LinkPrediction.pdf
 # Purpose: script contains methods for 10 link prediction algorithms
-# version 1.1.0
-# date: 01.28.2017
+# version 1.2.0
+# date: 10.19.2026
 ##########################################################################################
 
 
@@ -11,8 +11,13 @@ import networkx as nx
 import numpy as np
 import random
 import six
+import GraphLoader
 
 
+# scorers which only depend on the degrees and common neighbors of the nodes (see IncrementalScores)
+NEIGHBORHOOD_METHODS = ['DegreeProduct', 'CommonNeighbors', 'Jaccard', 'Sorensen', 'LHN', 'ResourceAllocation',
+                        'AdamicAdar']
+
 
 def DegreeProduct(graph, edges):
     ''' Function takes a networkx graph object and list of edges calculates the Degree Product for these edges given the
@@ -148,29 +153,55 @@ def LHN(graph, edges):
     return scores
 
 
-def ShortestPath(graph, edges):
-    ''' Function takes a networkx graph object and list of edges calculates the shortest path for these edges given the
-    structure of the graph.
-    :param graph: networkx graph object
+def ShortestPathScores(graph, edges, depth=None):
+    ''' Function takes a networkx graph object (or GraphLoader.CSRGraph) and list of edges and calculates the shortest
+    path score (1 / the number of nodes on a shortest path, 0 if there is no path) for these edges given the structure
+    of the graph. The edges are grouped by source node and a single breadth-first search is run over CSR arrays for
+    each distinct source, which stops once every target of the source has been reached. For an undirected graph each
+    edge is searched from whichever of its nodes occurs in more edges, so fewer searches are run.
+    :param graph: networkx graph object or GraphLoader.CSRGraph
     :param edges: list of tuples
-    :return: a dictionary of scores for the edges
+    :param depth: integer representing the longest path searched (edges whose nodes are further apart score 0)
+    :return: numpy array of scores, one per edge (in the order of the edges)
     '''
+    _, index, indptr, indices = GraphLoader.CSRArrays(graph, directed=True)
+    pairs = np.array([(index(i), index(j)) for i, j in edges], dtype=np.int64).reshape(-1, 2)
+    scores = np.zeros(len(pairs))
 
-    scores = {}
+    if not len(pairs):
+        return scores
 
-    for edge in edges:
-        i = edge[0]
-        j = edge[1]
+    sources, targets = pairs[:, 0], pairs[:, 1]
 
-        if nx.has_path(graph, i, j):
-            scores[edge] = 1.0/len(nx.shortest_path(graph, i, j))
+    if not graph.is_directed():
+        counts = np.bincount(pairs.ravel(), minlength=len(indptr) - 1)
+        swap = counts[targets] > counts[sources]
+        sources, targets = np.where(swap, targets, sources), np.where(swap, sources, targets)
 
-        else:
-            scores[edge] = 0.0
+    order = np.argsort(sources, kind='mergesort')
+    bounds = np.flatnonzero(np.diff(sources[order])) + 1
+
+    for group in np.split(order, bounds):
+        group_targets = targets[group]
+        distance = GraphLoader.BFS(indptr, indices, sources[group[0]], depth, group_targets)[group_targets]
+        scores[group[distance >= 0]] = 1.0 / (distance[distance >= 0] + 1)
 
     return scores
 
 
+def ShortestPath(graph, edges, depth=None):
+    ''' Function takes a networkx graph object and list of edges calculates the shortest path for these edges given the
+    structure of the graph (see ShortestPathScores).
+    :param graph: networkx graph object
+    :param edges: list of tuples
+    :param depth: integer representing the longest path searched (edges whose nodes are further apart score 0)
+    :return: a dictionary of scores for the edges
+    '''
+    edges = list(edges)
+
+    return dict(zip(edges, ShortestPathScores(graph, edges, depth).tolist()))
+
+
 def ResourceAllocation(graph, edges):
     ''' Function takes a networkx graph object and list of edges calculates the resource allocation for these edges
     given the structure of the graph.
@@ -230,12 +261,255 @@ def AdamicAdar(graph, edges):
             n_intersection = set(graph[i].keys()).intersection(set(graph[j].keys()))
 
             for c in n_intersection:
-                w.append(1.0/np.log(g.degree(c)))
+                w.append(1.0/np.log(graph.degree(c)))
             scores[edge] = np.sum(w)
 
     return scores
 
 
+class IncrementalScores:
+    ''' Class stores the state the neighborhood scorers (DegreeProduct, CommonNeighbors, Jaccard, Sorensen, LHN,
+    ResourceAllocation, and AdamicAdar) need for a fixed set of candidate edges, so that the scores can be refreshed
+    after edges are added to or removed from the graph without rescoring every candidate. The state is the degree and
+    number of neighbors of every node and, for every candidate, the number of common neighbors, the sum of their
+    degrees, and the sum of 1/log(degree) over them. A node c only contributes to candidates whose nodes are both
+    neighbors of c, so a change to edge (u, v) is applied by removing the contributions of u and v, changing the edge,
+    and adding the contributions back: only candidates within N(u) or N(v) are touched. Scores are identical to the
+    dictionary scorers except AdamicAdar: its sums are rounded to 12 decimal places, so that sums of the same terms
+    added in a different order (e.g., after updates) do not split ties, and differ from AdamicAdar by at most 5e-13.
+    :param graph: undirected networkx graph object (a copy of its structure is stored)
+    :param edges: list of tuples storing the candidate edges
+    '''
+
+    def __init__(self, graph, edges):
+        self.edges = list(edges)
+        self.id = {}
+        self.neighbors = []
+        self.degree = []
+
+        for node in graph.nodes():
+            self.Id(node)
+        for i, j in graph.edges_iter():
+            self.Link(self.Id(i), self.Id(j), 1)
+
+        pairs = np.array([(self.Id(i), self.Id(j)) for i, j in self.edges], dtype=np.int64).reshape(-1, 2)
+        self.keys = np.unique(self.Key(pairs[:, 0], pairs[:, 1]))
+        self.slot = np.searchsorted(self.keys, self.Key(pairs[:, 0], pairs[:, 1]))
+        self.first, self.second = self.keys >> 32, self.keys & 0xFFFFFFFF
+
+        self.common = np.zeros(len(self.keys), dtype=np.int64)
+        self.degree_sum = np.zeros(len(self.keys), dtype=np.int64)
+        self.log_sum = np.zeros(len(self.keys))
+
+        for node in xrange(len(self.neighbors)):
+            self.Contribute(node, 1)
+
+    @staticmethod
+    def Key(i, j):
+        # candidate edges are undirected, so each pair of node ids is stored once with the smaller id first
+        return np.minimum(i, j) << 32 | np.maximum(i, j)
+
+    def Id(self, node):
+        ''' Function returns the integer representing a node, adding the node the first time it is seen.
+        :param node: node of the graph
+        :return: integer representing the node
+        '''
+        if node not in self.id:
+            self.id[node] = len(self.neighbors)
+            self.neighbors.append(set())
+            self.degree.append(0)
+
+        return self.id[node]
+
+    def Link(self, i, j, change):
+        # adds (change=1) or removes (change=-1) an edge between two node ids; a self-loop adds 2 to the degree
+        if change > 0:
+            self.neighbors[i].add(j)
+            self.neighbors[j].add(i)
+        else:
+            self.neighbors[i].discard(j)
+            self.neighbors[j].discard(i)
+
+        self.degree[i] += change
+        self.degree[j] += change
+
+    def Within(self, node):
+        ''' Function returns the candidates whose nodes are both neighbors of a node (the candidates the node is a common
+        neighbor of). Pairs of neighbors are looked up when there are few neighbors; otherwise the candidates are
+        filtered.
+        :param node: integer representing the node
+        :return: numpy array of integers representing the candidates
+        '''
+        neighbors = np.array(sorted(self.neighbors[node]), dtype=np.int64)
+
+        if not len(neighbors) or not len(self.keys):
+            return np.zeros(0, dtype=np.int64)
+
+        # pairs include a neighbor with itself (a candidate edge from a node to itself)
+        if len(neighbors) * (len(neighbors) + 1) / 2 <= len(self.keys):
+            first, second = np.triu_indices(len(neighbors))
+            keys = self.Key(neighbors[first], neighbors[second])
+            found = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+            return found[self.keys[found] == keys]
+
+        mask = np.zeros(len(self.neighbors), dtype=bool)
+        mask[neighbors] = True
+
+        return np.flatnonzero(mask[self.first] & mask[self.second])
+
+    def Contribute(self, node, sign):
+        # adds (sign=1) or removes (sign=-1) a node's contribution to the candidates it is a common neighbor of
+        found = self.Within(node)
+
+        if len(found):
+            self.common[found] += sign
+            self.degree_sum[found] += sign * self.degree[node]
+
+            # a node with a degree of 1 is only a common neighbor of a candidate from its neighbor to itself
+            if self.degree[node] > 1:
+                self.log_sum[found] += sign / np.log(self.degree[node])
+
+    def Change(self, u, v, change):
+        # applies an edge change, replacing the contributions of both nodes
+        i, j = self.Id(u), self.Id(v)
+
+        if (j in self.neighbors[i]) == (change > 0):
+            return
+
+        for node in set([i, j]):
+            self.Contribute(node, -1)
+
+        self.Link(i, j, change)
+
+        for node in set([i, j]):
+            self.Contribute(node, 1)
+
+    def AddEdge(self, u, v):
+        ''' Function adds an edge to the graph and updates the affected candidates.
+        :param u: node of the graph
+        :param v: node of the graph
+        '''
+        self.Change(u, v, 1)
+
+    def RemoveEdge(self, u, v):
+        ''' Function removes an edge from the graph and updates the affected candidates.
+        :param u: node of the graph
+        :param v: node of the graph
+        '''
+        self.Change(u, v, -1)
+
+    def Update(self, added=(), removed=()):
+        ''' Function applies a batch of edge changes (e.g., the bindings added to or removed from a NETS network).
+        :param added: list of tuples storing the edges added to the graph
+        :param removed: list of tuples storing the edges removed from the graph
+        '''
+        for u, v in removed:
+            self.Change(u, v, -1)
+
+        for u, v in added:
+            self.Change(u, v, 1)
+
+    def Slots(self, edges=None):
+        ''' Function finds the stored candidates of a list of edges.
+        :param edges: list of tuples storing candidate edges (None returns the candidates in the order they were given)
+        :return: numpy array of integers representing the candidates, one per edge
+        '''
+        if edges is None:
+            return self.slot
+
+        pairs = np.array([(self.id[i], self.id[j]) for i, j in edges], dtype=np.int64).reshape(-1, 2)
+
+        return np.searchsorted(self.keys, self.Key(pairs[:, 0], pairs[:, 1]))
+
+    def ScoreArray(self, method, edges=None):
+        ''' Function calculates the scores of candidate edges from the stored state.
+        :param method: string containing the name of the scorer ('DegreeProduct', 'CommonNeighbors', 'Jaccard',
+        'Sorensen', 'LHN', 'ResourceAllocation', or 'AdamicAdar')
+        :param edges: list of tuples storing candidate edges (None scores every candidate)
+        :return: numpy array of scores, one per edge
+        '''
+        return self.SlotScores(method, self.Slots(edges))
+
+    def ScoreMatrix(self, methods=None, edges=None):
+        ''' Function calculates the scores of several scorers for candidate edges from the stored state. The candidates
+        are looked up once and every scorer is derived from the same common neighbor counts and degree sums.
+        :param methods: list of strings containing the names of the scorers (see ScoreArray; None uses every scorer in
+        NEIGHBORHOOD_METHODS)
+        :param edges: list of tuples storing candidate edges (None scores every candidate)
+        :return: numpy array of scores with one row per edge and one column per scorer
+        '''
+        slot = self.Slots(edges)
+        methods = NEIGHBORHOOD_METHODS if methods is None else methods
+
+        return np.column_stack([self.SlotScores(method, slot) for method in methods] or [np.zeros((len(slot), 0))])
+
+    def SlotScores(self, method, slot):
+        ''' Function calculates the scores of stored candidates.
+        :param method: string containing the name of the scorer (see ScoreArray)
+        :param slot: numpy array of integers representing the candidates (see Slots)
+        :return: numpy array of scores, one per candidate
+        '''
+        i, j = self.first[slot], self.second[slot]
+        degree = np.array(self.degree, dtype=np.int64)
+        common = self.common[slot].astype(float)
+        shared = common > 0
+        scores = np.zeros(len(slot))
+
+        if method == 'DegreeProduct':
+            return (degree[i] * degree[j]).astype(float)
+
+        if method == 'CommonNeighbors':
+            return common
+
+        if method == 'Jaccard':
+            sizes = np.array([len(x) for x in self.neighbors])
+            scores[shared] = common[shared] / (sizes[i] + sizes[j] - common)[shared]
+
+        elif method == 'Sorensen':
+            scores[shared] = common[shared] / (degree[i] + degree[j])[shared]
+
+        elif method == 'LHN':
+            scores[shared] = common[shared] / (degree[i] * degree[j])[shared]
+
+        elif method == 'ResourceAllocation':
+            scores[shared] = 1.0 / self.degree_sum[slot][shared]
+
+        elif method == 'AdamicAdar':
+            scores[shared] = np.round(self.log_sum[slot][shared], 12)
+
+        else:
+            raise ValueError('Unknown incremental scorer: ' + str(method))
+
+        return scores
+
+    def Scores(self, method, edges=None):
+        ''' Function calculates the scores of candidate edges from the stored state.
+        :param method: string containing the name of the scorer (see ScoreArray)
+        :param edges: list of tuples storing candidate edges (None scores every candidate)
+        :return: a dictionary of scores for the edges
+        '''
+        edges = self.edges if edges is None else list(edges)
+
+        return dict(zip(edges, self.ScoreArray(method, edges).tolist()))
+
+
+
+def NeighborhoodScores(graph, edges, methods=None):
+    ''' Function takes a networkx graph object and list of edges and calculates several neighborhood scores for these
+    edges in a single pass (see IncrementalScores). Each node adds its degree to every candidate whose nodes are both its
+    neighbors, so the common neighbors of every candidate, the sum of their degrees, and the sum of 1/log(degree) over
+    them are found once and shared by all of the scorers, rather than each scorer intersecting the neighbor sets of
+    every edge again.
+    :param graph: undirected networkx graph object
+    :param edges: list of tuples
+    :param methods: list of strings containing the names of the scorers (None uses every scorer in
+    NEIGHBORHOOD_METHODS)
+    :return: numpy array of scores with one row per edge (in the order of the edges) and one column per scorer
+    '''
+
+    return IncrementalScores(graph, edges).ScoreMatrix(methods)
+
+
 ##for the following algorithms parameter values were chosen to be consistent with:
 #Liben-Nowell D, Kleinberg J. The link-prediction problem for social networks. Journal of the American society for information science and technology.
 
@@ -1,8 +1,8 @@
 #######################################################################################################
 # LinkPredictionResults.py
 # Purpose: script runs 10 link prediction algorithms on training and testing network data in parallel
-# version 1.2.0
-# date: 01.28.2017
+# version 1.3.1
+# date: 10.19.2026
 #######################################################################################################
 
 
@@ -11,15 +11,29 @@ import networkx as nx
 import numpy as np
 from collections import Counter
 import operator
+import os
+import re
+import sqlite3
+import BindingTable
+import GraphLoader
 import LinkPrediction
-import csv
+
+
+# columns of the label index (bio entity URI, ICE id, and human readable label)
+LABEL_FIELDS = ('bio', 'ice', 'label')
+
+# number of rows written to an export file at a time
+BLOCK = 1000000
+
+# characters which require a CSV field to be quoted
+CSV_SPECIAL = re.compile('[,"\r\n]')
 
 
 def LabelDict(results, id, var):
     '''
-    Function takes a json file of results (containing ice ids and labels) and two variables storing the id and labels
+    Function takes a table of results (containing ice ids and labels) and two variables storing the id and labels
     and returns a dictionary where the keys are the id and the values are the corresponding labels.
-    :param results: json file of ice ids and labels
+    :param results: BindingTable of ice ids and labels
     :param id: variable storing ids
     :param var: variable storing labels
     :return:
@@ -27,13 +41,202 @@ def LabelDict(results, id, var):
 
     label_dict = {}
 
-    for res in results['results']['bindings']:
-        label_dict[str(res[str(id)]['value'].split('/')[-1]).encode('utf8')] = str(
-            res[str(var)]['value'].encode('utf8'))
+    for ice, label in results.Rows(str(id), str(var)):
+        label_dict[ice.split('/')[-1]] = label
 
     return label_dict
 
 
+def Text(value):
+    '''
+    Function converts a node name or label into a utf8 encoded string.
+    :param value: string, unicode string, or other value
+    :return: string
+    '''
+
+    return value.encode('utf8') if isinstance(value, unicode) else str(value)
+
+
+class LabelIndex:
+    '''
+    Class stores the labels of bio entities in a SQLite database with one row per bio entity URI, ICE id (the last part
+    of the ICE URI, as in LabelDict), and human readable label, indexed by each of the three. The index is built once
+    and reused (see OpenLabelIndex), and lookups are done in bulk: the distinct keys are joined against the index in a
+    single query and the results are mapped back onto the keys, so labeling a million predicted pairs only looks up each
+    node once.
+    :param location: string containing the file path/name of the database (created if it does not exist)
+    '''
+
+    def __init__(self, location):
+        self.location = location
+        self.connection = sqlite3.connect(location)
+        self.connection.text_factory = str
+        self.connection.execute('CREATE TABLE IF NOT EXISTS labels (bio TEXT, ice TEXT, label TEXT, '
+                                'UNIQUE (bio, ice, label))')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS labels_ice ON labels (ice)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS labels_label ON labels (label)')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS sources (location TEXT PRIMARY KEY, modified REAL, '
+                                'size INTEGER)')
+        self.connection.commit()
+
+    def Current(self, source):
+        '''
+        Function checks whether the index was built from the current version of a file.
+        :param source: string containing the file path/name of the results or network
+        :return: boolean indicating whether the file has not changed since it was indexed
+        '''
+        row = self.connection.execute('SELECT modified, size FROM sources WHERE location = ?',
+                                      (os.path.abspath(source),)).fetchone()
+
+        return row is not None and tuple(row) == (os.path.getmtime(source), os.path.getsize(source))
+
+    def Add(self, rows, source=None):
+        '''
+        Function adds rows to the index.
+        :param rows: iterable of tuples storing the bio entity URI, ICE id, and label
+        :param source: string containing the file path/name the rows were read from (recorded for Current)
+        :return: integer representing the number of rows in the index
+        '''
+        with self.connection:
+            self.connection.executemany('INSERT OR IGNORE INTO labels VALUES (?, ?, ?)', rows)
+
+            if source is not None:
+                self.connection.execute('INSERT OR REPLACE INTO sources VALUES (?, ?, ?)',
+                                        (os.path.abspath(source), os.path.getmtime(source), os.path.getsize(source)))
+
+        return self.connection.execute('SELECT COUNT(*) FROM labels').fetchone()[0]
+
+    def AddResults(self, results, bio, label, ice, source=None):
+        '''
+        Function adds the labels in a table of query results. Each distinct combination of values is decoded once.
+        :param results: BindingTable of query results
+        :param bio: variable storing the bio entity URIs
+        :param label: variable storing the labels
+        :param ice: variable storing the ICE URIs
+        :param source: string containing the file path/name of the results
+        :return: integer representing the number of rows in the index
+        '''
+        pool = results.pool
+        rows = set(results.Codes(str(bio), str(label), str(ice)))
+
+        return self.Add([(pool[x], pool[z].split('/')[-1] if pool[z] else None, pool[y]) for x, y, z in rows], source)
+
+    def AddGraph(self, graph, source=None):
+        '''
+        Function adds the labels of the nodes of an OWL-NETS network, which store the bio entity URI (bio), their
+        labels (labels), and ICE URIs (id) as node attributes. The name of each node is also indexed as a label. GML
+        networks do not store the ICE URIs (GraphWriter drops the id attribute), so their nodes are indexed without ICE
+        ids.
+        :param graph: networkx graph
+        :param source: string containing the file path/name of the network
+        :return: integer representing the number of rows in the index
+        '''
+        rows = []
+
+        for node, attrs in graph.nodes_iter(data=True):
+            labels = attrs.get('labels', [])
+            ids = attrs.get('id', [])
+            labels = labels if isinstance(labels, list) else [labels]
+            ids = ids if isinstance(ids, list) else [ids]
+            bio = attrs.get('bio')
+
+            rows.append((bio, None, node))
+            rows.extend([(bio, ice.split('/')[-1], name) for ice, name in zip(ids, labels)] if ids else
+                        [(bio, None, name) for name in labels])
+
+        return self.Add([tuple([x if x is None else Text(x) for x in row]) for row in rows], source)
+
+    def Lookup(self, keys, by='label', field='bio'):
+        '''
+        Function looks up a field of the index for a list of keys in a single query. Keys which match several rows
+        are given all of the (distinct, sorted) values joined by "|".
+        :param keys: list of strings
+        :param by: string containing the field the keys are matched against ('bio', 'ice', or 'label')
+        :param field: string containing the field which is returned ('bio', 'ice', or 'label')
+        :return: numpy array of strings, one per key (an empty string for keys which are not in the index)
+        :raises ValueError: if a field is unknown, or the ICE ids are used and the index has none (e.g., it was built
+        from a GML network)
+        '''
+        if by not in LABEL_FIELDS or field not in LABEL_FIELDS:
+            raise ValueError('Unknown label field: ' + str(by if by not in LABEL_FIELDS else field))
+
+        if 'ice' in (by, field) and self.connection.execute('SELECT 1 FROM labels WHERE ice IS NOT NULL '
+                                                            'LIMIT 1').fetchone() is None:
+            raise ValueError('The label index ' + self.location + ' has no ICE ids; build it from the query results '
+                             'or the OWL-NETS JSON network')
+
+        # number the distinct keys in the order they are first seen
+        codes = {}
+        inverse = np.fromiter((codes.setdefault(key, len(codes)) for key in keys), dtype=np.int64, count=len(keys))
+        unique = sorted(codes, key=codes.get)
+        found = {}
+
+        with self.connection:
+            self.connection.execute('CREATE TEMP TABLE IF NOT EXISTS lookup (key TEXT PRIMARY KEY)')
+            self.connection.execute('DELETE FROM lookup')
+            self.connection.executemany('INSERT OR IGNORE INTO lookup VALUES (?)', [(Text(x),) for x in unique])
+            rows = self.connection.execute('SELECT DISTINCT lookup.key, labels.' + field + ' FROM lookup JOIN labels ON '
+                                           'labels.' + by + ' = lookup.key WHERE labels.' + field + ' IS NOT NULL')
+
+            for key, value in rows:
+                found.setdefault(key, []).append(value)
+
+        values = np.array(['|'.join(sorted(found.get(Text(x), []))) for x in unique], dtype=object)
+
+        return values[inverse]
+
+    def Pairs(self, edges, by='label', field='bio'):
+        '''
+        Function looks up a field of the index for both nodes of a list of edges (see Lookup).
+        :param edges: list of tuples storing the nodes of the edges
+        :param by: string containing the field the nodes are matched against
+        :param field: string containing the field which is returned
+        :return: tuple of two numpy arrays of strings storing the values of the first and second node of each edge
+        '''
+        values = self.Lookup([node for edge in edges for node in edge[:2]], by, field)
+
+        return values[0::2], values[1::2]
+
+    def Close(self):
+        self.connection.close()
+
+
+def OpenLabelIndex(source, variables=None, location=None):
+    '''
+    Function opens the label index of a query results file or an OWL-NETS network, building it only when it does not
+    exist or the file has changed since it was built. ICE ids are only indexed from the query results or the OWL-NETS
+    JSON network, as GML networks do not store them.
+    :param source: string containing the file path/name of the query results (CSV, TSV, or JSON) or of the network
+    (GML, which may be gzipped, or OWL-NETS JSON)
+    :param variables: list of tuples storing the bio entity, label, and ICE variables of each NETS node in the results
+    (None indexes source as a network)
+    :param location: string containing the file path/name of the index (default: the source with "_labels.sqlite"
+    in place of its extension)
+    :return: LabelIndex
+    '''
+    index = LabelIndex(location or os.path.splitext(re.sub(r'\.gz$', '', source))[0] + '_labels.sqlite')
+
+    if index.Current(source):
+        return index
+
+    with index.connection:
+        index.connection.execute('DELETE FROM labels')
+        index.connection.execute('DELETE FROM sources')
+
+    if variables is not None:
+        results = BindingTable.Load(source)
+
+        for bio, label, ice in variables:
+            index.AddResults(results, bio, label, ice)
+    else:
+        graph = nx.read_gml(source) if source.endswith(('.gml', '.gml.gz')) else GraphLoader.LoadGraph(source)[1]
+        index.AddGraph(graph)
+
+    index.Add([], source)
+
+    return index
+
+
 def EdgeChecker(scores, edges):
     '''
     Function takes a dictionary of edges (keys) and scores (values) and a list of edges. Using the intersection of the
@@ -42,13 +245,157 @@ def EdgeChecker(scores, edges):
     :param edges: list of tuples
     :return: dictionary of tuples (keys) and scores (values)
     '''
-    final_dict = {}
 
-    for edge in set(edges).intersection(set(scores.keys())):
-        final_dict[edge] = scores[edge]
+    return dict([(edge, scores[edge]) for edge in edges if edge in scores])
+
+
+def AlignScores(scores, edges):
+    '''
+    Function converts a dictionary of scores into an array aligned with a list of candidate edges, so that the scores
+    of several methods can be stored as columns for the same edges. Edges which are not in the dictionary (the edges
+    EdgeChecker drops) are given NaN.
+    :param scores: dictionary of edges (keys) and scores (values)
+    :param edges: list of tuples storing the candidate edges
+    :return: numpy array of floats, one per edge
+    '''
+
+    return np.fromiter((scores.get(edge, np.nan) for edge in edges), dtype=float, count=len(edges))
+
+
+def Quote(value):
+    '''
+    Function formats a string as a CSV field, quoting it only when needed (like csv.QUOTE_MINIMAL).
+    :param value: string, unicode string, or other value
+    :return: string containing the CSV field
+    '''
+    value = Text(value)
+
+    return '"' + value.replace('"', '""') + '"' if CSV_SPECIAL.search(value) else value
 
-    return final_dict
 
+def WriteCSVColumns(output, header, columns):
+    '''
+    Function writes aligned columns to a CSV file in blocks of BLOCK rows. Node columns are stored as integer codes
+    into a list of names, so each distinct name is formatted once.
+    :param output: string containing the file path/name of the CSV file
+    :param header: list of strings containing the column names
+    :param columns: list of columns, each a numpy array of floats or a tuple where tuple[0] is a numpy array of integer
+    codes and tuple[1] is the list of names the codes refer to
+    :return: string containing the file path/name of the CSV file
+    '''
+    columns = [(column[0], np.array([Quote(x) for x in column[1]], dtype=object)) if isinstance(column, tuple) else
+               column for column in columns]
+    rows = len(columns[0][0]) if isinstance(columns[0], tuple) else len(columns[0])
+
+    # each row is formatted with a single format string (floats are written with repr, so they read back exactly)
+    line = ','.join(['%s' if isinstance(column, tuple) else '%r' for column in columns])
+
+    with open(output, 'wb') as outfile:
+        outfile.write(','.join([Quote(x) for x in header]) + '\r\n')
+
+        for start in xrange(0, rows, BLOCK):
+            block = [column[1][column[0][start:start + BLOCK]] if isinstance(column, tuple) else
+                     column[start:start + BLOCK].tolist() for column in columns]
+            outfile.write('\r\n'.join([line % row for row in zip(*block)]) + '\r\n')
+
+    return output
+
+
+def WriteParquetColumns(output, header, columns):
+    '''
+    Function writes aligned columns to a Parquet file with one row group per BLOCK rows. Node columns are written as
+    dictionary encoded strings (read as categorical columns by pandas). Requires pyarrow.
+    :param output: string containing the file path/name of the Parquet file
+    :param header: list of strings containing the column names
+    :param columns: list of columns, each a numpy array of floats or a tuple where tuple[0] is a numpy array of integer
+    codes and tuple[1] is the list of names the codes refer to
+    :return: string containing the file path/name of the Parquet file
+    '''
+    # parquet dependencies are only needed by this function
+    import pyarrow
+    import pyarrow.parquet
+
+    columns = [(column[0].astype(np.int32), pyarrow.array([Text(x) for x in column[1]])) if isinstance(column, tuple)
+               else column for column in columns]
+    rows = len(columns[0][0]) if isinstance(columns[0], tuple) else len(columns[0])
+    writer = None
+
+    try:
+        for start in xrange(0, max(rows, 1), BLOCK):
+            arrays = [pyarrow.DictionaryArray.from_arrays(pyarrow.array(column[0][start:start + BLOCK]), column[1])
+                      if isinstance(column, tuple) else pyarrow.array(column[start:start + BLOCK])
+                      for column in columns]
+            table = pyarrow.Table.from_arrays(arrays, header)
+
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(output, table.schema)
+
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return output
+
+
+def ExportScores(edges, columns, output, index=None, field='bio', format=None):
+    '''
+    Function writes the scores of several methods for a shared list of candidate edges as aligned columns (source,
+    target, one column per method, and, when a label index is given, the field of both nodes), which can be read
+    directly with pandas.read_csv or pandas.read_parquet. The nodes are numbered once, so formatting, labeling, and
+    dictionary encoding are done once per distinct node rather than per edge, and rows are written in blocks.
+    :param edges: list of tuples storing the candidate edges
+    :param columns: list of tuples where tuple[0] is a column name and tuple[1] is a numpy array of scores aligned with
+    the edges (see AlignScores)
+    :param output: string containing the file path/name of the export
+    :param index: LabelIndex used to label the nodes (None does not label the nodes)
+    :param field: string containing the field of the label index which is written ('bio', 'ice', or 'label')
+    :param format: string containing the file format ('csv' or 'parquet'; None chooses parquet for files ending in
+    .parquet and CSV otherwise)
+    :return: string containing the file path/name of the export
+    '''
+    format = format or ('parquet' if output.endswith('.parquet') else 'csv')
+
+    if format not in ('csv', 'parquet'):
+        raise ValueError('Unknown export format: ' + str(format))
+
+    for name, column in columns:
+        if len(column) != len(edges):
+            raise ValueError('Column ' + str(name) + ' has ' + str(len(column)) + ' scores for ' + str(len(edges)) +
+                             ' edges')
+
+    # number the nodes in the order they are first seen
+    nodes = {}
+    source = np.fromiter((nodes.setdefault(edge[0], len(nodes)) for edge in edges), dtype=np.int64, count=len(edges))
+    target = np.fromiter((nodes.setdefault(edge[1], len(nodes)) for edge in edges), dtype=np.int64, count=len(edges))
+    names = sorted(nodes, key=nodes.get)
+
+    header = ['source', 'target'] + [name for name, _ in columns]
+    values = [(source, names), (target, names)] + [np.asarray(column, dtype=float) for _, column in columns]
+
+    if index is not None:
+        labels = index.Lookup(names, field=field).tolist()
+        header += ['source_' + field, 'target_' + field]
+        values += [(source, labels), (target, labels)]
+
+    write = WriteParquetColumns if format == 'parquet' else WriteCSVColumns
+
+    return write(output, header, values)
+
+
+def WriteScores(scores, output, index=None, field='bio'):
+    '''
+    Function writes the scores of one method to a CSV file with one row per edge (source, target, and score, see
+    ExportScores).
+    :param scores: dictionary of edges (keys) and scores (values)
+    :param output: string containing the file path/name of the CSV file
+    :param index: LabelIndex used to label the nodes (None does not label the nodes)
+    :param field: string containing the field of the label index which is written ('bio', 'ice', or 'label')
+    :return: string containing the file path/name of the CSV file
+    '''
+    edges = list(scores)
+
+    return ExportScores(edges, [('score', AlignScores(scores, edges))], output, index, field, 'csv')
 
 
 def main():
@@ -92,30 +439,27 @@ def main():
     graph = nx.read_gml('Network_Data/DDI_reactome_query_NETS_network.gml').to_undirected()
 
 
-    methods = [LinkPrediction.DegreeProduct(graph, list(nx.non_edges(graph))),
-               LinkPrediction.ShortestPath(graph, list(nx.non_edges(graph))),
-               LinkPrediction.CommonNeighbors(graph, list(nx.non_edges(graph))),
-               LinkPrediction.AdamicAdvar(graph, list(nx.non_edges(graph))),
-               LinkPrediction.Jaccard(graph, list(nx.non_edges(graph))),
-               LinkPrediction.LHN(graph, list(nx.non_edges(graph))),
-               LinkPrediction.ResourceAllocation(graph, list(nx.non_edges(graph))),
-               LinkPrediction.Sorensen(graph, list(nx.non_edges(graph))),
-               LinkPrediction.katz(graph, beta=0.001, max_power=5, weight=None, dtype=None),
-               LinkPrediction.RPR(graph, alpha = 0.15, beta = 0)]
-
+    # candidate edges shared by every method
+    candidates = list(nx.non_edges(graph))
 
-    # method counter for labeling csv files
-    count = 0
+    # the neighborhood scores are computed in one pass which shares the common neighbors of each candidate
+    names = dict(DegreeProduct='DP', CommonNeighbors='CN', AdamicAdar='AA', Jaccard='J', LHN='LHN',
+                 ResourceAllocation='RA', Sorensen='SS')
+    matrix = LinkPrediction.NeighborhoodScores(graph, candidates)
+    scores = dict([(names[method], matrix[:, k]) for k, method in enumerate(LinkPrediction.NEIGHBORHOOD_METHODS)])
+    scores['SP'] = LinkPrediction.ShortestPathScores(graph, candidates)
 
-    for method in methods:
-        updated_res = EdgeChecker(method, list(nx.non_edges(graph)))
+    # katz and rooted page rank scores are aligned with the candidates as soon as they are computed (candidates a
+    # method does not score are NaN) and all of the methods are written to one file
+    scores['K'] = AlignScores(LinkPrediction.katz(graph, beta=0.001, max_power=5, weight=None, dtype=None), candidates)
+    scores['RPR'] = AlignScores(LinkPrediction.RPR(graph, alpha = 0.15, beta = 0), candidates)
+    columns = [('score_' + name, scores[name]) for name in ['DP', 'SP', 'CN', 'AA', 'J', 'LHN', 'RA', 'SS', 'K', 'RPR']]
 
-        with open('Results/DDI_reactome/NETS_DDI ' + str(count) + '.csv', 'wb') as csvfile:
-            writer = csv.writer(csvfile, delimiter=',', quoting=csv.QUOTE_MINIMAL)
-            for key, values in updated_res.items():
-                writer.writerow([key, values])
+    # label index of the graph (built the first time the graph is used)
+    index = OpenLabelIndex('Network_Data/DDI_reactome_query_NETS_network.gml')
+    ExportScores(candidates, columns, 'Results/DDI_reactome/NETS_DDI_scores.csv', index)
 
-        count += 1
+    index.Close()
 
 
 
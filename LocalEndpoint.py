@@ -0,0 +1,609 @@
+##########################################################################################################
+# LocalEndpoint.py
+# Purpose: script runs a local SPARQL endpoint over N-Triples fixtures with simulated latency and bandwidth
+# version 1.0.1
+# date: 10.19.2026
+##########################################################################################################
+
+
+## import module/script dependencies
+import argparse
+import base64
+import csv
+import json
+import re
+import threading
+import time
+import traceback
+import urlparse
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from StringIO import StringIO
+
+
+# N-Triples terms: IRIs, literals (with optional datatype or language), and blank nodes
+NT_TERM = re.compile(r'(<[^>]*>|"(?:[^"\\]|\\.)*"(?:\^\^<[^>]*>|@[\w-]+)?|_:\S+)')
+
+XSD_INTEGER = '<http://www.w3.org/2001/XMLSchema#integer>'
+
+
+
+class TripleStore:
+    '''
+    Class stores triples in memory, indexed by subject-predicate and predicate-object, and evaluates the subset of
+    SPARQL SELECT queries written by OWL-NETS (see QueryParser.NETSQueryParser): basic graph patterns, zero-or-more
+    property paths (e.g., rdfs:subClassOf*), single triple OPTIONAL clauses, FILTER (in)equality and regex, DISTINCT,
+    constants bound in the select clause, LIMIT and OFFSET. Terms are kept in their N-Triples form. Patterns are joined
+    greedily, always choosing a pattern which shares a variable with the bindings made so far, so connected queries
+    never fall back to cross products.
+    '''
+
+    def __init__(self):
+        self.sp = {}
+        self.po = {}
+        self.size = 0
+
+    def Add(self, s, p, o):
+        objects = self.sp.setdefault(s, {}).setdefault(p, set())
+
+        if o not in objects:
+            objects.add(o)
+            self.po.setdefault(p, {}).setdefault(o, set()).add(s)
+            self.size += 1
+
+    def Load(self, fixture):
+        '''
+        Function reads an N-Triples file into the store.
+        :param fixture: string containing the file path/name of an N-Triples file
+        '''
+        for line in open(fixture):
+            terms = NT_TERM.findall(line)
+
+            if len(terms) == 3 and not line.lstrip().startswith('#'):
+                self.Add(*terms)
+
+    def Match(self, s, p, o):
+        '''
+        Function returns the triples matching a pattern, where None matches any term.
+        :param s: string containing the subject or None
+        :param p: string containing the predicate or None
+        :param o: string containing the object or None
+        :return: generator of tuples storing the subject, predicate, and object of each matching triple
+        '''
+        if p is None:
+            for pred in self.po.keys():
+                for triple in self.Match(s, pred, o):
+                    yield triple
+
+        elif s is not None:
+            for obj in self.sp.get(s, {}).get(p, ()):
+                if o is None or obj == o:
+                    yield s, p, obj
+
+        elif o is not None:
+            for subj in self.po.get(p, {}).get(o, ()):
+                yield subj, p, o
+
+        else:
+            for obj, subjects in self.po.get(p, {}).items():
+                for subj in subjects:
+                    yield subj, p, obj
+
+    def Closure(self, start, p, forward):
+        '''
+        Function returns the nodes reachable from a node by following zero or more edges with the predicate p.
+        :param start: string containing the node to start from
+        :param p: string containing the predicate to follow
+        :param forward: boolean indicating whether edges are followed from subject to object (True) or reverse
+        :return: set of strings containing the reachable nodes (including the start node)
+        '''
+        seen = set([start])
+        queue = [start]
+
+        while queue:
+            node = queue.pop()
+            nxt = self.sp.get(node, {}).get(p, ()) if forward else self.po.get(p, {}).get(node, ())
+
+            for item in nxt:
+                if item not in seen:
+                    seen.add(item)
+                    queue.append(item)
+
+        return seen
+
+    def Extend(self, rows, pattern):
+        '''
+        Function joins a list of bindings with a single triple pattern.
+        :param rows: list of dictionaries where the keys are variables and the values are terms
+        :param pattern: tuple storing the subject, predicate, and object of the pattern and whether the predicate is a
+        zero-or-more property path
+        :return: list of dictionaries storing the extended bindings
+        '''
+        s, p, o, star = pattern
+        result = []
+
+        for row in rows:
+            bs = row.get(s, None) if s.startswith('?') else s
+            bp = row.get(p, None) if p.startswith('?') else p
+            bo = row.get(o, None) if o.startswith('?') else o
+
+            if star:
+                if bs is not None:
+                    matches = [(bs, bp, x) for x in self.Closure(bs, bp, True) if bo is None or x == bo]
+                elif bo is not None:
+                    matches = [(x, bp, bo) for x in self.Closure(bo, bp, False)]
+                else:
+                    nodes = set(self.sp.keys()) | set(self.po.get(bp, {}).keys())
+                    matches = [(x, bp, y) for x in nodes for y in self.Closure(x, bp, True)]
+            else:
+                matches = self.Match(bs, bp, bo)
+
+            for ms, mp, mo in matches:
+                new = dict(row)
+                bound = True
+
+                for var, value in ((s, ms), (p, mp), (o, mo)):
+                    if var.startswith('?'):
+                        if new.setdefault(var, value) != value:
+                            bound = False
+
+                if bound:
+                    result.append(new)
+
+        return result
+
+    def Query(self, text):
+        '''
+        Function evaluates a SPARQL SELECT query against the store.
+        :param text: string containing the SPARQL query
+        :return: a list where list[0] is the list of selected variables (without '?') and list[1] is a list of
+        dictionaries, one per result, where the keys are variables and the values are terms
+        '''
+        query = ParseQuery(text)
+        patterns = list(query['patterns'])
+        rows = [{}]
+
+        # greedy join order - patterns sharing a bound variable first, then the most bound or constant terms, then
+        # the most selective predicate
+        while patterns:
+            bound = set([var for var in rows[0].keys()]) if rows else set()
+            pattern = max(patterns, key=lambda x: (any([t in bound for t in x[:3]]),
+                                                   len([t for t in x[:3] if t in bound or not t.startswith('?')]),
+                                                   -len(self.po.get(x[1], ()))))
+            patterns.remove(pattern)
+            rows = self.Extend(rows, pattern)
+
+            if not rows:
+                break
+
+        # OPTIONAL clauses keep bindings which do not match
+        for pattern in query['optional']:
+            rows = [x for row in rows for x in (self.Extend([row], pattern) or [row])]
+
+        for condition in query['filters']:
+            rows = [row for row in rows if condition(row)]
+
+        variables = query['select'] or sorted(set([var for row in rows for var in row.keys()]))
+        results = []
+        seen = set()
+
+        for row in rows:
+            result = {}
+
+            for var in variables:
+                value = query['constants'].get(var, row.get(var, None))
+                if value is not None:
+                    result[var] = value
+
+            if query['distinct']:
+                key = tuple(sorted(result.items()))
+                if key in seen:
+                    continue
+                seen.add(key)
+
+            results.append(result)
+
+        results = results[query['offset']:]
+        if query['limit'] is not None:
+            results = results[:query['limit']]
+
+        return [var.strip('?') for var in variables], [dict((k.strip('?'), v) for k, v in x.items()) for x in results]
+
+
+def Resolve(term, prefixes):
+    '''
+    Function converts a term from a SPARQL query into its N-Triples form (prefixed names are expanded, numbers are
+    typed as xsd:integer, and variables are returned unchanged).
+    :param term: string containing the term
+    :param prefixes: dictionary where the keys are prefixes and the values are namespaces
+    :return: string containing the N-Triples form of the term
+    '''
+    if term.startswith('?') or term.startswith('<') or term.startswith('"'):
+        return term
+
+    if term.isdigit():
+        return '"' + term + '"^^' + XSD_INTEGER
+
+    if term.startswith("'"):
+        return '"' + term.strip("'") + '"'
+
+    if term == 'a':
+        return '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>'
+
+    prefix, _, name = term.partition(':')
+
+    return '<' + prefixes.get(prefix, prefix + ':') + name + '>'
+
+
+def Filter(text):
+    '''
+    Function converts a FILTER clause into a function which takes a binding and returns whether the binding is kept.
+    Only the (in)equality of two terms and regex(str(?var), 'pattern', 'flags') are supported; any other FILTER is
+    rejected, since ignoring it would return more bindings than the query asks for.
+    :param text: string containing the FILTER clause
+    :return: function which takes a dictionary of bindings and returns a boolean
+    :raises ValueError: if the FILTER is not supported
+    '''
+    comparison = re.search(r'\(\s*(\?\w+)\s*(!=|=)\s*(\?\w+)\s*\)', text)
+    regex = re.search(r'regex\s*\(\s*str\s*\(\s*(\?\w+)\s*\)\s*,\s*[\'"](.*?)[\'"]\s*(?:,\s*[\'"](\w*)[\'"])?', text)
+
+    if comparison:
+        left, operator, right = comparison.groups()
+        return lambda row: (row.get(left) == row.get(right)) == (operator == '=')
+
+    if regex:
+        var, pattern, flags = regex.groups()
+        compiled = re.compile(pattern, re.IGNORECASE if flags and 'i' in flags else 0)
+        return lambda row: var in row and compiled.search(NT_VALUE(row[var])) is not None
+
+    raise ValueError('unsupported FILTER: ' + text.strip())
+
+
+def NT_VALUE(term):
+    '''
+    Function returns the lexical value of an N-Triples term (the IRI, the literal text, or the blank node label).
+    :param term: string containing an N-Triples term
+    :return: string containing the value of the term
+    '''
+    if term.startswith('<'):
+        return term[1:-1]
+
+    if term.startswith('"'):
+        return term[1:term.rindex('"')].replace('\\"', '"').replace('\\\\', '\\')
+
+    return term[2:]
+
+
+def ParseQuery(text):
+    '''
+    Function parses a SPARQL SELECT query, with one statement per line as written by OWL-NETS, into its prefixes,
+    selected variables, constants bound in the select clause, triple patterns, OPTIONAL patterns, FILTER clauses,
+    LIMIT and OFFSET.
+    :param text: string containing the SPARQL query
+    :return: dictionary storing the parts of the query
+    '''
+    prefixes = dict(re.findall(r'PREFIX\s+([\w-]*):\s*<([^>]*)>', text, re.IGNORECASE))
+    head = re.search(r'\bSELECT\b(.*?)\bWHERE\b', text, re.IGNORECASE | re.DOTALL).group(1)
+    body = text[text.index('{', text.upper().index('WHERE')) + 1:text.rindex('}')]
+    tail = text[text.rindex('}') + 1:]
+
+    query = {'distinct': bool(re.search(r'\bDISTINCT\b', head, re.IGNORECASE)),
+             'select': [], 'constants': {}, 'patterns': [], 'optional': [], 'filters': [],
+             'limit': None, 'offset': 0}
+
+    for constant, var in re.findall(r'\(\s*(\S+)\s+as\s+(\?\S+?)\s*\)', head, re.IGNORECASE):
+        query['constants'][var] = Resolve(constant, prefixes)
+
+    if '*' not in head:
+        query['select'] = [x for x in re.findall(r'\?[^\s()]+', head)]
+
+    for line in body.split('\n'):
+        line = re.sub(r'\s#.*$', '', ' ' + line).strip()
+
+        if not line:
+            continue
+
+        if line.upper().startswith('FILTER'):
+            query['filters'].append(Filter(line))
+            continue
+
+        target = query['patterns']
+        if line.upper().startswith('OPTIONAL'):
+            target = query['optional']
+            line = line[line.index('{') + 1:line.rindex('}')]
+
+        terms = line.rstrip(' .').split(None, 2)
+
+        # an object which is not a literal cannot contain spaces - the line holds more than one statement
+        if len(terms) == 3 and terms[2].strip()[0] not in '"\'' and len(terms[2].split()) > 1:
+            raise ValueError('unsupported pattern (one statement per line is supported): ' + line)
+
+        if len(terms) == 3:
+            star = terms[1].endswith('*')
+            target.append((Resolve(terms[0], prefixes), Resolve(terms[1].rstrip('*'), prefixes),
+                           Resolve(terms[2].strip(), prefixes), star))
+
+    limit = re.search(r'\bLIMIT\s+(\d+)', tail, re.IGNORECASE)
+    offset = re.search(r'\bOFFSET\s+(\d+)', tail, re.IGNORECASE)
+    query['limit'] = int(limit.group(1)) if limit else None
+    query['offset'] = int(offset.group(1)) if offset else 0
+
+    return query
+
+
+def Term(value):
+    '''
+    Function converts an N-Triples term into a SPARQL JSON result term.
+    :param value: string containing an N-Triples term
+    :return: dictionary storing the type and value of the term (and the datatype or language of literals)
+    '''
+    if value.startswith('<'):
+        return {'type': 'uri', 'value': NT_VALUE(value)}
+
+    if value.startswith('_:'):
+        return {'type': 'bnode', 'value': NT_VALUE(value)}
+
+    term = {'type': 'literal', 'value': NT_VALUE(value)}
+    suffix = value[value.rindex('"') + 1:]
+
+    if suffix.startswith('^^'):
+        term['datatype'] = suffix[3:-1]
+    elif suffix.startswith('@'):
+        term['xml:lang'] = suffix[1:]
+
+    return term
+
+
+def ResultsJSON(variables, rows, page_size=None):
+    '''
+    Function converts the result of a query into the SPARQL JSON result format. When a page size is given only the
+    first page_size bindings are returned, mimicking endpoints which cap the number of rows per response (the handler
+    marks a capped response with an X-SPARQL-MaxRows header, as Virtuoso does, so clients can tell it is incomplete).
+    :param variables: list of strings containing the selected variables
+    :param rows: list of dictionaries where the keys are variables and the values are N-Triples terms
+    :param page_size: integer representing the maximum number of bindings to return (None returns all bindings)
+    :return: dictionary with the same structure as the SPARQL JSON result format
+    '''
+    if page_size is not None:
+        rows = rows[:page_size]
+
+    bindings = [dict([(var, Term(value)) for var, value in row.items()]) for row in rows]
+
+    return {'head': {'vars': variables}, 'results': {'bindings': bindings}}
+
+
+def ResultsTSV(variables, rows, page_size=None):
+    '''
+    Function converts the result of a query into the SPARQL TSV result format, where each value is written as an
+    N-Triples term. The page size is applied as in ResultsJSON.
+    :param variables: list of strings containing the selected variables
+    :param rows: list of dictionaries where the keys are variables and the values are N-Triples terms
+    :param page_size: integer representing the maximum number of bindings to return (None returns all bindings)
+    :return: string containing the results
+    '''
+    if page_size is not None:
+        rows = rows[:page_size]
+
+    lines = ['\t'.join(['?' + var for var in variables])]
+    lines += ['\t'.join([row.get(var, '') for var in variables]) for row in rows]
+
+    return '\n'.join(lines) + '\n'
+
+
+def ResultsCSV(variables, rows, page_size=None):
+    '''
+    Function converts the result of a query into the SPARQL CSV result format, where only the value of each term is
+    written. The page size is applied as in ResultsJSON.
+    :param variables: list of strings containing the selected variables
+    :param rows: list of dictionaries where the keys are variables and the values are N-Triples terms
+    :param page_size: integer representing the maximum number of bindings to return (None returns all bindings)
+    :return: string containing the results
+    '''
+    if page_size is not None:
+        rows = rows[:page_size]
+
+    output = StringIO()
+    writer = csv.writer(output, lineterminator='\r\n')
+    writer.writerow(variables)
+    writer.writerows([[NT_VALUE(row[var]) if var in row else '' for var in variables] for row in rows])
+
+    return output.getvalue()
+
+
+def LoadFixtures(files):
+    '''
+    Function takes a list of N-Triples files and loads them into a single in-memory triple store.
+    :param files: list of strings containing the file paths/names of N-Triples files
+    :return: a TripleStore containing the triples from all of the files
+    '''
+    store = TripleStore()
+
+    for fixture in files:
+        store.Load(fixture)
+
+    print 'Loaded ' + str(store.size) + ' triples from ' + str(len(files)) + ' fixture file(s)'
+
+    return store
+
+
+class EndpointHandler(BaseHTTPRequestHandler):
+    '''
+    Class handles SPARQL protocol requests (GET with a query parameter, or POST with a form encoded or
+    application/sparql-query body). A GET request without a query returns 200 so that simple credential checks succeed.
+    Results are returned as SPARQL JSON, TSV, or CSV depending on the Accept header. The handler applies the latency,
+    bandwidth, and page size of the server.
+    '''
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+    def Authorized(self):
+        if self.server.credentials is None:
+            return True
+
+        header = self.headers.getheader('Authorization') or ''
+
+        return header == 'Basic ' + base64.b64encode(':'.join(self.server.credentials))
+
+    def Respond(self, status, body, content_type, headers=None):
+        '''
+        Function writes a response, sleeping for the latency of the server before the first byte and throttling the
+        body to the bandwidth of the server.
+        :param status: integer representing the HTTP status code
+        :param body: string containing the response body
+        :param content_type: string containing the content type of the response body
+        :param headers: dictionary storing additional response headers
+        '''
+        time.sleep(self.server.latency)
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in sorted((headers or {}).items()):
+            self.send_header(name, value)
+        if status == 401:
+            self.send_header('WWW-Authenticate', 'Basic realm="OWL-NETS"')
+        self.end_headers()
+
+        if not self.server.bandwidth:
+            self.wfile.write(body)
+            return
+
+        chunk = 8192
+        for start in xrange(0, len(body), chunk):
+            self.wfile.write(body[start:start + chunk])
+            time.sleep(len(body[start:start + chunk]) / float(self.server.bandwidth))
+
+    def Query(self, params):
+        if not self.Authorized():
+            return self.Respond(401, 'Unauthorized', 'text/plain')
+
+        if 'query' not in params:
+            return self.Respond(200, 'OWL-NETS local SPARQL endpoint', 'text/plain')
+
+        with self.server.lock:
+            self.server.requests += 1
+
+        try:
+            variables, rows = self.server.store.Query(params['query'][0])
+        except (AttributeError, ValueError) as error:
+            return self.Respond(400, 'Malformed or unsupported query: ' + str(error), 'text/plain')
+        except Exception:
+            return self.Respond(500, 'Query failed:\n' + traceback.format_exc(), 'text/plain')
+
+        # a response capped at the page size is marked, so clients can tell it holds only part of the results
+        page_size = self.server.page_size
+        headers = {'X-SPARQL-MaxRows': str(page_size)} if page_size is not None and len(rows) > page_size else {}
+
+        # result format is negotiated through the Accept header (JSON unless TSV or CSV is asked for)
+        accept = self.headers.getheader('Accept') or ''
+
+        if 'text/tab-separated-values' in accept:
+            return self.Respond(200, ResultsTSV(variables, rows, page_size), 'text/tab-separated-values', headers)
+
+        if 'text/csv' in accept:
+            return self.Respond(200, ResultsCSV(variables, rows, page_size), 'text/csv', headers)
+
+        body = json.dumps(ResultsJSON(variables, rows, page_size))
+
+        return self.Respond(200, body, 'application/sparql-results+json', headers)
+
+    def do_GET(self):
+        self.Query(urlparse.parse_qs(urlparse.urlparse(self.path).query))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.getheader('Content-Length') or 0))
+
+        if (self.headers.getheader('Content-Type') or '').startswith('application/sparql-query'):
+            self.Query({'query': [body]})
+        else:
+            self.Query(urlparse.parse_qs(body))
+
+
+class LocalEndpoint(ThreadingMixIn, HTTPServer):
+    '''
+    Class is a threaded HTTP server which evaluates SPARQL queries against an in-memory triple store.
+    :param store: TripleStore the queries are evaluated against
+    :param port: integer representing the port to listen on (0 picks a free port)
+    :param latency: float representing the seconds to wait before responding
+    :param bandwidth: integer representing the bytes per second the response bodies are throttled to (None disables)
+    :param page_size: integer representing the maximum number of bindings per response (None disables)
+    :param credentials: tuple of (username, password) required through basic authentication (None disables)
+    '''
+
+    daemon_threads = True
+
+    def __init__(self, store, port=0, latency=0.0, bandwidth=None, page_size=None, credentials=None, verbose=False):
+        HTTPServer.__init__(self, ('127.0.0.1', port), EndpointHandler)
+        self.store = store
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.page_size = page_size
+        self.credentials = credentials
+        self.verbose = verbose
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def URL(self):
+        return 'http://127.0.0.1:' + str(self.server_address[1]) + '/sparql'
+
+    def WriteAuthentication(self, output):
+        '''
+        Function writes an authentication file (format: url, user, password) which points QueryRunner at the server.
+        :param output: file path and name where the authentication file should be written
+        :return: string containing the file path and name of the authentication file
+        '''
+        with open(output, 'w') as outfile:
+            if self.credentials:
+                outfile.write('\n'.join([self.URL()] + list(self.credentials)))
+            else:
+                outfile.write(self.URL())
+
+        return output
+
+    def Start(self):
+        '''
+        Function serves requests on a background daemon thread so that the server can be used from within a script.
+        :return: the thread serving the requests
+        '''
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        return thread
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local SPARQL endpoint over N-Triples fixtures for offline testing.')
+    parser.add_argument('fixtures', nargs='+', help='N-Triples files to load')
+    parser.add_argument('-p', '--port', type=int, default=8890, help='port to listen on (default: 8890)')
+    parser.add_argument('-l', '--latency', type=float, default=0.0, help='seconds to wait before each response')
+    parser.add_argument('-w', '--bandwidth', type=int, default=None, help='response bandwidth in bytes per second')
+    parser.add_argument('-s', '--page-size', type=int, default=None, help='maximum number of bindings per response')
+    parser.add_argument('-u', '--user', default=None, help='username required through basic authentication')
+    parser.add_argument('-k', '--password', default='', help='password required through basic authentication')
+    parser.add_argument('-a', '--authentication', default=None,
+                        help='write an authentication file pointing at the server to this location')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log each request')
+    args = parser.parse_args()
+
+    server = LocalEndpoint(LoadFixtures(args.fixtures), args.port, args.latency, args.bandwidth, args.page_size,
+                           (args.user, args.password) if args.user else None, args.verbose)
+
+    if args.authentication:
+        print 'Authentication file written to: ' + server.WriteAuthentication(args.authentication)
+
+    print 'Serving SPARQL endpoint at: ' + server.URL()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,24 @@
 ##########################################################
 # NETSRepresentation.py
 # Purpose: script creates an OWL-NETS graph and metadata
-# version 1.1.3
-# date: 07.21.2017
+# version 1.1.4
+# date: 10.19.2026
 ##########################################################
 
 
 ## import module/script dependencies
 from datetime import datetime
 import json
+import multiprocessing
 import networkx as nx
 import os
 from progressbar import ProgressBar, FormatLabel, Percentage, Bar
 import simplejson as json
 import re
+import BindingTable
+import GraphWriter
+import Instrumentation
+import QueryCache
 import QueryParser
 import QueryRunner
 
@@ -186,6 +191,164 @@ def EdgeDirection(graph, sub_graph, NETS_edges):
     return list(edge_direction)
 
 
+# functions whose results are stored by the query analysis cache (changing their code invalidates the cache)
+ANALYSIS_FUNCTIONS = [GraphMaker, NETSNodeFinder, NETSEdgeFinder, Direction, EdgeDirection]
+
+
+def AnalysisCache(location):
+    '''
+    Function opens the on-disk query analysis cache used by QueryAnalysis. The version of the cache is derived from the
+    code of the analysis functions, so entries written before the code changed are not used.
+    :param location: string containing the path of the cache directory
+    :return: QueryCache.QueryCache instance
+    '''
+
+    return QueryCache.QueryCache(location, QueryCache.Version(ANALYSIS_FUNCTIONS))
+
+
+def QueryAnalysis(triples, profiler, cache=None):
+    '''
+    Function builds the graph of a query's triples and finds its NETS nodes, NETS edges, and the direction of the NETS
+    edges. The results depend only on the structure of the triples, so when a cache is given they are stored with the
+    variables renamed to their canonical names (see QueryCache.Canonical), and a query that differs only in variable
+    names, triple order, or FILTER and LIMIT clauses reuses them under its own variable names. The results are also
+    stored under the exact triples of the query (see QueryCache.TripleKey) together with their canonical form, so the
+    same query is later answered by a single lookup, without computing the canonical form or renaming the graphs.
+    :param triples: list of strings, where each string is a triple from a SPARQL query
+    :param profiler: Instrumentation.PipelineProfiler used to record each stage
+    :param cache: QueryCache.QueryCache instance (see AnalysisCache; None runs the analysis without a cache)
+    :return: a list where list[0] is the graph of the query, list[1] is the sub-graph of NETS nodes and nodes with out
+    degree > 0, list[2] is the list of NETS nodes, list[3] is the list of NETS edges, and list[4] is the list of
+    directed NETS edges
+    '''
+
+    if cache is not None:
+        with profiler.Stage('QueryAnalysisCache') as stage:
+            stage['triples'] = len(triples)
+            exact = QueryCache.TripleKey(triples)
+            entry = cache.Get(exact)
+
+            # the canonical form stored with the analysis is remembered for the results lookup (see QueryResults)
+            if entry is not None:
+                analysis, cache.canonical[tuple(triples)] = entry
+                stage['nodes'] = len(analysis[2])
+                stage['edges'] = len(analysis[4])
+                return analysis
+
+            key, mapping = cache.Canonical(triples)
+            analysis = cache.Get(key)
+
+            if analysis is not None:
+                analysis = QueryCache.Rename(analysis, dict([(var, name) for name, var in mapping.items()]))
+                cache.Put(exact, [analysis, [key, mapping]])
+                stage['nodes'] = len(analysis[2])
+                stage['edges'] = len(analysis[4])
+                return analysis
+
+    # create a graph representation of query
+    with profiler.Stage('GraphMaker') as stage:
+        graph = GraphMaker(triples)
+        stage['nodes'] = len(graph.nodes())
+        stage['edges'] = len(graph.edges())
+
+    ## NETS NODES
+    # will return a list of NETS nodes
+    with profiler.Stage('NETSNodeFinder') as stage:
+        NETS_nodes = NETSNodeFinder(graph)
+        stage['nodes'] = len(NETS_nodes)
+
+    ## NETS EDGES
+    # create sub-graph from graph with NETS_nodes and nodes with out degree > 0
+    with profiler.Stage('NETSEdgeFinder') as stage:
+        keep = [node for node in graph.nodes() if graph.out_degree(node) > 0 or node in NETS_nodes]
+        sub_graph = graph.subgraph(keep)
+
+        # get NETS edges and maintains order specified in query
+        NETS_edges = NETSEdgeFinder(NETS_nodes, sub_graph)
+        stage['edges'] = len(NETS_edges)
+
+    # get direction of NETS edges
+    with profiler.Stage('EdgeDirection') as stage:
+        NETS_edge_order = EdgeDirection(graph, sub_graph, NETS_edges)
+        stage['edges'] = len(NETS_edge_order)
+
+    analysis = [graph, sub_graph, NETS_nodes, NETS_edges, NETS_edge_order]
+
+    if cache is not None:
+        cache.Put(key, QueryCache.Rename(analysis, mapping))
+        cache.Put(exact, [analysis, [key, mapping]])
+
+    return analysis
+
+
+def QueryResults(input1, query_text, updated_query_text, profiler, authentication, cache=None):
+    '''
+    Function returns the results of a query. Results cached next to the query by an earlier run are loaded. Otherwise,
+    when a cache is given and an equivalent query (see QueryCache.ResultKey) was run before, its results are loaded
+    with the variables renamed to those of this query; otherwise the query is run against the endpoint. New results
+    are written next to the query, and the results used are recorded in the cache.
+    :param input1: string containing file path/name for SPARQL query
+    :param query_text: a list of lists where list[0] is a list of triples and list[1] is a list of query components
+    :param updated_query_text: the output of QueryParser.NETSQueryParser for the query
+    :param profiler: Instrumentation.PipelineProfiler used to record each stage
+    :param authentication: string containing file path/name for the endpoint authentication file
+    :param cache: QueryCache.QueryCache instance (None only uses results cached next to the query)
+    :return: BindingTable containing the query results
+    '''
+
+    # look to see if results already exist (if OWL-NETS was previously run) - older runs cached results as JSON
+    results_file = input1.rpartition(".")[-1] + "_results"
+    cached = [x for x in [results_file + '.csv', results_file + '.json'] if os.path.isfile(x)]
+
+    key, mapping = cache.Canonical(query_text[0]) if cache is not None else (None, {})
+    result_key = QueryCache.ResultKey(query_text, (key, mapping)) if cache is not None else None
+
+    if cached:
+
+        print 'Using existing query results'
+        print '\n'
+
+        with profiler.Stage('LoadResults') as stage:
+            results = BindingTable.Load(cached[0])
+            stage['bindings'] = len(results)
+
+        if cache is not None:
+            cache.Put(result_key, [os.path.abspath(cached[0]), mapping])
+
+        return results
+
+    equivalent = cache.Get(result_key) if cache is not None else None
+
+    if equivalent is not None and os.path.isfile(equivalent[0]):
+        print 'Using query results of an equivalent query: ' + equivalent[0]
+        print '\n'
+
+        # variables of the equivalent query -> canonical names -> variables of this query
+        with profiler.Stage('LoadResults') as stage:
+            results = BindingTable.Load(equivalent[0])
+            inverse = dict([(name, var) for var, name in mapping.items()])
+            names = dict([(var, inverse[name]) for var, name in equivalent[1].items() if name in inverse])
+            results.Rename(dict([(var, QueryCache.Rename('?' + var, names).lstrip('?')) for var in results.variables]))
+            stage['bindings'] = len(results)
+    else:
+        print 'Generating new query results'
+        print '\n'
+
+        # run query
+        with profiler.Stage('RunQuery') as stage:
+            results = QueryRunner.RunQuery(updated_query_text[0], authentication)
+            stage['bindings'] = len(results)
+
+    # export results to csv file
+    with profiler.Stage('WriteResults'):
+        results.Write(results_file + '.csv')
+
+    if cache is not None:
+        cache.Put(result_key, [os.path.abspath(results_file + '.csv'), mapping])
+
+    return results
+
+
 def MetadataDetails(sub_graph, graph, edges):
     '''
     Function takes a graph, a sub-graph of nodes with out degree > 0 (except for NETS nodes) and a list of NETS nodes
@@ -318,7 +481,7 @@ def NodeDic(results, edge_info, node_info):
     function returns a list of dictionaries where list[0] contains a nested dictionary where keys are bio entity
     identifiers and the values are the the human readable labels and database identifiers; list[1] contains a dictionary
     where the bio node is the key and the value is a set of possible NETS node types for that node.
-    :param results: json file containing the query results from endpoint
+    :param results: BindingTable containing the query results from endpoint
     :param edge_info: dictionary where the keys are the NETS edges and the values are the edge labels
     :param node_info: a list of node information (list[0] contains the NETS nodes label triples, list[1] contains the
     contains the NETS nodes identifier triples)
@@ -344,16 +507,27 @@ def NodeDic(results, edge_info, node_info):
     widgets = [Percentage(), Bar(), FormatLabel('(elapsed: %(elapsed)s)')]
     pbar = ProgressBar(widgets=widgets, maxval=len(NETS))
 
+    pool = results.pool
+
     for node in pbar(NETS):
         node_labeler[node] = {}
+        label_value = str([x[1] for x in labels if x[0] == node][0].encode('utf8'))
+        id_value = str([x[0] for x in ids if x[1] == node][0].encode('utf8'))
+
+        # group the label and ICE codes of each result by the code of the bio node (values are decoded once per node)
+        grouped = {}
+
+        for code, label, ice in results.Codes(node, label_value, id_value):
+            if code in grouped:
+                grouped[code].append((label, ice))
+            else:
+                grouped[code] = [(label, ice)]
 
-        for res in results['results']['bindings']:
-            node_key = str(res[node]['value'])
-            label_value = str([x[1] for x in labels if x[0] == node][0].encode('utf8'))
-            id_value = str([x[0] for x in ids if x[1] == node][0].encode('utf8'))
+        for code, metadata in grouped.iteritems():
+            node_key = pool[code]
 
             # NODE TYPE: setting node type information
-            if node_key in node_type.keys():
+            if node_key in node_type:
                 node_type[node_key].add(node)
 
             else:
@@ -361,15 +535,10 @@ def NodeDic(results, edge_info, node_info):
                 node_type[node_key].add(node)
 
             # NODE METADATA: setting node attributes by NETS node type
-            if node_key in node_labeler[node].keys():
-                # order matters - not using a set so that each ICE can be mapped to the label with the same index
-                node_labeler[node][node_key]['label'].append(res[label_value]['value'].encode('utf8'))
-                node_labeler[node][node_key]['id'].append(res[id_value]['value'].encode('utf8'))
-
-            else:
-                node_labeler[node][node_key] = {}
-                node_labeler[node][node_key]['label'] = [res[label_value]['value'].encode('utf8')]
-                node_labeler[node][node_key]['id'] = [res[id_value]['value'].encode('utf8')]
+            # order matters - not using a set so that each ICE can be mapped to the label with the same index
+            node_labeler[node][node_key] = {}
+            node_labeler[node][node_key]['label'] = [pool[x[0]] for x in metadata]
+            node_labeler[node][node_key]['id'] = [pool[x[1]] for x in metadata]
 
     # close progress bar
     pbar.finish()
@@ -378,9 +547,7 @@ def NodeDic(results, edge_info, node_info):
 
     # CHECK: verify that the counts are correct
     for node in NETS:
-        res_count = set()
-        for res in results['results']['bindings']:
-            res_count.add(res[node]['value'])
+        res_count = set(results.Column(node).tolist())
 
         if len(node_labeler[node].keys()) != len(res_count):  # verify the number of nodes in graph is correct
             raise ValueError('The count of results for the ' + str(node) + ' NETS node in the node dictionary differ '
@@ -436,14 +603,31 @@ def EdgeDic(edge_info):
     return edge_labeler
 
 
+def NodeAttributes(node_labeler, node_type, node, key):
+    '''
+    Function returns the name and metadata of the OWL-NETS node built for a bio entity. The name of the node is the
+    shortest of its human readable labels.
+    :param node_labeler: nested dictionary where the keys are NETS nodes and bio entity identifiers and the values are
+    the human readable labels and database identifiers
+    :param node_type: dictionary with BIO node as key and set of NETS node types as value
+    :param node: string containing the NETS node (without '?')
+    :param key: string containing the bio entity identifier
+    :return: a list where list[0] is the name of the node and list[1] is a dictionary of node metadata
+    '''
+    metadata = node_labeler[node][key]
+
+    return [min(metadata['label'], key=len), dict(labels=metadata['label'], id=metadata['id'], bio=key,
+                                                  type='-'.join(list(node_type[key])))]
+
+
 def NETSGraph(results, NETS_edges, node_labeler, node_type, edge_labeler):
     '''
-    Function takes a json file of query results, a list of NETS edges, node and edge metadata dictionaries, and a
+    Function takes a table of query results, a list of NETS edges, node and edge metadata dictionaries, and a
     dictionary containing NETS edge information by BIO node. Using these items the function creates the directed
     OWL-NETS abstraction network. Node metadata includes: labels (a list of human readable labels); id (the endpoint
     database identifiers); and bio (the NETS node type). Edge metadata includes: labels (human readable label for the
     edge between two NETS nodes) and id (the ontology concept term used to link the NETS nodes).
-    :param results: json file containing the query results from endpoint
+    :param results: BindingTable containing the query results from endpoint
     :param NETS_edges: list of lists, where each list is a NETS edge and the order specifies a directional relationship
     :param node_labeler: node metadata nested lists (list[0] contains the NETS nodes label triples, list[1] contains the
     contains the NETS nodes identifier triples)
@@ -455,35 +639,39 @@ def NETSGraph(results, NETS_edges, node_labeler, node_type, edge_labeler):
 
     # initialize progress bar progress bar
     widgets = [Percentage(), Bar(), FormatLabel('(elapsed: %(elapsed)s)')]
-    pbar = ProgressBar(widgets=widgets, maxval=len(results['results']['bindings']))
+    pbar = ProgressBar(widgets=widgets, maxval=len(results))
 
     NETS_graph = nx.DiGraph()
+    pool = results.pool
+
+    # columns storing the codes of the NETS nodes and edge label of each NETS edge
+    columns = [(edge[0].strip('?'), edge[1].strip('?'), results.Column(edge[0]), results.Column(edge[1]),
+                results.Column(edge_labeler[tuple(edge)]['label']), (edge_labeler[tuple(edge)]['id']).strip('?'),
+                '-'.join([edge[0].strip('?'), edge[1].strip('?')])) for edge in NETS_edges]
+
+    # node names and attributes are built once for each code of a NETS node
+    nodes = {}
+
+    for row in pbar(xrange(len(results))):
+        for source_node, target_node, source, target, label, edge_id, edge_name in columns:
 
-    for res in pbar(results['results']['bindings']):
-        for edge in NETS_edges:
+            i = (source_node, source[row])
+            j = (target_node, target[row])
 
-            i = res[str(edge[0].strip('?').encode('utf8'))]['value'].encode('utf8')
-            j = res[str(edge[1].strip('?').encode('utf8'))]['value'].encode('utf8')
+            if i not in nodes:
+                nodes[i] = NodeAttributes(node_labeler, node_type, source_node, pool[source[row]])
+
+            if j not in nodes:
+                nodes[j] = NodeAttributes(node_labeler, node_type, target_node, pool[target[row]])
 
             # set nodes
-            NETS_graph.add_node(min(node_labeler[edge[0].strip('?')][i]['label'], key=len),
-                                labels=node_labeler[edge[0].strip('?')][i]['label'],
-                                id=node_labeler[edge[0].strip('?')][i]['id'],
-                                bio=i,
-                                type='-'.join(list(node_type[i])))
+            NETS_graph.add_node(nodes[i][0], **nodes[i][1])
 
             # gets second node in edge
-            NETS_graph.add_node(min(node_labeler[edge[1].strip('?')][j]['label'], key=len),
-                                labels=node_labeler[edge[1].strip('?')][j]['label'],
-                                id=node_labeler[edge[1].strip('?')][j]['id'],
-                                bio=j,
-                                type='-'.join(list(node_type[j])))
+            NETS_graph.add_node(nodes[j][0], **nodes[j][1])
+
             # add edge
-            NETS_graph.add_edge(min(node_labeler[edge[0].strip('?')][i]['label'], key=len),
-                                min(node_labeler[edge[1].strip('?')][j]['label'], key=len),
-                                labels=res[(edge_labeler[tuple(edge)]['label']).strip('?')]['value'].encode('utf8'),
-                                id=(edge_labeler[tuple(edge)]['id']).strip('?'),
-                                edge='-'.join([edge[0].strip('?'), edge[1].strip('?')]))
+            NETS_graph.add_edge(nodes[i][0], nodes[j][0], labels=pool[label[row]], id=edge_id, edge=edge_name)
 
 
     # closes first progress bar
@@ -511,89 +699,103 @@ def GraphJson(graph, edge_labels, output):
     :return: json file storing the graph and associated edge metadata
     '''
 
-    return json.dump(dict(metadata=dict((', '.join(u), v) for (u, v) in edge_labels.items()),
-                          network=dict(nodes=[[n, graph.node[n]] for n in graph.nodes()],
-                                       edges=[[u, v, graph.edge[u][v]] for u, v in graph.edges()])),
-                     open(output, 'w'))
+    with GraphWriter.Open(output, False) as outfile:
+        return json.dump(dict(metadata=dict((', '.join(u), v) for (u, v) in edge_labels.items()),
+                              network=dict(nodes=[[n, graph.node[n]] for n in graph.nodes()],
+                                           edges=[[u, v, graph.edge[u][v]] for u, v in graph.edges()])),
+                         outfile)
 
 
 
-def NETSNetworkBuilder(input1):
+def NETSNetworkBuilder(input1, profiler=None, authentication='SPARQL_Queries/authentication',
+                       compress=False, edgelist=False, cache=None):
     '''
     Function takes several strings as arguments from the user and with them generates and NETS abstraction network with
-    edge metadata.
+    edge metadata. The time, memory, and item counts for each stage of the build are recorded and written to a report
+    next to the network files.
     :param input1: string containing file path/name for SPARQL query
+    :param profiler: Instrumentation.PipelineProfiler used to record each stage (a new one is created if None)
+    :param authentication: string containing file path/name for the endpoint authentication file (format: url, user,
+    password)
+    :param compress: boolean indicating whether the GML file should be gzip compressed
+    :param edgelist: boolean indicating whether a tab-delimited edge list is also written (formatted in parallel)
+    :param cache: QueryCache.QueryCache instance storing the query analysis (see AnalysisCache; None uses no cache)
+    :return: the PipelineProfiler containing the stage records
     '''
 
     print str('Started building OWL-NETS Abstraction Network: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
     print '\n'
 
-    # parse query and return triples
-    query_text = QueryParser.QueryParser(input1)
-
-    # create a graph representation of query
-    graph = GraphMaker(query_text[0])
-
-    ## NETS NODES
-    # will return a list of NETS nodes
-    NETS_nodes = NETSNodeFinder(graph)
-
-    ## NETS EDGES
-    # create sub-graph from graph with NETS_nodes and nodes with out degree > 0
-    keep = [node for node in graph.nodes() if graph.out_degree(node) > 0 or node in NETS_nodes]
-    sub_graph = graph.subgraph(keep)
+    if profiler is None:
+        profiler = Instrumentation.PipelineProfiler()
 
-    # get NETS edges and maintains order specified in query
-    NETS_edges = NETSEdgeFinder(NETS_nodes, sub_graph)
+    # parse query and return triples
+    with profiler.Stage('QueryParser') as stage:
+        query_text = QueryParser.QueryParser(input1)
+        stage['triples'] = len(query_text[0])
 
-    # get direction of NETS edges
-    NETS_edge_order = EdgeDirection(graph, sub_graph, NETS_edges)
+    # create a graph representation of query and find the NETS nodes and (directed) NETS edges
+    graph, sub_graph, NETS_nodes, NETS_edges, NETS_edge_order = QueryAnalysis(query_text[0], profiler, cache)
 
     # get edge metadata
-    NETS_edge_metadata = EdgeMetadata(graph, sub_graph, NETS_edge_order)
+    with profiler.Stage('EdgeMetadata'):
+        NETS_edge_metadata = EdgeMetadata(graph, sub_graph, NETS_edge_order)
 
     # update query text
-    updated_query_text = QueryParser.NETSQueryParser(query_text, NETS_nodes, NETS_edge_metadata)
+    with profiler.Stage('NETSQueryParser'):
+        updated_query_text = QueryParser.NETSQueryParser(query_text, NETS_nodes, NETS_edge_metadata)
 
     for x in updated_query_text[0].split('\n'):
         print x
 
     ## QUERY ENDPOINT
-    # authentication file (format: url, user, password) - should be placed in same user directory as query
-    authentication = 'SPARQL_Queries/authentication'
-
-    # look to see if results already exist (if OWL-NETS was previously run)
-    if str(input1.split('/')[-1]) + '_results.json' in os.listdir(''.join(str(input1.split('/')[-2]) + '/')):
-
-        print 'Using existing query results'
-        print '\n'
-
-        with open(input1.rpartition(".")[-1] + "_results.json") as json_data:
-            results = json.load(json_data)
-    else:
-        print 'Generating new query results'
-        print '\n'
-
-        # run query
-        results = QueryRunner.RunQuery(updated_query_text[0], authentication)
-
-        # export results to json file
-        with open(str(input1.rpartition(".")[-1] + "_results.json"), 'w') as outfile:
-            json.dump(results, outfile)
+    # load cached results, reuse the results of an equivalent query, or run the query
+    results = QueryResults(input1, query_text, updated_query_text, profiler, authentication, cache)
 
     ## NETWORK POPULATION
     # get and set node metadata
-    node_info = NodeDic(results, NETS_edge_metadata, updated_query_text[1:])
+    with profiler.Stage('NodeDic') as stage:
+        node_info = NodeDic(results, NETS_edge_metadata, updated_query_text[1:])
+        stage['bindings'] = len(results)
+        stage['nodes'] = len(node_info[1])
 
     # organize output for labeling edges
     edge_data = EdgeDic(NETS_edge_metadata[0])
 
     # build NETS graph
-    NETS_graph = NETSGraph(results, NETS_edge_order, DictCleaner(node_info[0], 'id', 'label'), node_info[1], edge_data)
+    with profiler.Stage('NETSGraph') as stage:
+        NETS_graph = NETSGraph(results, NETS_edge_order, DictCleaner(node_info[0], 'id', 'label'), node_info[1],
+                               edge_data)
+        stage['bindings'] = len(results)
+        stage['nodes'] = len(NETS_graph.nodes())
+        stage['edges'] = len(NETS_graph.edges())
 
     # write graphs to gml and JSON files
-    nx.write_gml(NETS_graph, str(input1.rpartition(".")[-1] + "_NETS") + '_network.gml')
-    GraphJson(NETS_graph, NETS_edge_metadata[1], str(input1.rpartition(".")[-1] + "_NETS") + '_network.json')
+    output = str(input1.rpartition(".")[-1] + "_NETS")
+
+    with profiler.Stage('WriteGML') as stage:
+        GraphWriter.WriteGML(NETS_graph, output + '_network.gml', compress)
+        stage['nodes'] = len(NETS_graph.nodes())
+        stage['edges'] = len(NETS_graph.edges())
+
+    if edgelist:
+        with profiler.Stage('WriteEdgeList') as stage:
+            GraphWriter.WriteEdgeList(NETS_graph, output + '_network.edgelist', multiprocessing.cpu_count(), compress)
+            stage['edges'] = len(NETS_graph.edges())
+
+    with profiler.Stage('WriteJSON') as stage:
+        GraphJson(NETS_graph, NETS_edge_metadata[1], output + '_network.json')
+        stage['nodes'] = len(NETS_graph.nodes())
+        stage['edges'] = len(NETS_graph.edges())
+
+    # write stage report (and cProfile stats for the hottest stage when profiling)
+    profiler.Summary()
+    print 'Stage report written to: ' + profiler.WriteReport(output + '_profile')
+
+    if profiler.profile:
+        print 'Profile of hottest stage written to: ' + str(profiler.DumpProfile(output + '_profile.prof'))
 
     print str(
-        'Finished building OWL-NETS Representation network: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S')) + '\n'
\ No newline at end of file
+        'Finished building OWL-NETS Representation network: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S')) + '\n'
+
+    return profiler
@@ -1,35 +1,40 @@
 #######################################################################################################
 # NetworkInference.py
 # Purpose: script runs 10 link prediction algorithms on training and testing network data in parallel
-# version 1.1.0
-# date: 01.28.2017
+# version 1.2.0
+# date: 10.19.2026
 #######################################################################################################
 
 
 # import module/script dependencies
+import argparse
 import multiprocessing
 from datetime import datetime
 from functools import partial
 import networkx as nx
 import random
-import json
+import time
 import EvaluationMetrics
 import LinkPrediction
+import RandomStreams
+import ResultStore
 
 
 
-def GraphMaker(graph, percent):
+def GraphMaker(graph, percent, rng=random):
     '''
     Function takes a Networkx graph object and percent of edges to sample. The function creates a training graph by
     randomly sampling a certain percent of edges to remove from the full graph. The percent of randomly sampled edges
     is stored as a list.
     :param graph: networkx graph object
     :param percent: an integer of edges to sample
+    :param rng: random number generator used to sample the edges (e.g., a RandomStreams.Stream; defaults to the random
+    module)
     :return: training_graph - network graph with randomly sampled edges removed; testing_edges - list of randomly
     sampled edges
     '''
 
-    training = set(random.sample(graph.edges(), int(nx.number_of_edges(graph) * percent)))
+    training = set(rng.sample(graph.edges(), int(nx.number_of_edges(graph) * percent)))
     testing_edges = set(set(graph.edges()) - training)
 
     if len(training) + len(testing_edges) != len(graph.edges()): #verify that training graph/testing edges are correct
@@ -50,527 +55,502 @@ def GraphMaker(graph, percent):
     return training_graph, testing_edges
 
 
-def DPFracAUC(network, nonexist_edges, iterations, steps):
+def Iterations(iterations):
     '''
-    Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
-    (steps) and runs the Degree Product scoring function over each sampled network for the specified number of
-    iterations.
+    Function returns the iterations a FracAUC function runs.
+    :param iterations: integer representing the number of iterations or a list of the iterations
+    :return: list or xrange of integers representing the iterations
+    '''
+
+    return xrange(iterations) if isinstance(iterations, (int, long)) else list(iterations)
+
+
+def IncrementalFracAUC(method, network, nonexist_edges, iterations, steps, record=None, seed=None):
+    '''
+    Function takes the name of a neighborhood scoring function, a network, list of non-existent edges, the number of
+    iterations, and the percent of edges to sample (steps) and runs the scoring function over each sampled network for
+    the specified number of iterations. The edges are sampled as in GraphMaker, but the training graph and scores are
+    kept in a LinkPrediction.IncrementalScores state which is moved from one iteration's training graph to the next by
+    adding and removing the edges whose testing status changed, rather than rebuilt and rescored.
+    :param method: string containing the name of the scoring function (see LinkPrediction.IncrementalScores)
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the method, step, iteration, AUC, precision, wall time, and seed of each
+    iteration (e.g., a partial of ResultStore.Record; None does not record the iterations)
+    :param seed: integer representing the root seed the seed of each iteration is derived from (see
+    RandomStreams.TaskSeed; None draws a new root seed)
     :return:
     '''
 
     auc = []; prec = []
+    seed = RandomStreams.RootSeed() if seed is None else seed
+    edges = network.edges()
+    state = LinkPrediction.IncrementalScores(network, edges + list(nonexist_edges))
+    previous_edges = set()
 
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
-        training_graph = iteration_data[0]
-        testing_edges = iteration_data[1]
-        missing_scores = LinkPrediction.DegreeProduct(training_graph, testing_edges)
-        nonexist_scores = LinkPrediction.DegreeProduct(training_graph, nonexist_edges)
+    for j in Iterations(iterations):
+        start = time.time()
+        task_seed, rng = RandomStreams.TaskStream(seed, method, steps, j)
+        training = set(rng.sample(edges, int(nx.number_of_edges(network) * steps)))
+        testing_edges = set(set(edges) - training)
+
+        # move the training graph from the previous iteration to this one
+        state.Update(added=previous_edges - testing_edges, removed=testing_edges - previous_edges)
+        previous_edges = testing_edges
+
+        missing_scores = state.Scores(method, testing_edges)
+        nonexist_scores = state.Scores(method, nonexist_edges)
 
         #get AUC
-        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores)
+        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores, rng)
         auc.append(auc_round)
 
         #precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
         prec_round = EvaluationMetrics.KPrecision(auc_round, dict(missing_scores, **nonexist_scores), testing_edges)
         prec.append(prec_round)
 
+        if record is not None:
+            record(method, steps, j, auc_round, prec_round, time.time() - start, seed=task_seed)
+
     return auc, prec
 
 
-def SPFracAUC(network, nonexist_edges, iterations, steps):
+def DPFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
+    '''
+    Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
+    (steps) and runs the Degree Product scoring function over each sampled network for the specified number of
+    iterations.
+    :param network: undirected graph
+    :param nonexist_edges: list of non-existent edges from the graph
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
+    :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
+    :return:
+    '''
+
+    return IncrementalFracAUC('DegreeProduct', network, nonexist_edges, iterations, steps, record, seed)
+
+
+def SPFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the Shortest Path scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
 
     auc = []; prec = []
+    seed = RandomStreams.RootSeed() if seed is None else seed
 
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
+    for j in Iterations(iterations):
+        start = time.time()
+        task_seed, rng = RandomStreams.TaskStream(seed, 'ShortestPath', steps, j)
+        iteration_data = GraphMaker(network, steps, rng)
         training_graph = iteration_data[0]
         testing_edges = iteration_data[1]
         missing_scores = LinkPrediction.ShortestPath(training_graph, testing_edges)
         nonexist_scores = LinkPrediction.ShortestPath(training_graph, nonexist_edges)
 
         #get AUC
-        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores)
+        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores, rng)
         auc.append(auc_round)
 
         #precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
         prec_round = EvaluationMetrics.KPrecision(auc_round, dict(missing_scores, **nonexist_scores), testing_edges)
         prec.append(prec_round)
 
+        if record is not None:
+            record('ShortestPath', steps, j, auc_round, prec_round, time.time() - start, seed=task_seed)
+
     return auc, prec
 
 
-def CNFracAUC(network, nonexist_edges, iterations, steps):
+def CNFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the Common Neighbors scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
 
-    auc = []; prec = []
-
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
-        training_graph = iteration_data[0]
-        testing_edges = iteration_data[1]
-        missing_scores = LinkPrediction.CommonNeighbors(training_graph, testing_edges)
-        nonexist_scores = LinkPrediction.CommonNeighbors(training_graph, nonexist_edges)
-
-        #get AUC
-        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores)
-        auc.append(auc_round)
-
-        #precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
-        prec_round = EvaluationMetrics.KPrecision(auc_round, dict(missing_scores, **nonexist_scores), testing_edges)
-        prec.append(prec_round)
-
-    return auc, prec
+    return IncrementalFracAUC('CommonNeighbors', network, nonexist_edges, iterations, steps, record, seed)
 
 
-def JFracAUC(network, nonexist_edges, iterations, steps):
+def JFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the Jaccard scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
 
-    auc = []; prec = []
-
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
-        training_graph = iteration_data[0]
-        testing_edges = iteration_data[1]
-        missing_scores = LinkPrediction.Jaccard(training_graph, testing_edges)
-        nonexist_scores = LinkPrediction.Jaccard(training_graph, nonexist_edges)
-
-        #get AUC
-        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores)
-        auc.append(auc_round)
-
-        #precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
-        prec_round = EvaluationMetrics.KPrecision(auc_round, dict(missing_scores, **nonexist_scores), testing_edges)
-        prec.append(prec_round)
-
-    return auc, prec
+    return IncrementalFracAUC('Jaccard', network, nonexist_edges, iterations, steps, record, seed)
 
 
-def SSFracAUC(network, nonexist_edges, iterations, steps):
+def SSFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the Sorenson Similarity scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
 
-    auc = []; prec = []
-
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
-        training_graph = iteration_data[0]
-        testing_edges = iteration_data[1]
-        missing_scores = LinkPrediction.Sorensen(training_graph, testing_edges)
-        nonexist_scores = LinkPrediction.Sorensen(training_graph, nonexist_edges)
+    return IncrementalFracAUC('Sorensen', network, nonexist_edges, iterations, steps, record, seed)
 
-        #get AUC
-        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores)
-        auc.append(auc_round)
 
-        #precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
-        prec_round = EvaluationMetrics.KPrecision(auc_round, dict(missing_scores, **nonexist_scores), testing_edges)
-        prec.append(prec_round)
-
-    return auc, prec
-
-
-def LHNFracAUC(network, nonexist_edges, iterations, steps):
+def LHNFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the Leicht-Holme-Newman scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
 
-    auc = []; prec = []
-
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
-        training_graph = iteration_data[0]
-        testing_edges = iteration_data[1]
-        missing_scores = LinkPrediction.LHN(training_graph, testing_edges)
-        nonexist_scores = LinkPrediction.LHN(training_graph, nonexist_edges)
-
-        #get AUC
-        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores)
-        auc.append(auc_round)
-
-        #precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
-        prec_round = EvaluationMetrics.KPrecision(auc_round, dict(missing_scores, **nonexist_scores), testing_edges)
-        prec.append(prec_round)
-
-    return auc, prec
+    return IncrementalFracAUC('LHN', network, nonexist_edges, iterations, steps, record, seed)
 
 
-def AAFracAUC(network, nonexist_edges, iterations, steps):
+def AAFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the Adamic Advar scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
 
-    auc = []; prec = []
-
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
-        training_graph = iteration_data[0]
-        testing_edges = iteration_data[1]
-        missing_scores = LinkPrediction.AdamicAdar(training_graph, testing_edges)
-        nonexist_scores = LinkPrediction.AdamicAdar(training_graph, nonexist_edges)
-        #get AUC
-        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores)
-        auc.append(auc_round)
-
-        #precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
-        prec_round = EvaluationMetrics.KPrecision(auc_round, dict(missing_scores, **nonexist_scores), testing_edges)
-        prec.append(prec_round)
-
-    return auc, prec
+    return IncrementalFracAUC('AdamicAdar', network, nonexist_edges, iterations, steps, record, seed)
 
 
-def RAFracAUC(network, nonexist_edges, iterations, steps):
+def RAFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the Resource Allocaiton scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
 
-    auc = []; prec = []
-
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
-        training_graph = iteration_data[0]
-        testing_edges = iteration_data[1]
-        missing_scores = LinkPrediction.ResourceAllocation(training_graph, testing_edges)
-        nonexist_scores = LinkPrediction.ResourceAllocation(training_graph, nonexist_edges)
+    return IncrementalFracAUC('ResourceAllocation', network, nonexist_edges, iterations, steps, record, seed)
 
-        #get AUC
-        auc_round = EvaluationMetrics.AUC(nonexist_scores, missing_scores)
-        auc.append(auc_round)
 
-        #precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
-        prec_round = EvaluationMetrics.KPrecision(auc_round, dict(missing_scores, **nonexist_scores), testing_edges)
-        prec.append(prec_round)
-
-    return auc, prec
-
-
-def KFracAUC(network, nonexist_edges, iterations, steps):
+def KFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the Katz scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
 
     auc = []; prec = []
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
+    seed = RandomStreams.RootSeed() if seed is None else seed
+    for j in Iterations(iterations):
+        start = time.time()
+        task_seed, rng = RandomStreams.TaskStream(seed, 'Katz', steps, j)
+        iteration_data = GraphMaker(network, steps, rng)
         training_graph = iteration_data[0]
         testing_edges = iteration_data[1]
         scores = LinkPrediction.katz(training_graph, beta=0.001, max_power=5, weight=None, dtype=None)
 
-        #get AUC
-        count = 0.0
-        for i in xrange(1000):
-            TN = random.sample(nonexist_edges, 1)[0]
-            TP = random.sample(testing_edges, 1)[0]
-
-            if (TN[0], TN[1]) in scores.keys():
-                TN_val = scores[(TN[0], TN[1])]
-            else: TN_val = 0.0
-
-            if (TP[0], TP[1]) in scores.keys():
-                TP_val = scores[(TP[0], TP[1])]
-            else: TP_val = 0.0
-
-            if TP_val > TN_val:
-                count += 1.0
-            if TP_val == TN_val:
-                count += 0.5
-
-        auc_round = count/1000
+        # get AUC
+        auc_round = EvaluationMetrics.PairAUC(scores, nonexist_edges, testing_edges, rng)
         auc.append(auc_round)
 
         #precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
         prec_round = EvaluationMetrics.KPrecision(auc_round, scores, testing_edges)
         prec.append(prec_round)
 
+        if record is not None:
+            record('Katz', steps, j, auc_round, prec_round, time.time() - start, seed=task_seed)
+
     return auc, prec
 
 
-def SFracAUC(network, nonexist_edges, iterations, steps):
+def SFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the SimRank scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
 
     auc = []; prec = []
+    seed = RandomStreams.RootSeed() if seed is None else seed
 
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
+    for j in Iterations(iterations):
+        start = time.time()
+        task_seed, rng = RandomStreams.TaskStream(seed, 'SimRank', steps, j)
+        iteration_data = GraphMaker(network, steps, rng)
         training_graph = iteration_data[0]
         testing_edges = iteration_data[1]
         scores = LinkPrediction.SimRank(training_graph, c=0.8, num_iterations= 10)
 
         # get AUC
-        count = 0.0
-        for i in xrange(1000):
-            TN = random.sample(nonexist_edges, 1)[0]
-            TP = random.sample(testing_edges, 1)[0]
-
-            if (TN[0], TN[1]) in scores.keys():
-                TN_val = scores[(TN[0], TN[1])]
-            else:
-                TN_val = 0.0
-
-            if (TP[0], TP[1]) in scores.keys():
-                TP_val = scores[(TP[0], TP[1])]
-            else:
-                TP_val = 0.0
-
-            if TP_val > TN_val:
-                count += 1.0
-            if TP_val == TN_val:
-                count += 0.5
-
-        auc_round = count/1000
+        auc_round = EvaluationMetrics.PairAUC(scores, nonexist_edges, testing_edges, rng)
         auc.append(auc_round)
 
         # precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
         prec_round = EvaluationMetrics.KPrecision(auc_round, scores, testing_edges)
         prec.append(prec_round)
 
+        if record is not None:
+            record('SimRank', steps, j, auc_round, prec_round, time.time() - start, seed=task_seed)
+
     return auc, prec
 
 
-def PRFracAUC(network, nonexist_edges, iterations, steps):
+def PRFracAUC(network, nonexist_edges, iterations, steps, record=None, seed=None):
     '''
     Function takes a network, list of non-existent edges, the number of iterations, and the percent of edges to sample
     (steps) and runs the Rooted Page Rank scoring function over each sampled network for the specified number of
     iterations.
     :param network: undirected graph
     :param nonexist_edges: list of non-existent edges from the graph
-    :param iterations: integer representing the number of iterations to run
+    :param iterations: integer representing the number of iterations to run or a list of the iterations to run (e.g.,
+    the iterations a resumed sweep has not recorded)
     :param steps: list of percent of edges to sample
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the iterations (see IncrementalFracAUC)
     :return:
     '''
     auc = []; prec = []
+    seed = RandomStreams.RootSeed() if seed is None else seed
 
-    for j in xrange(iterations):
-        iteration_data = GraphMaker(network, steps)
+    for j in Iterations(iterations):
+        start = time.time()
+        task_seed, rng = RandomStreams.TaskStream(seed, 'RootedPageRank', steps, j)
+        iteration_data = GraphMaker(network, steps, rng)
         training_graph = iteration_data[0]
         testing_edges = iteration_data[1]
         scores = LinkPrediction.RPR(training_graph, alpha=0.15, beta=0)
 
         # get AUC
-        count = 0.0
-        for i in xrange(1000):
-            TN = random.sample(nonexist_edges, 1)[0]
-            TP = random.sample(testing_edges, 1)[0]
-
-            if (TN[0], TN[1]) in scores.keys():
-                TN_val = scores[(TN[0], TN[1])]
-            else:
-                TN_val = 0.0
-
-            if (TP[0], TP[1]) in scores.keys():
-                TP_val = scores[(TP[0], TP[1])]
-            else:
-                TP_val = 0.0
-
-            if TP_val > TN_val:
-                count += 1.0
-            if TP_val == TN_val:
-                count += 0.5
-
-        auc_round = count/1000
+        auc_round = EvaluationMetrics.PairAUC(scores, nonexist_edges, testing_edges, rng)
         auc.append(auc_round)
 
         # precision - getting top or bottom K links depends on whether or not AUC is >/< 0.5
         prec_round = EvaluationMetrics.KPrecision(auc_round, scores, testing_edges)
         prec.append(prec_round)
 
+        if record is not None:
+            record('RootedPageRank', steps, j, auc_round, prec_round, time.time() - start, seed=task_seed)
+
     return auc, prec
 
 
+# sweep methods (method name recorded in the result store, FracAUC function)
+METHODS = [('DegreeProduct', DPFracAUC), ('ShortestPath', SPFracAUC), ('CommonNeighbors', CNFracAUC),
+           ('Jaccard', JFracAUC), ('Sorensen', SSFracAUC), ('LHN', LHNFracAUC), ('AdamicAdar', AAFracAUC),
+           ('ResourceAllocation', RAFracAUC), ('Katz', KFracAUC), ('SimRank', SFracAUC),
+           ('RootedPageRank', PRFracAUC)]
+
+# methods run when none are specified
+DEFAULT_METHODS = [name for name, _ in METHODS if name != 'SimRank']
+
+# fraction of edges sampled at each step of a sweep
+STEPS = [0.05, 0.1, 0.3, 0.5, 0.7, 0.9, 0.95]
+
+# network and non-existent edges of the sweep being run by Sweep (inherited by the worker processes)
+NETWORK = None
+NONEXIST_EDGES = []
+
+
+def SweepTask(record, seed, task):
+    '''
+    Function runs the iterations of one method and step of the sweep being run by Sweep. The network is not sent to
+    the workers: they are forked after NETWORK is set and use the same graph object (with the same node and edge order)
+    as the parent process, so the sampled edges only depend on the seeds.
+    :param record: function called with the result of each iteration (see IncrementalFracAUC)
+    :param seed: integer representing the root seed of the sweep
+    :param task: tuple storing the method name, the step, and the list of iterations to run
+    :return: tuple storing the method name, the step, and the number of iterations run
+    '''
+
+    method, step, iterations = task
+    auc, prec = dict(METHODS)[method](NETWORK, NONEXIST_EDGES, iterations, step, record, seed)
+
+    return method, step, len(auc)
+
+
+def PendingTasks(store, graph, methods=None, steps=STEPS, iterations=100, seed=None, chunk=None):
+    '''
+    Function finds the iterations of a sweep which are not recorded in the result store and groups them into tasks.
+    :param store: string containing the file path/name of the result store
+    :param graph: string containing the name of the graph in the result store
+    :param methods: list of method names (see METHODS; None runs DEFAULT_METHODS)
+    :param steps: list of percent of edges to sample
+    :param iterations: integer representing the number of iterations of each method and step
+    :param seed: integer representing the root seed (None uses the seed stored for the graph or draws a new one)
+    :param chunk: integer representing the maximum number of iterations of a task (None makes one task per method
+    and step)
+    :return: tuple where tuple[0] is the root seed and tuple[1] is a list of tasks (tuples storing the method name,
+    the step, and the list of iterations to run)
+    '''
+    results = ResultStore.ResultStore(store)
+
+    try:
+        seed = results.Seed(graph, seed)
+        tasks = []
+
+        for method in methods or DEFAULT_METHODS:
+            for step in steps:
+                pending = sorted(set(xrange(iterations)) - results.Completed(graph, method, step))
+                size = chunk or len(pending) or 1
+
+                for start in xrange(0, len(pending), size):
+                    tasks.append((method, step, pending[start:start + size]))
+    finally:
+        results.Close()
+
+    return seed, tasks
+
+
+def Sweep(network, graph, store, methods=None, steps=STEPS, iterations=100, processes=4, seed=None):
+    '''
+    Function runs a checkpointed link prediction sweep. Every iteration is recorded in the result store as it
+    finishes, and the iterations of each method and step which are already in the store are skipped, so a sweep which
+    was stopped (or crashed) resumes where it stopped. Subsets of the methods and steps can be run on different
+    machines (with the same root seed) and their stores combined with ResultStore.Merge.
+    :param network: undirected graph
+    :param graph: string containing the name of the graph in the result store
+    :param store: string containing the file path/name of the result store
+    :param methods: list of method names (see METHODS; None runs DEFAULT_METHODS)
+    :param steps: list of percent of edges to sample
+    :param iterations: integer representing the number of iterations of each method and step
+    :param processes: integer representing the number of worker processes (1 runs the sweep in this process)
+    :param seed: integer representing the root seed (None uses the seed stored for the graph or draws a new one)
+    :return: integer representing the number of iterations run
+    '''
+    global NETWORK, NONEXIST_EDGES
+    seed, tasks = PendingTasks(store, graph, methods, steps, iterations, seed)
+
+    print 'Root seed: ' + str(seed)
+    print str(sum([len(task[2]) for task in tasks])) + ' iterations to run in ' + str(len(tasks)) + ' tasks'
+
+    NETWORK = network
+    NONEXIST_EDGES = list(nx.non_edges(network))  # non-existent edges in graph
+    run = partial(SweepTask, partial(ResultStore.Record, store, graph), seed)
+    pool = multiprocessing.Pool(processes=processes) if processes > 1 and len(tasks) > 1 else None
+    count = 0
+
+    try:
+        for method, step, ran in (pool.imap_unordered(run, tasks) if pool else (run(task) for task in tasks)):
+            count += ran
+            print 'Finished running ' + method + ' (step ' + str(step) + ', ' + str(ran) + ' iterations)'
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+        ResultStore.CloseStores()
+        NETWORK, NONEXIST_EDGES = None, []
+
+    return count
+
+
 def main():
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    parser = argparse.ArgumentParser(description='Runs checkpointed link prediction sweeps; every iteration is recorded '
+                                                 'in a result store and a restarted sweep skips recorded iterations.')
+    parser.add_argument('network', nargs='?', default='Network_Data/Trametinib_query_NETS_network.gml',
+                        help='GML network file')
+    parser.add_argument('-g', '--graph', default='NETS_Tram', help='name of the graph in the result store')
+    parser.add_argument('-o', '--store', default='Results/Trametinib/link_prediction.sqlite',
+                        help='SQLite result store')
+    parser.add_argument('-m', '--methods', nargs='+', choices=[name for name, _ in METHODS], default=DEFAULT_METHODS,
+                        help='methods to run (default: all but SimRank)')
+    parser.add_argument('-s', '--steps', nargs='+', type=float, default=STEPS,
+                        help='fractions of edges sampled (default: ' + ' '.join([str(x) for x in STEPS]) + ')')
+    parser.add_argument('-i', '--iterations', type=int, default=100, help='iterations of each method and step')
+    parser.add_argument('-p', '--processes', type=int, default=4, help='number of worker processes (default: 4)')
+    parser.add_argument('-r', '--seed', type=int, default=None,
+                        help='root seed (default: the seed stored for the graph, or a new seed)')
+    parser.add_argument('--merge', nargs='+', default=None,
+                        help='result stores merged into the store (no sweep is run)')
+    args = parser.parse_args()
+
+    if args.merge:
+        store = ResultStore.ResultStore(args.store)
+        try:
+            for location in args.merge:
+                print 'Merged ' + str(store.Merge(location)) + ' rows from ' + location
+        finally:
+            store.Close()
+        return
 
-    #specify initial arguments for all functions
-    manager = multiprocessing.Manager()
-    network = nx.read_gml('Network_Data/Trametinib_query_NETS_network.gml').to_undirected()
-    nonexist_edges = manager.list(list(nx.non_edges(network)))
-    nonexist_edges = list(nx.non_edges(network))  # non-existent edges in graph
-    iterations = 100
-    steps = [0.05, 0.1, 0.3, 0.5, 0.7, 0.9, 0.95]
-    file = 'Results/Trametinib/NETS_Tram_'
-
-    pool = multiprocessing.Pool(processes=4)  # set up pool
-
-    #Degree Product
-    func = partial(DPFracAUC, network, nonexist_edges, iterations)
-    DPres = pool.map(func, steps)
-    print 'Finished running Degree Product'
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    #write dictionary to json file
-    with open(str(file) + 'DP.json', 'w') as fout:
-        json.dump(DPres, fout)
-
-    #Shortest Path
-    func2 = partial(SPFracAUC, network, nonexist_edges, iterations)
-    SPres = pool.map(func2, steps)
-    print 'Finished running Shortest Path'
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    #write dictionary to json file
-    with open(str(file) + 'SP.json', 'w') as fout:
-        json.dump(SPres, fout)
-
-    #Common Neighbors
-    func3 = partial(CNFracAUC, network, nonexist_edges, iterations)
-    CNres = pool.map(func3, steps)
-    print 'Finished running Common Neighbors'
     print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    #write dictionary to json file
-    with open(str(file) + 'CN.json', 'w') as fout:
-        json.dump(CNres, fout)
-
-    #Jaccard
-    func4 = partial(JFracAUC, network, nonexist_edges, iterations)
-    Jres = pool.map(func4, steps)
-    print 'Finished running Jaccard Index'
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    #write dictionary to json file
-    with open(str(file) + 'J.json', 'w') as fout:
-        json.dump(Jres, fout)
-
-    #Sorensen Similarity
-    func5 = partial(SSFracAUC, network, nonexist_edges, iterations)
-    SSres = pool.map(func5, steps)
-    print 'Finished running Sorensen Similarity'
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    #write dictionary to json file
-    with open(str(file) + 'SS.json', 'w') as fout:
-        json.dump(SSres, fout)
-
-    #Leicht-Holme-Newman
-    func6 = partial(LHNFracAUC, network, nonexist_edges, iterations)
-    LHNres = pool.map(func6, steps)
-    print 'Finished running Leicht-Holme-Newman'
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    #write dictionary to json file
-    with open(str(file) + 'LHN.json', 'w') as fout:
-        json.dump(LHNres, fout)
-
-    #Adamic Advar
-    func7 = partial(AAFracAUC, network, nonexist_edges, iterations)
-    AAres = pool.map(func7, steps)
-    print 'Finished running Adamic Advar'
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    #write dictionary to json file
-    with open(str(file) + 'AA.json', 'w') as fout:
-        json.dump(AAres, fout)
-
-    #Resource Allocation
-    func8 = partial(RAFracAUC, network, nonexist_edges, iterations)
-    RAres = pool.map(func8, steps)
-    print 'Finished running Resource Allocation'
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    #write dictionary to json file
-    with open(str(file) + 'RA.json', 'w') as fout:
-        json.dump(RAres, fout)
-
-    #Katz
-    func9 = partial(KFracAUC, network, nonexist_edges, iterations)
-    Kres = pool.map(func9, steps)
-    print 'Finished running Katz'
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    #write dictionary to json file
-    with open(str(file) + 'K.json', 'w') as fout:
-        json.dump(Kres, fout)
-
-    # #Simrank
-    # func10 = partial(SFracAUC, network, nonexist_edges, iterations)
-    # Sres = pool.map(func10, steps)
-    # print 'Finished running SimRank'
-    # # write dictionary to json file
-    # with open(str(file) + 'SR.json', 'w') as fout:
-    #     json.dump(Sres, fout)
-
-    # Rooted Page Rank
-    func11 = partial(PRFracAUC, network, nonexist_edges, iterations)
-    RPRres = pool.map(func11, steps)
-    print 'Finished running Rooted Page Rank'
-    print str('Started running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    # write dictionary to json file
-    with open(str(file) + 'RPR.json', 'w') as fout:
-        json.dump(RPRres, fout)
 
+    network = nx.read_gml(args.network).to_undirected()
+    count = Sweep(network, args.graph, args.store, args.methods, args.steps, args.iterations, args.processes,
+                  args.seed)
 
-    pool.close()
-    pool.join()
-
+    print 'Ran ' + str(count) + ' iterations'
     print str('Finished running predictions ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
+
 if __name__ == '__main__':
     main()
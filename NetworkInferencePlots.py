@@ -1,15 +1,17 @@
 ##############################################################################################
 # NetworkInferencePlots.py
 # Purpose: script generates AUC plots to compare performance of network inference algorithms
-# version 1.0.8
-# date: 01.28.2017
+# version 1.0.10
+# date: 10.19.2026
 ##############################################################################################
 
 
 # import module/script dependencies
+import argparse
 import json
 import numpy as np
 import matplotlib.pyplot as plt
+import ResultStore
 
 
 
@@ -21,7 +23,7 @@ def ResultParser(file):
     :return: list storing the average AUC values across n steps
     '''
 
-    auc_results = []; prec_results = []; auc = []; prec = []; auc_mod = []
+    auc_results = []; prec_results = []
 
     # open the json file
     with open(file) as json_data:
@@ -30,28 +32,50 @@ def ResultParser(file):
     for i in results:
         if len(i) == 2:
             auc_results.append(i[0])
-            auc = [np.mean(x) for x in auc_results]
             prec_results.append(i[1])
-            prec = [np.mean(x) for x in prec_results]
         else:
             auc_results.append(i)
-            auc = [np.mean(x) for x in auc_results]
 
-    for j in auc:
-        if j < 0.5:
-            auc_mod.append(1 - j)
-        else:
-            auc_mod.append(j)
+    # average each step once, after every step has been read
+    auc = [np.mean(x) for x in auc_results]
+    prec = [np.mean(x) for x in prec_results]
+    auc_mod = [1 - j if j < 0.5 else j for j in auc]
 
     return auc_mod, prec
 
 
 
+def StoreParser(location, graph, method):
+    '''
+    Function reads the results of a method from a result store (see ResultStore.py) and outputs the average AUC and
+    precision values of each step. Only the step, AUC, and precision columns are read and the averages are computed by
+    the store.
+    :param location: string storing the file path/name of the result store
+    :param graph: string storing the name of the graph
+    :param method: string storing the name of the method
+    :return: list where list[0] is a numpy array of the average AUC values (AUC values below 0.5 are reflected),
+    list[1] is a numpy array of the average precision values, and list[2] is a numpy array of the steps, one per step
+    recorded in the store in increasing order (a sweep which has not finished may not have recorded every step)
+    '''
+
+    store = ResultStore.ResultStore(location)
+
+    try:
+        results = store.Aggregate(values=('auc', 'precision'), by=('step',), graph=graph, method=method)
+    finally:
+        store.Close()
+
+    auc = results['auc'].astype(float)
+
+    return [np.where(auc < 0.5, 1 - auc, auc), results['precision'], results['step']]
+
+
+
 def ResultPlotter(steps, data, xlabel, ylabel, title, output):
     '''
     Function takes a list of data, plotting parameters and plots the data. The plot is saved according to the file
     directory specified by the user.
-    :param steps: list storing the x-axis values
+    :param steps: list of lists storing the x-axis values of each list of AUC scores
     :param data: list of lists of AUC scores for plotting
     :param xlabel: string storing x-axis label
     :param ylabel: string storing y-axis label
@@ -60,17 +84,17 @@ def ResultPlotter(steps, data, xlabel, ylabel, title, output):
     :return: plot is created and written to user-specified location
     '''
 
-    plt1, = plt.plot(steps, data[0], color = 'purple', marker = '>', linestyle = ':', linewidth=2)
-    plt2, = plt.plot(steps, data[1], color = 'magenta', marker = 's', linestyle = ':',linewidth=2)
-    plt3, = plt.plot(steps, data[2], color = 'forestgreen', marker = 'o', linestyle = ':',linewidth=2)
-    plt4, = plt.plot(steps, data[3], color = 'orange', marker = 'd', linestyle = ':',linewidth=2)
-    plt5, = plt.plot(steps, data[4], color = 'gold', marker = '*', linestyle = ':',linewidth=2)
-    plt6, = plt.plot(steps, data[5], color = 'slategray', marker = '>', linestyle = ':',linewidth=2)
-    plt7, = plt.plot(steps, data[6], color = 'limegreen', marker = 's', linestyle = ':',linewidth=2)
-    plt8, = plt.plot(steps, data[7], color = 'cyan', marker = 'd', linestyle = ':',linewidth=2)
-    plt9, = plt.plot(steps, data[8], color = 'red', marker = '*', linestyle = ':',linewidth=2)
-    plt10, = plt.plot(steps, data[9], color = 'royalblue', marker = '>', linestyle = ':',linewidth=2)
-    # plt11, = plt.plot(steps, data[10], color='orange', marker='o', linestyle=':', linewidth=2)
+    plt1, = plt.plot(steps[0], data[0], color = 'purple', marker = '>', linestyle = ':', linewidth=2)
+    plt2, = plt.plot(steps[1], data[1], color = 'magenta', marker = 's', linestyle = ':',linewidth=2)
+    plt3, = plt.plot(steps[2], data[2], color = 'forestgreen', marker = 'o', linestyle = ':',linewidth=2)
+    plt4, = plt.plot(steps[3], data[3], color = 'orange', marker = 'd', linestyle = ':',linewidth=2)
+    plt5, = plt.plot(steps[4], data[4], color = 'gold', marker = '*', linestyle = ':',linewidth=2)
+    plt6, = plt.plot(steps[5], data[5], color = 'slategray', marker = '>', linestyle = ':',linewidth=2)
+    plt7, = plt.plot(steps[6], data[6], color = 'limegreen', marker = 's', linestyle = ':',linewidth=2)
+    plt8, = plt.plot(steps[7], data[7], color = 'cyan', marker = 'd', linestyle = ':',linewidth=2)
+    plt9, = plt.plot(steps[8], data[8], color = 'red', marker = '*', linestyle = ':',linewidth=2)
+    plt10, = plt.plot(steps[9], data[9], color = 'royalblue', marker = '>', linestyle = ':',linewidth=2)
+    # plt11, = plt.plot(steps[10], data[10], color='orange', marker='o', linestyle=':', linewidth=2)
 
     hline = plt.axhline(y=0.5, xmax=1, linestyle ='--', color='black')
     # plt.legend([plt1, plt2, plt3, plt4, plt5, plt6, plt7, plt8, plt9, plt10, hline],
@@ -96,26 +120,26 @@ def ResultPlotter(steps, data, xlabel, ylabel, title, output):
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Plots the average AUC of each link prediction method of a sweep.')
+    parser.add_argument('-g', '--graph', default='NETS_Tram',
+                        help='name of the graph in the result store (default: NETS_Tram, as in NetworkInference.py)')
+    parser.add_argument('-o', '--store', default='Results/Trametinib/link_prediction.sqlite',
+                        help='SQLite result store')
+    parser.add_argument('-p', '--plot', default=None,
+                        help='plot file (default: Results/Trametinib/AUCplot_<graph>.png)')
+    args = parser.parse_args()
+
     #load results and format for plotting
-    file = 'Results/Trametinib/OWL_Tram'
-    dp_res = ResultParser(str(file) + '_DP.json')
-    sp_res = ResultParser(str(file) + '_SP.json')
-    cn_res = ResultParser(str(file) + '_CN.json')
-    j_res = ResultParser(str(file) + '_J.json')
-    ss_res = ResultParser(str(file) + '_SS.json')
-    lhn_res = ResultParser(str(file) + '_LHN.json')
-    aa_res = ResultParser(str(file) + '_AA.json')
-    ra_res = ResultParser(str(file) + '_RA.json')
-    k_res = ResultParser(str(file) + '_K.json')
-    # s_res = ResultParser(str(file) + '_SR.json')
-    rpr_res = ResultParser(str(file) + '_RPR.json')
-    # hrg_resa = ResultParser('Results/Trematinib/nice_trem_HRG_AUC.json')
-    # hrg_resp = ResultParser2('Results/Trematinib/nice_trem_HRG_PREC.json')
+    store = args.store
+    methods = ['DegreeProduct', 'CommonNeighbors', 'ShortestPath', 'Jaccard', 'Sorensen', 'LHN', 'AdamicAdar',
+               'ResourceAllocation', 'Katz', 'RootedPageRank']
+    # results written as JSON by earlier versions can be loaded with ResultStore.ResultStore(store).ImportJSON
 
     #plot results
-    data = [dp_res[0], cn_res[0], sp_res[0], j_res[0], ss_res[0], lhn_res[0], aa_res[0], ra_res[0], k_res[0], rpr_res[0]]
-    steps = [0.05, 0.1, 0.3, 0.5, 0.7, 0.9, 0.95]
-    ResultPlotter(steps, data, 'Fraction of Observed Edges', 'Average  AUC', '', 'Results/Trametinib/AUCplot_OWL.png')
+    results = [StoreParser(store, args.graph, method) for method in methods]
+    data, steps = [x[0] for x in results], [x[2] for x in results]
+    ResultPlotter(steps, data, 'Fraction of Observed Edges', 'Average  AUC', '',
+                  args.plot or 'Results/Trametinib/AUCplot_' + args.graph + '.png')
 
 
 if __name__ == '__main__':
@@ -1,236 +1,640 @@
 ####################################################################
 # NetworkStatistics.py
-# Purpose: script explores different characteristics of a newtork
-# version 1.1.0
-# date: 07.21.2017
+# Purpose: script computes statistics which characterize a network
+# version 2.0.0
+# date: 10.19.2026
 ####################################################################
 
 
 # import module/script dependencies
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import random
+from itertools import islice
 import networkx as nx
 import numpy as np
-from collections import Counter
-import matplotlib.pyplot as plt
-from pylab import show
-from powerlaw import plot_pdf, Fit, pdf
-import powerlaw
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.special import zeta
+import GraphLoader
 
 
+# statistics computed by ComputeStats, in the order they are reported
+METRICS = ['nodes', 'edges', 'density', 'average_degree', 'degree_heterogeneity', 'average_neighbor_degree',
+           'assortativity', 'power_law', 'components', 'clustering', 'cliques', 'closeness', 'average_shortest_path_length',
+           'diameter', 'betweenness']
 
-# produce network statistics
-# read in graphs
-trem_owl = nx.read_gml('Network_Data/Trametinib_query_OWL_network.gml')
-trem_nets = nx.read_gml('Network_Data/Trametinib_query_NETS_network.gml')
-ddi_owl = nx.read_gml('Network_Data/DDI_reactome_query_OWL_network.gml')
-ddi_nets=nx.read_gml('Network_Data/DDI_reactome_query_NETS_network.gml')
+# number of sources searched by a single task of the process pool
+CHUNK = 64
 
-len(list(nx.non_edges(ddi_nets.to_undirected())))
+# CSR arrays of the graph being searched (inherited by the worker processes)
+ARRAYS = []
 
 
-count = set
-for node in trem_nets.nodes(data=True):
 
+class NetworkView:
+    '''
+    Class caches the undirected views of a graph which are shared by every statistic: the CSR arrays (built once, or
+    taken from a memory-mapped CSRGraph), node degrees, connected components, the search results for each source node,
+    and a networkx graph (only built for the statistics which need one). Degrees follow networkx, so self-loops are
+    counted twice.
+    :param graph: networkx graph or GraphLoader.CSRGraph (directed graphs are treated as undirected)
+    '''
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.name, self.index, self.indptr, self.indices = GraphLoader.CSRArrays(graph)
+        self.n = len(self.indptr) - 1
+        self.sources = np.repeat(np.arange(self.n), np.diff(self.indptr))
+        self.loops = np.bincount(self.sources[self.sources == self.indices], minlength=self.n)
+        self.degree = np.diff(self.indptr) + self.loops
+        self.paths = {}
+        self.labels = None
+        self.undirected = None
+
+    def Undirected(self):
+        '''
+        Function returns the undirected networkx graph, converting the graph the first time it is requested.
+        :return: networkx graph
+        '''
+        if self.undirected is None:
+            if isinstance(self.graph, GraphLoader.CSRGraph):
+                self.undirected = self.graph.to_undirected().ToNetworkX()
+            else:
+                self.undirected = self.graph.to_undirected() if self.graph.is_directed() else self.graph
+
+        return self.undirected
+
+    def Components(self):
+        '''
+        Function returns the connected component of every node.
+        :return: numpy array of integers, one component label per node
+        '''
+        if self.labels is None:
+            matrix = csr_matrix((np.ones(len(self.indices), dtype=np.int8), self.indices, self.indptr),
+                                shape=(self.n, self.n))
+            self.labels = connected_components(matrix, directed=False)[1]
+
+        return self.labels
+
+    def LargestComponent(self):
+        '''
+        Function returns the nodes of the largest connected component.
+        :return: numpy array of integers representing the nodes
+        '''
+        labels = self.Components()
+
+        return np.flatnonzero(labels == np.argmax(np.bincount(labels))) if self.n else labels
+
+    def Paths(self, sources, processes=1):
+        '''
+        Function searches the graph from each source node (searches already run for the view are reused).
+        :param sources: list of integers representing the source nodes
+        :param processes: integer representing the number of worker processes
+        :return: list of tuples, one per source, where tuple[0] is the number of nodes reached (including the source),
+        tuple[1] is the sum of their distances, and tuple[2] is the largest distance
+        '''
+        missing = [x for x in set(sources) if x not in self.paths]
+
+        for chunk in Parallel(PathChunk, (self.indptr, self.indices), missing, processes):
+            self.paths.update(chunk)
+
+        return [self.paths[x] for x in sources]
+
+
+def Parallel(function, arrays, sources, processes=1):
+    '''
+    Function runs a search function over chunks of source nodes, using a pool of worker processes when processes > 1.
+    The CSR arrays are set before the workers are forked, so they are shared rather than sent to each worker.
+    :param function: function taking a list of source nodes
+    :param arrays: tuple storing the indptr and indices arrays
+    :param sources: list of integers representing the source nodes
+    :param processes: integer representing the number of worker processes
+    :return: list storing the result of each chunk
+    '''
+    global ARRAYS
+    ARRAYS = arrays
+    chunks = [list(sources[start:start + CHUNK]) for start in xrange(0, len(sources), CHUNK)]
+
+    try:
+        if processes > 1 and len(chunks) > 1:
+            pool = multiprocessing.Pool(processes=processes)
+            try:
+                return pool.map(function, chunks)
+            finally:
+                pool.close()
+                pool.join()
+
+        return [function(chunk) for chunk in chunks]
+
+    finally:
+        ARRAYS = []
+
+
+def PathChunk(sources):
+    '''
+    Function searches the graph from each source node of a chunk.
+    :param sources: list of integers representing the source nodes
+    :return: dictionary where the keys are the source nodes and the values are tuples storing the number of nodes
+    reached, the sum of their distances, and the largest distance
+    '''
+    indptr, indices = ARRAYS
+    paths = {}
+
+    for source in sources:
+        distance = GraphLoader.BFS(indptr, indices, source)
+        reached = distance[distance >= 0]
+        paths[source] = (len(reached), int(reached.sum()), int(reached.max()))
+
+    return paths
+
+
+def BetweennessChunk(sources):
+    '''
+    Function accumulates the shortest-path dependencies (Brandes, 2001) of every node on each source node of a chunk.
+    Every level of the search is processed as a whole: path counts are pushed down, and dependencies pulled back up,
+    along the edges between consecutive levels with numpy.bincount.
+    :param sources: list of integers representing the source nodes
+    :return: numpy array of floats storing the summed dependencies of every node
+    '''
+    indptr, indices = ARRAYS
+    n = len(indptr) - 1
+    betweenness = np.zeros(n)
+
+    for source in sources:
+        distance = np.empty(n, dtype=np.int32)
+        distance.fill(-1)
+        distance[source] = 0
+        sigma = np.zeros(n)
+        sigma[source] = 1.0
+        frontier = np.array([source])
+        levels = []
+
+        while len(frontier):
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+            u = np.repeat(frontier, counts)
+            v = indices[offsets + np.arange(int(counts.sum()))]
+
+            frontier = np.unique(v[distance[v] < 0])
+            distance[frontier] = len(levels) + 1
+
+            # edges on a shortest path from the source
+            keep = distance[v] == len(levels) + 1
+            u, v = u[keep], v[keep]
+            sigma += np.bincount(v, weights=sigma[u], minlength=n)
+            levels.append((u, v))
+
+        delta = np.zeros(n)
+        for u, v in reversed(levels):
+            delta += np.bincount(u, weights=sigma[u] / sigma[v] * (1.0 + delta[v]), minlength=n)
+
+        delta[source] = 0.0
+        betweenness += delta
+
+    return betweenness
+
+
+def Sample(nodes, samples, rng):
+    '''
+    Function returns a random sample of nodes, or every node when the sample would include all of them.
+    :param nodes: sequence of integers representing the nodes
+    :param samples: integer representing the number of nodes sampled (None for every node)
+    :param rng: random.Random used to draw the sample
+    :return: list of integers representing the sampled nodes
+    '''
+    nodes = list(nodes)
 
+    if samples is None or samples >= len(nodes):
+        return nodes
 
+    return sorted(rng.sample(nodes, samples))
 
-nx.number_connected_components(ddi_owl.to_undirected())
 
-## Descriptives
+def Betweenness(view, sources, processes=1):
+    '''
+    Function computes the betweenness centrality of every node, normalized as networkx.betweenness_centrality for
+    undirected graphs. When sources is a sample of the nodes, the result is rescaled by the fraction sampled.
+    :param view: NetworkView of the graph
+    :param sources: list of integers representing the source (pivot) nodes
+    :param processes: integer representing the number of worker processes
+    :return: numpy array of floats, one per node
+    '''
+    betweenness = np.zeros(view.n)
+
+    for chunk in Parallel(BetweennessChunk, (view.indptr, view.indices), sources, processes):
+        betweenness += chunk
+
+    if view.n > 2 and sources:
+        betweenness *= float(view.n) / len(sources) / ((view.n - 1) * (view.n - 2))
+
+    return betweenness
+
+
+def ComputeStats(graph, metrics=None, mode='exact', samples=256, processes=1, seed=None, view=None):
+    '''
+    Function computes statistics of the undirected view of a graph. In exact mode every statistic is computed over
+    every node, which costs O(n*m) for closeness, path lengths, diameter, and betweenness. In approximate mode those
+    statistics (and clustering) are estimated from a random sample of nodes: closeness and clustering are averaged over
+    sampled nodes, the average shortest path length and diameter use searches from sampled nodes of the largest
+    connected component (the diameter is then a lower bound), and betweenness is accumulated over sampled pivots and
+    rescaled (Brandes and Pich, 2007). Searches are run by a pool of worker processes and are shared by the statistics
+    that use them.
+    :param graph: networkx graph or GraphLoader.CSRGraph
+    :param metrics: list of strings containing the statistics to compute (see METRICS; None computes all of them)
+    :param mode: string containing the mode ('exact' or 'approximate')
+    :param samples: integer representing the number of sampled nodes (approximate mode only)
+    :param processes: integer representing the number of worker processes
+    :param seed: integer used to seed the random sample
+    :param view: NetworkView of the graph (built when None; pass one to reuse it for several calls)
+    :return: dictionary where the keys are the statistics and the values are the results (betweenness is summarized by
+    its mean, maximum, and the nodes with the largest values)
+    '''
+    metrics = METRICS if metrics is None else metrics
+    unknown = [x for x in metrics if x not in METRICS]
+
+    if unknown:
+        raise ValueError('Unknown network statistics: ' + ', '.join(unknown))
 
-for i in [ddi_nets, ddi_owl]:
-    print 'Clustering Coefficient'
-    print nx.average_clustering(i.to_undirected())
+    if mode not in ['exact', 'approximate']:
+        raise ValueError('Mode must be "exact" or "approximate", not: ' + str(mode))
 
-    print 'Number of Connected Components'
-    print nx.number_connected_components(i.to_undirected())
+    view = NetworkView(graph) if view is None else view
+    samples = None if mode == 'exact' else samples
+    rng = random.Random(seed)
+    n, degree = view.n, view.degree
+    edges = (len(view.indices) - int(view.loops.sum())) / 2 + int(view.loops.sum())
+    stats = {}
 
-    print 'Average Network Closeness (Centrality)'
-    print sum(nx.closeness_centrality(i.to_undirected()).values())/len(nx.closeness_centrality(i.to_undirected()).values())
+    for metric in metrics:
+        if metric == 'nodes':
+            stats[metric] = n
 
-    print 'degree heterogeneity'
-    print float(np.mean(map(lambda x: x ** 2, i.to_undirected().degree().values()))) / (
-    (i.to_undirected().number_of_edges() * 2 /i.to_undirected().number_of_nodes()) ** 2)
+        elif metric == 'edges':
+            stats[metric] = edges
 
-    print 'Average number of neighbors'
-    print sum(nx.average_neighbor_degree(i.to_undirected()).values())
+        elif metric == 'density':
+            stats[metric] = 2.0 * edges / (n * (n - 1)) if n > 1 else 0.0
 
-    print 'Nodes'
-    print nx.number_of_nodes(i.to_undirected())
+        elif metric == 'average_degree':
+            stats[metric] = 2.0 * edges / n if n else 0.0
 
-    print 'edges'
-    print nx.number_of_edges(i.to_undirected())
+        elif metric == 'degree_heterogeneity':
+            stats[metric] = float(np.mean(degree.astype(float) ** 2) / np.mean(degree) ** 2) if edges else 0.0
 
-    print 'Density'
-    print nx.density(trem_nets.to_undirected())
+        elif metric == 'average_neighbor_degree':
+            neighbor_degree = np.bincount(view.sources, weights=degree[view.indices], minlength=n)
+            stats[metric] = float(np.mean(neighbor_degree / np.maximum(degree, 1))) if n else 0.0
 
-    print 'Number of cliques'
-    print len(nx.number_of_cliques(i.to_undirected()))
+        elif metric == 'assortativity':
+            x, y = degree[view.sources].astype(float), degree[view.indices].astype(float)
+            stats[metric] = float(np.corrcoef(x, y)[0, 1]) if len(x) > 1 and np.std(x) > 0 else float('nan')
 
-    print 'Average Degree'
-    print 2.0 * (len(i.to_undirected().edges())) / len(i.to_undirected().nodes())
+        elif metric == 'power_law':
+            stats[metric] = PowerLawFit(Histogram(degree))
 
-    print 'Average Degree Assortativity'
-    print nx.degree_assortativity_coefficient(i.to_undirected())
+        elif metric == 'components':
+            stats[metric] = int(view.Components().max()) + 1 if n else 0
 
-# things for only connected graphs
-ddi = max(nx.connected_component_subgraphs(ddi_nets.to_undirected()), key=len)
-print 'Network Diameter'
-nx.diameter(ddi.to_undirected())
+        elif metric == 'clustering':
+            undirected = view.Undirected()
+            nodes = None if samples is None else [view.name(x) for x in Sample(xrange(n), samples, rng)]
+            stats[metric] = nx.average_clustering(undirected, nodes) if n else 0.0
 
-print 'Shorest paths (sum)'
-sum(nx.all_pairs_shortest_path_length(ddi_owl.to_undirected()).values()[0].values())
+        elif metric == 'cliques':
+            stats[metric] = sum(1 for _ in nx.find_cliques(view.Undirected()))
 
-print 'Average shortest_path (Characteristic path length)'
-nx.average_shortest_path_length(ddi_owl.to_undirected())
+        elif metric == 'closeness':
+            closeness = []
+            for reached, total, _ in view.Paths(Sample(xrange(n), samples, rng), processes):
+                closeness.append((reached - 1.0) ** 2 / (total * (n - 1)) if total > 0 and n > 1 else 0.0)
+            stats[metric] = float(np.mean(closeness)) if closeness else 0.0
 
-ddi_owl_nodes = ddi_owl.nodes()
-## CCDF with power-law fit
-trem_owl_freq = Counter(nx.degree(trem_owl.to_undirected()).values()).values()
-trem_nets_freq = Counter(nx.degree(trem_nets.to_undirected()).values()).values()
-ddi_owl_freq = np.sort(Counter(list(nx.degree(ddi_owl.to_undirected()).values())).values())
-ddi_nets_freq = np.sort(Counter(list(nx.degree(ddi_nets.to_undirected()).values())).values())
+        elif metric in ['average_shortest_path_length', 'diameter']:
+            component = view.LargestComponent()
+            paths = view.Paths(Sample(component, samples, rng), processes)
 
+            if metric == 'diameter':
+                stats[metric] = max([x[2] for x in paths]) if paths else 0
+            else:
+                pairs = len(paths) * (len(component) - 1)
+                stats[metric] = float(sum([x[1] for x in paths])) / pairs if pairs else 0.0
 
-nx.degree(trem_owl.to_undirected()).values()
+        elif metric == 'betweenness':
+            betweenness = Betweenness(view, Sample(xrange(n), samples, rng), processes)
+            top = np.argsort(-betweenness, kind='mergesort')[:10]
+            stats[metric] = {'mean': float(np.mean(betweenness)) if n else 0.0,
+                             'max': float(np.max(betweenness)) if n else 0.0,
+                             'top': [[view.name(x), float(betweenness[x])] for x in top]}
 
-fit1 = powerlaw.Fit(nx.degree(trem_owl.to_undirected()).values(), discrete = True)
-fit2 = powerlaw.Fit(nx.degree(trem_nets.to_undirected()).values(), discrete = True)
+    return stats
 
-fit1 = powerlaw.Fit(nx.degree(ddi_owl.to_undirected()).values(), discrete = True)
-fit2 = powerlaw.Fit(nx.degree(ddi_nets.to_undirected()).values(), discrete = True)
 
-fig2 = fit1.plot_ccdf(color='mediumaquamarine', linewidth=2)
-fit1.power_law.plot_ccdf(color='mediumaquamarine', linestyle='--', ax=fig2)
-fit2.plot_ccdf(color='m', linewidth=2, ax=fig2)
-fit2.power_law.plot_ccdf(color='m', linestyle='--', ax=fig2)
+# name of ComputeStats used by callers of the statistics engine
+compute_stats = ComputeStats
 
-fig2.legend(['OWL CCDF',
-             'OWL CCDF Power-Law Fit',
-             'OWL-NETS CCDF',
-             'OWL-NETS CCDF Power-Law Fit'],loc='lower left', fontsize=14, numpoints=1)
-#
-# from mpl_toolkits.axes_grid.inset_locator import inset_axes
-# fig2in = inset_axes(fig2, width="30%", height="30%", loc=3)
-# fig2in.hist(nx.degree(ddi_owl).values(), bins = 5000, normed = True, color='deepskyblue')
-# fig2in.set_xlim(0, 100)
-#
-# fig2in.hist(nx.degree(ddi_nets).values(), bins = 50, normed = True, color='red', alpha = 0.65)
-# # fig2in.set_xlim(0, 0.1)
-# fig2in.set_xticks([])
-# fig2in.set_yticks([])
 
-fig2.patch.set_facecolor('whitesmoke')
-fig2.set_xlabel(r'Degree $k$', fontsize=16)
-fig2.set_ylabel(r'$P(K \geq k)$', fontsize=16)
-fig2.grid(True, color='black')
-fig2.tick_params(axis='both', which='major', labelsize=14)
-fig2.tick_params(axis='both', which='minor', labelsize=14)
-# plt.ylim(0.01, 1.01)
-# plt.xlim(0.98, 31622)
-plt.tight_layout()
-plt.savefig("Results/DDI_reactome/DDI_degreeDistribution.png", dpi=600)  # save plot
+def MostImportant(graph, betweenness):
+    '''
+    Function returns a copy of a graph with only its most important nodes, those whose betweenness centrality is at
+    least three times the mean.
+    :param graph: networkx graph
+    :param betweenness: dictionary where the keys are nodes and the values are their betweenness centrality
+    :return: networkx graph
+    '''
+    threshold = 3 * sum(betweenness.values()) / len(betweenness)
+
+    return graph.subgraph([node for node, value in betweenness.items() if value >= threshold])
 
 
+def StreamDegrees(edges, nodes=None, directed=True, chunk=1000000):
+    '''
+    Function counts the degree of every node from a stream of edges without building a graph. Node names are numbered
+    as they are first seen and the edges are counted in chunks with numpy.bincount, so only the degree arrays and the
+    node numbering are kept in memory.
+    :param edges: iterable of tuples where tuple[0] is the source node and tuple[1] is the target node
+    :param nodes: list of nodes which are numbered first (so that nodes without edges have a degree of 0)
+    :param directed: boolean indicating whether in-degree and out-degree are counted separately
+    :param chunk: integer representing the number of edges counted at once
+    :return: dictionary where the keys are 'in', 'out', and 'total' ('total' only for an undirected graph) and the values
+    are numpy arrays of integers, one degree per node (self-loops are counted twice in the total)
+    '''
+    index = dict(zip(nodes or [], xrange(len(nodes or []))))
+    number = lambda x: index.setdefault(x, len(index))
+    out_degree, in_degree = np.zeros(len(index), dtype=np.int64), np.zeros(len(index), dtype=np.int64)
+    edges = iter(edges)
+
+    while True:
+        pairs = np.array([(number(u), number(v)) for u, v in islice(edges, chunk)], dtype=np.int64).reshape(-1, 2)
 
-# create degree distribution plots
-plot_res = []
-for r in [trem_owl, trem_nets, ddi_owl, ddi_nets]:
-    # #get counts of node occurrence in target list
-    degree = Counter(list(nx.degree(r.to_undirected()).values())).values()  # for r = 1
+        if not len(pairs):
+            break
 
-    # update indegree to include a value of zero for nodes not in target list
-    pdf = np.sort(degree)
-    cdf = np.arange(len(pdf)) / float(len(pdf))
-    ccdf = 1 - cdf
-    plot_res.append([pdf, ccdf])
+        out_degree = Accumulate(out_degree, pairs[:, 0], len(index))
+        in_degree = Accumulate(in_degree, pairs[:, 1], len(index))
 
-# generate plot
-plt1, = plt.loglog(plot_res[2][0], plot_res[2][1], '.', color='turquoise', markersize=12, alpha=0.75)
-plt2, = plt.loglog(plot_res[0][0], plot_res[0][1], '.', color='turquoise', markersize=12, alpha=0.75)
-plt3, = plt.loglog(plot_res[3][0], plot_res[3][1], '.', color='red', markersize=12, alpha=0.75)
-plt4, = plt.loglog(plot_res[1][0], plot_res[1][1], '.', color='lime', markersize=12)
+    out_degree = np.concatenate([out_degree, np.zeros(len(index) - len(out_degree), dtype=np.int64)])
+    in_degree = np.concatenate([in_degree, np.zeros(len(index) - len(in_degree), dtype=np.int64)])
 
+    if directed:
+        return {'in': in_degree, 'out': out_degree, 'total': in_degree + out_degree}
 
-plt.legend([plt1, plt3], ['OWL Representation', 'OWL-NETS'],
-           loc='upper right', fontsize=12, numpoints=1)
+    return {'total': in_degree + out_degree}
 
-plt.legend([plt2, plt4], ['OWL Representation', 'OWL-NETS'],
-           loc='upper right', fontsize=12, numpoints=1)
 
-plt.xlabel(r'Degree $k$', fontsize=12)
-plt.ylabel(r'$Pr(k)$', fontsize=12)
-plt.grid(True, color='black')
-plt.ylim(0.01, 1.01)
-plt.xlim(0.98, 31622)
-plt.tight_layout()
-plt.savefig("Network_visualizations/Tram_degreeDistribution.png", dpi=600)  # save plot
-# save plot
+def Accumulate(degree, nodes, n):
+    '''
+    Function adds the number of times each node occurs to an array of degrees, extending the array to n nodes.
+    :param degree: numpy array of integers storing the degrees counted so far
+    :param nodes: numpy array of integers representing the nodes
+    :param n: integer representing the number of nodes numbered so far
+    :return: numpy array of integers storing the updated degrees
+    '''
+    counts = np.bincount(nodes, minlength=n)
+    counts[:len(degree)] += degree
 
+    return counts
 
-## Betweenness
 
-def most_important(G):
+def DegreeArrays(graph):
     '''
-    returns a copy of G with the most important nodes according to the pagerank
+    Function returns the degree of every node of a graph. CSR graphs and edge arrays are counted without a Python loop
+    over the nodes or edges.
+    :param graph: networkx graph, GraphLoader.CSRGraph, numpy array of integer edges (one row per edge), or iterable of
+    edges (e.g., ReadEdgeList)
+    :return: dictionary where the keys are 'in', 'out', and 'total' ('total' only for an undirected graph) and the values
+    are numpy arrays of integers, one degree per node (self-loops are counted twice in the total)
     '''
-    ranking = nx.betweenness_centrality(G).items()
-    print ranking
+    if isinstance(graph, GraphLoader.CSRGraph):
+        out_degree = np.diff(np.asarray(graph.indptr)).astype(np.int64)
 
-    r = [x[1] for x in ranking]
-    m = sum(r) / len(r)  # mean centrality
-    t = m * 3  #threshold
-    Gt = G.copy()
+        if graph.undirected:
+            sources = np.repeat(np.arange(len(graph)), out_degree)
+            return {'total': out_degree + np.bincount(sources[sources == graph.indices], minlength=len(graph))}
 
-    # threshold, we keep only the nodes with 3 times the mean
-    for k, v in ranking:
-        if v < t:
-            Gt.remove_node(k)
+        in_degree = np.asarray(graph.indegree).astype(np.int64)
+        return {'in': in_degree, 'out': out_degree, 'total': in_degree + out_degree}
 
-    return Gt
+    if isinstance(graph, np.ndarray):
+        n = int(graph.max()) + 1 if graph.size else 0
+        in_degree, out_degree = np.bincount(graph[:, 1], minlength=n), np.bincount(graph[:, 0], minlength=n)
+        return {'in': in_degree, 'out': out_degree, 'total': in_degree + out_degree}
 
-G = graph.to_undirected()
-G=owl.to_undirected()
-Gt = most_important(G) # trimming
+    if isinstance(graph, nx.Graph):
+        return StreamDegrees(graph.edges_iter(), graph.nodes(), graph.is_directed())
 
-Gt.nodes(data = True)
+    return StreamDegrees(graph)
 
-# create the layout
-pos = nx.spring_layout(G)
-# draw the nodes and the edges (all)
-nx.draw_networkx_nodes(G,pos,node_color='b',alpha=0.3,node_size=50)
-nx.draw_networkx_edges(G,pos,alpha=0.1)
 
-# draw the most important nodes with a different style
-nx.draw_networkx_nodes(Gt,pos,node_color='r',alpha=0.4,node_size=200)
+def ReadEdgeList(location):
+    '''
+    Function streams the edges of an edge list written by GraphWriter.WriteEdgeList (optionally gzip compressed).
+    :param location: string containing the file path/name of the edge list
+    :return: generator of tuples where tuple[0] is the source node and tuple[1] is the target node
+    '''
+    with (gzip.open(location, 'rb') if location.endswith('.gz') else open(location, 'rb')) as infile:
+        for line in infile:
+            fields = line.split('\t', 2)
+            yield fields[0], fields[1].rstrip('\r\n')
+
+
+def Histogram(degree):
+    '''
+    Function returns the degree histogram of a graph.
+    :param degree: numpy array of integers, one degree per node
+    :return: numpy array of integers where element k is the number of nodes of degree k
+    '''
+    return np.bincount(degree) if len(degree) else np.zeros(1, dtype=np.int64)
+
+
+def CCDF(histogram):
+    '''
+    Function returns the complementary cumulative distribution (CCDF) of the non-zero degrees in a histogram, computed
+    from the histogram rather than from sorted per-node degrees.
+    :param histogram: numpy array of integers where element k is the number of nodes of degree k
+    :return: a list where list[0] is a numpy array of the distinct non-zero degrees k and list[1] is a numpy array of
+    the fraction of nodes with a degree of at least k
+    '''
+    degrees = np.flatnonzero(histogram[1:]) + 1
+    counts = histogram[degrees].astype(float)
+
+    return [degrees, counts[::-1].cumsum()[::-1] / counts.sum()]
+
+
+def PowerLawFit(histogram, xmin=None):
+    '''
+    Function fits a discrete power law to the non-zero degrees in a histogram. The estimate follows powerlaw.Fit with
+    discrete=True (Clauset et al., 2009): for each candidate xmin the exponent is alpha = 1 + n / sum(ln(k / (xmin -
+    0.5))) over the n degrees k >= xmin, and the xmin whose fit has the smallest Kolmogorov-Smirnov distance to the data
+    is chosen. Every sum runs over the distinct degrees weighted by their counts, so the cost depends on the number of
+    distinct degrees rather than the number of nodes.
+    :param histogram: numpy array of integers where element k is the number of nodes of degree k
+    :param xmin: integer representing a fixed lower bound of the power law (None searches every distinct degree)
+    :return: dictionary storing the exponent (alpha), its standard error (sigma), xmin, the Kolmogorov-Smirnov
+    distance (D), and the number of degrees in the tail (n_tail)
+    '''
+    degrees = np.flatnonzero(histogram[1:]) + 1
+    counts = histogram[degrees].astype(float)
+
+    # fraction of degrees smaller than each distinct degree, and the count and log-sum of the degrees above it
+    below = (counts.cumsum() - counts) / counts.sum() if len(counts) else counts
+    tail = counts[::-1].cumsum()[::-1]
+    log_tail = (counts * np.log(degrees))[::-1].cumsum()[::-1]
+
+    best = None
+    for candidate in ([xmin] if xmin is not None else degrees[:-1]):
+        start = np.searchsorted(degrees, candidate)
+
+        if start == len(degrees):
+            continue
+
+        n = tail[start]
+        alpha = 1.0 + n / (log_tail[start] - n * np.log(candidate - 0.5))
+
+        if n < 2:
+            distance = float('nan')
+        else:
+            scale = zeta(alpha, candidate)
+            theoretical = 1.0 - zeta(alpha, degrees[start:]) / scale if 1.0 - scale != 1.0 else 1.0
+            empirical = (below[start:] - below[start]) / (1.0 - below[start])
+            distance = np.max(np.abs(theoretical - empirical))
+
+        if best is None or distance < best['D']:
+            best = {'alpha': float(alpha), 'sigma': float((alpha - 1.0) / np.sqrt(n)), 'xmin': int(candidate),
+                    'D': float(distance), 'n_tail': int(n)}
+
+    return best or {'alpha': float('nan'), 'sigma': float('nan'), 'xmin': None, 'D': float('nan'), 'n_tail': 0}
+
+
+def DegreeDistribution(graph, xmin=None):
+    '''
+    Function summarizes the in-degree, out-degree, and total degree distributions of a graph by their histograms and
+    power-law fits.
+    :param graph: networkx graph, GraphLoader.CSRGraph, numpy array of integer edges, or iterable of edges
+    :param xmin: integer representing a fixed lower bound of the power laws (None searches every distinct degree)
+    :return: dictionary where the keys are 'in', 'out', and 'total' ('total' only for an undirected graph) and the values
+    are dictionaries storing the distinct degrees, the number of nodes with each degree, and the power-law fit
+    '''
+    distribution = {}
+
+    for key, degree in DegreeArrays(graph).items():
+        histogram = Histogram(degree)
+        degrees = np.flatnonzero(histogram)
+        distribution[key] = {'degrees': degrees.tolist(), 'counts': histogram[degrees].tolist(),
+                             'power_law': PowerLawFit(histogram, xmin)}
+
+    return distribution
+
+
+def PlotDegreeDistribution(histograms, labels, output):
+    '''
+    Function plots the complementary cumulative degree distribution (CCDF) of each histogram with its power-law fit.
+    :param histograms: list of numpy arrays of integers where element k is the number of nodes of degree k
+    :param labels: list of strings containing the legend label of each histogram
+    :param output: file path and name where the plot should be saved
+    :return: string containing the file path and name of the plot
+    '''
+    # plotting dependencies are only needed by this function
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    figure, legend = plt.gca(), []
+    for histogram, label, color in zip(histograms, labels, ['mediumaquamarine', 'm', 'turquoise', 'red']):
+        degrees, ccdf = CCDF(histogram)
+        fit = PowerLawFit(histogram)
+        figure.loglog(degrees, ccdf, color=color, linewidth=2)
+
+        # power law of the tail, scaled by the fraction of nodes in the tail
+        tail = degrees[degrees >= fit['xmin']]
+        figure.loglog(tail, zeta(fit['alpha'], tail) / zeta(fit['alpha'], fit['xmin']) * ccdf[degrees >= fit['xmin']][0],
+                      color=color, linestyle='--')
+        legend.extend([label + ' CCDF', label + ' CCDF Power-Law Fit'])
+
+    figure.legend(legend, loc='lower left', fontsize=14, numpoints=1)
+    figure.patch.set_facecolor('whitesmoke')
+    figure.set_xlabel(r'Degree $k$', fontsize=16)
+    figure.set_ylabel(r'$P(K \geq k)$', fontsize=16)
+    figure.grid(True, color='black')
+    figure.tick_params(axis='both', which='both', labelsize=14)
+    plt.tight_layout()
+    plt.savefig(output, dpi=600)
+    plt.close()
+
+    return output
+
+
+def LoadNetwork(location):
+    '''
+    Function reads a network from an OWL-NETS json file, a GML file, an edge list written by GraphWriter.WriteEdgeList,
+    or CSR files written by GraphLoader.WriteCSR.
+    :param location: string containing the file path/name of the network (the prefix for CSR files)
+    :return: networkx graph or GraphLoader.CSRGraph
+    '''
+    if os.path.isfile(location + '.meta'):
+        return GraphLoader.LoadCSR(location)
+
+    if location.endswith('.json'):
+        return GraphLoader.LoadGraph(location)[1]
+
+    if location.endswith('.edgelist') or location.endswith('.edgelist.gz'):
+        return nx.read_edgelist(location, delimiter='\t', create_using=nx.DiGraph())
+
+    return nx.read_gml(location)
+
+
+def WriteStats(stats, output):
+    '''
+    Function writes network statistics to a JSON file.
+    :param stats: dictionary where the keys are networks (or statistics) and the values are their results
+    :param output: file path and name where the statistics should be written
+    :return: string containing the file path and name of the statistics
+    '''
+    with open(output, 'w') as outfile:
+        json.dump(stats, outfile, indent=2, sort_keys=True)
 
+    return output
 
-# also the labels this time
-labels = nx.get_node_attributes(Gt, 'type')
-nx.draw_networkx_labels(Gt,pos,labels,font_size=5,font_color='black')
-plt.axis('off')
-plt.tight_layout()
-plt.savefig("Network_visualizations/Trem_betweeness_importance_NETS.png", dpi=1000)
 
-res = []
-count1 = 0
-count2 = 0
-count3 = 0
-count4 = 0
-for i in ddi.to_undirected().edges(data =True):
-    if i[2]['nice'] == ['drug1_ice', 'target_ice']:
-        count1 += 1
+def main():
+    parser = argparse.ArgumentParser(description='Computes statistics which characterize OWL-NETS networks.')
+    parser.add_argument('networks', nargs='+',
+                        help='network files (OWL-NETS .json, .gml, .edgelist, or a CSR file prefix)')
+    parser.add_argument('-m', '--metrics', nargs='+', choices=METRICS, default=None,
+                        help='statistics to compute (default: all)')
+    parser.add_argument('-a', '--approximate', action='store_true',
+                        help='estimate path, centrality, and clustering statistics from sampled nodes')
+    parser.add_argument('-s', '--samples', type=int, default=256, help='number of sampled nodes (default: 256)')
+    parser.add_argument('-p', '--processes', type=int, default=multiprocessing.cpu_count(),
+                        help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('-r', '--seed', type=int, default=None, help='seed of the node sample')
+    parser.add_argument('-d', '--distribution', action='store_true',
+                        help='also write the in/out/total degree distributions and their power-law fits')
+    parser.add_argument('-o', '--output', default='network_statistics.json', help='JSON file the results are written to')
+    args = parser.parse_args()
 
-    if i[2]['nice'] == ['pathway_target_ice', 'drug2_ice']:
-        count2 += 1
+    results = {}
+    for location in args.networks:
+        print 'Computing statistics for: ' + location
+        graph = LoadNetwork(location)
+        stats = ComputeStats(graph, args.metrics, 'approximate' if args.approximate else 'exact', args.samples,
+                             args.processes, args.seed)
 
-    if i[2]['nice'] == ['target_ice', 'pathway_ice']:
-        count3 += 1
+        for metric in [x for x in METRICS if x in stats]:
+            print metric + ': ' + str(stats[metric])
+        print '\n'
 
-    if i[2]['nice'] == ['pathway_ice', 'pathway_target_ice']:
-        count4 += 1
+        if args.distribution:
+            stats['degree_distribution'] = DegreeDistribution(graph)
 
+        results[location] = stats
 
+    print 'Statistics written to: ' + WriteStats(results, args.output)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
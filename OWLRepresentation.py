@@ -1,29 +1,29 @@
 #######################################
 # OWLRepresentation.py
 # Purpose: script creates an OWL graph
-# version 1.2.0
-# date: 07.17.2017
+# version 1.3.0
+# date: 10.19.2026
 ########################################
 
 
 ## import module/script dependencies
 from datetime import datetime
-import json
+import multiprocessing
 import networkx as nx
-import os
 from progressbar import ProgressBar, FormatLabel, Percentage, Bar
+import GraphWriter
+import Instrumentation
 import QueryParser
 import NETSRepresentation
-import QueryRunner
 
 
 
 def OWLGraph(results, updated_query_text):
     '''
-    Function takes query results (JSON format) and a list of lists, where list[0] contains query select statement and
+    Function takes query results (BindingTable) and a list of lists, where list[0] contains query select statement and
     list[1] contains query body and creates a graph where each subject and object in the triple are the nodes and the
     edges represents the predicates connecting these nodes. Each edge has an edge attribute that contains the triple
-    :param results: json file containing the query results from endpoint
+    :param results: BindingTable containing the query results from endpoint
     :param triples: list of lists, where list[0] contains query select statement and list[1] contains query body
     :return: OWL representation as a directed graph object
     '''
@@ -31,29 +31,35 @@ def OWLGraph(results, updated_query_text):
 
     # initialize progress bar progress bar
     widgets = [Percentage(), Bar(), FormatLabel('(elapsed: %(elapsed)s)')]
-    pbar = ProgressBar(widgets=widgets, maxval=len(results['results']['bindings']))
+    pbar = ProgressBar(widgets=widgets, maxval=len(results))
 
     # re-format variables
     select = [x.split('?')[-1].strip(')') if x.startswith('(') else x.strip('?') for x in updated_query_text[0]]
 
+    # columns storing the codes of the subject and object of each triple
+    pool = results.pool
+    columns = []
+    for row in updated_query_text[1]:
+        row0 = [row[0].split(':')[1].strip('?') if ':' in row[0] else row[0]][0].strip('?')
+        row2 = [row[2].split(':')[1].strip('?') if ':' in row[2] else row[2]][0].strip('?')
+        columns.append((row0, row2, results.Column(row0), results.Column(row2), str(row[1].encode('utf8')),
+                        '-'.join([str(x.encode('utf8')) for x in row])))
+
     # creates an empty directed graph
     graph = nx.DiGraph()
 
-    for res in pbar(results['results']['bindings']):
+    for i in pbar(xrange(len(results))):
 
-        for row in updated_query_text[1]:
-            row0 = [row[0].split(':')[1].strip('?') if ':' in row[0] else row[0]][0].strip('?')
-            row2 = [row[2].split(':')[1].strip('?') if ':' in row[2] else row[2]][0].strip('?')
+        for row0, row2, subject, obj, predicate, triple in columns:
+            s = pool[subject[i]]
+            o = pool[obj[i]]
 
             # add nodes
-            graph.add_node(str(res[row0]['value'].encode('utf8')), type=row0)
-            graph.add_node(str(res[row2]['value'].encode('utf8')), type=row2)
+            graph.add_node(s, type=row0)
+            graph.add_node(o, type=row2)
 
             # add edges
-            graph.add_edge(str(res[row0]['value'].encode('utf8')),
-                           str(res[row2]['value'].encode('utf8')),
-                           predicate = str(row[1].encode('utf8')),
-                           triple='-'.join([str(x.encode('utf8')) for x in row]))
+            graph.add_edge(s, o, predicate=predicate, triple=triple)
 
     # close progress bar
     pbar.finish()
@@ -62,11 +68,9 @@ def OWLGraph(results, updated_query_text):
 
     # CHECK - verify we have included all of the nodes
     graph_res = []
-    for res in results['results']['bindings']:
-        for node in res.keys():
-            if node in select:
-                node = str(res[node]['value'].encode('utf8'))
-                graph_res.append(node)
+    for node in results.variables:
+        if node in select:
+            graph_res.extend([pool[x] for x in set(results.Column(node)) if x])
 
     if set(graph_res) != set(graph.nodes()):
         raise ValueError('Number of graph nodes do not match json results')
@@ -79,66 +83,80 @@ def OWLGraph(results, updated_query_text):
         return graph
 
 
-def OWLNetworkBuilder(input1):
+def OWLNetworkBuilder(input1, profiler=None, authentication='SPARQL_Queries/authentication',
+                      compress=False, edgelist=False, cache=None):
     '''
     Function takes several strings as arguments from the user and with them generates an OWL representation network.
+    The time, memory, and item counts for each stage of the build are recorded and written to a report next to the
+    network file.
     :param input1: string containing file path/name for SPARQL query
+    :param profiler: Instrumentation.PipelineProfiler used to record each stage (a new one is created if None)
+    :param authentication: string containing file path/name for the endpoint authentication file (format: url, user,
+    password)
+    :param compress: boolean indicating whether the GML file should be gzip compressed
+    :param edgelist: boolean indicating whether a tab-delimited edge list is also written (formatted in parallel)
+    :param cache: QueryCache.QueryCache instance storing the query analysis (see NETSRepresentation.AnalysisCache; None
+    uses no cache)
+    :return: the PipelineProfiler containing the stage records
     '''
 
     print str('Started building OWL Representation Network: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
-    # parse query and return triples
-    query_text = QueryParser.QueryParser(input1)
-
-    # create a graph representation of query
-    graph = NETSRepresentation.GraphMaker(query_text[0])
-
-    ## NETS NODES
-    # will return a list of NETS nodes
-    NETS_nodes = NETSRepresentation.NETSNodeFinder(graph)
+    if profiler is None:
+        profiler = Instrumentation.PipelineProfiler()
 
-    ## NETS EDGES
-    # create sub-graph from graph with NETS_nodes and nodes with out degree > 0
-    keep = [node for node in graph.nodes() if graph.out_degree(node) > 0 or node in NETS_nodes]
-    sub_graph = graph.subgraph(keep)
+    # parse query and return triples
+    with profiler.Stage('QueryParser') as stage:
+        query_text = QueryParser.QueryParser(input1)
+        stage['triples'] = len(query_text[0])
 
-    # get NETS edges and maintains order specified in query
-    NETS_edges = NETSRepresentation.NETSEdgeFinder(NETS_nodes, sub_graph)
+    # create a graph representation of query and find the NETS nodes and NETS edges (shared with NETSNetworkBuilder)
+    graph, sub_graph, NETS_nodes, NETS_edges, _ = NETSRepresentation.QueryAnalysis(query_text[0], profiler, cache)
 
     # get edge metadata
-    NETS_edge_metadata = NETSRepresentation.EdgeMetadata(graph, sub_graph, NETS_edges)
+    with profiler.Stage('EdgeMetadata'):
+        NETS_edge_metadata = NETSRepresentation.EdgeMetadata(graph, sub_graph, NETS_edges)
 
     # update query text
-    updated_query_text = QueryParser.NETSQueryParser(query_text, NETS_nodes, NETS_edge_metadata)
+    with profiler.Stage('NETSQueryParser'):
+        updated_query_text = QueryParser.NETSQueryParser(query_text, NETS_nodes, NETS_edge_metadata)
 
     ## QUERY ENDPOINT
-    # authentication file (format: url, user, password) - should be placed in same user directory as query
-    authentication = 'SPARQL_Queries/authentication'
-
-    # look to see if results already exist (if OWL-NETS was previously run)
-    if str(input1.split('/')[-1]) + '_results.json' in os.listdir(''.join(str(input1.split('/')[-2]) + '/')):
-        print 'Using existing query results'
-        with open(input1.rpartition(".")[-1] + "_results.json") as json_data:
-            results = json.load(json_data)
-    else:
-        print 'Generating new query results'
-
-        # run query
-        results = QueryRunner.RunQuery(updated_query_text[0], authentication)
-
-        # export results to json file
-        with open(str(input1.rpartition(".")[-1] + "_results.json") + '_results.json', 'w') as outfile:
-            json.dump(results, outfile)
+    # load cached results, reuse the results of an equivalent query, or run the query
+    results = NETSRepresentation.QueryResults(input1, query_text, updated_query_text, profiler, authentication, cache)
 
     # with open('Query_Data/DDI_reactome_query_results.json') as json_data:
     #     results = json.load(json_data)
 
     ## NETWORK POPULATION
-    OWL_graph = OWLGraph(results, updated_query_text[3:])
+    with profiler.Stage('OWLGraph') as stage:
+        OWL_graph = OWLGraph(results, updated_query_text[3:])
+        stage['bindings'] = len(results)
+        stage['nodes'] = len(OWL_graph.nodes())
+        stage['edges'] = len(OWL_graph.edges())
 
     # write graphs to gml and JSON files
     # input2 = 'Network_Data/Angiogenesis_query_OWL'
     # nx.write_gml(OWL_graph, str(input2) + '_network.gml')
-    nx.write_gml(OWL_graph, str(input1.rpartition(".")[-1] + "_OWL") + '_network.gml')
+    output = str(input1.rpartition(".")[-1] + "_OWL")
+
+    with profiler.Stage('WriteGML') as stage:
+        GraphWriter.WriteGML(OWL_graph, output + '_network.gml', compress)
+        stage['nodes'] = len(OWL_graph.nodes())
+        stage['edges'] = len(OWL_graph.edges())
+
+    if edgelist:
+        with profiler.Stage('WriteEdgeList') as stage:
+            GraphWriter.WriteEdgeList(OWL_graph, output + '_network.edgelist', multiprocessing.cpu_count(), compress)
+            stage['edges'] = len(OWL_graph.edges())
+
+    # write stage report (and cProfile stats for the hottest stage when profiling)
+    profiler.Summary()
+    print 'Stage report written to: ' + profiler.WriteReport(output + '_profile')
+
+    if profiler.profile:
+        print 'Profile of hottest stage written to: ' + str(profiler.DumpProfile(output + '_profile.prof'))
+
+    print str('Finished building OWL Representation network: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S')) + '\n'
 
-    print str('Finished building OWL Representation network: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S')) + '\n'
\ No newline at end of file
+    return profiler
@@ -1,150 +1,172 @@
 #################################################
 # OWL_NETS.py
 # Purpose: primary script for OWL-NETS method
-# version 1.2.2
-# date: 07.20.2017
+# version 1.3.1
+# date: 10.19.2026
 ###############################################
 
 
 ## import module/script dependencies
-import argparse
-import tkFileDialog
-from Tkinter import *
-import tkMessageBox
-import NETSRepresentation
-import OWLRepresentation
+import time
 
+# time the script started (before any other module is imported)
+START = time.time()
 
+import argparse
+import os
+import shutil
+import sys
+import tempfile
 
-class ProgramGUI:
-    def __init__(self, master):
-        self.master = master
-        master.title("OWL-NETS") # window title
+# the network builders, endpoint client, and GUI are imported when the chosen mode needs them, so that --help and
+# short batch jobs do not pay for importing networkx, requests, or Tk
 
-        self.label = Label(master, text='\n' + 'OWL-NETS: NEtwork Entity Transformation for Statistical learning' + '\n')
-        self.label.grid(row = 0, columnspan = 3, sticky=N+W)
 
-        # buttons
-        self.button_go= Button(master, text="Go", command=self.ButtonGoCall)
-        self.button_go.grid(row=1, column=0)
+# startup of the run, added to the report of the first network built (see Startup)
+STARTUP = {}
 
-        self.browse_button = Button(master, text="Browse", command=self.ButtonBrowseCall)
-        self.browse_button.grid(row=1, column=1)
 
-        self.close_button = Button(master, text="Exit", command=master.quit)
-        self.close_button.grid(row=1, column=2)
 
-        # check-box
-        self.var1 = IntVar()
-        self.check1 = Checkbutton(master, text="OWL-NETS Network", variable=self.var1, command = self.Checkbutton1)
-        self.check1.grid(row=3, column = 0)
+def InputParser():
+    ''' Function parses the input information if the user chooses to run the program via the command line '''
 
-        self.var2 = IntVar()
-        self.check2 = Checkbutton(master, text="OWL Network      ", variable=self.var2, command=self.Checkbutton2)
-        self.check2.grid(row=3, column=2)
+    parser = argparse.ArgumentParser(
+        description='OWL-NETS: NEtwork Entity Transformation for Statistical Learning. For program to run correctly the '
+                    'input arguments must be formatted as shown below.')
+    parser.add_argument('-a', '--input', nargs='+',
+                        help='name/path to SPARQL query file(s) (e.g., Folder/Query1_query); queries are run in order')
+    parser.add_argument('-b', '--owl', help='type "owl" to generate OWL representation')
+    parser.add_argument('-c', '--nets', help='type "owl-nets" to generate OWL-NETS representation')
+    parser.add_argument('-d', '--both', help='type "both" to generate both representations')
+    parser.add_argument('-e', '--profile', action='store_true',
+                        help='dump cProfile stats for the slowest pipeline stage next to the network files')
+    parser.add_argument('-f', '--report', choices=['json', 'csv'], default='json',
+                        help='format of the pipeline stage timing report (default: json)')
+    parser.add_argument('-g', '--authentication', default='SPARQL_Queries/authentication',
+                        help='name/path to endpoint authentication file (default: SPARQL_Queries/authentication)')
+    parser.add_argument('-i', '--stream', action='store_true',
+                        help='parse query results as they are read from the endpoint')
+    parser.add_argument('-j', '--results-format', choices=['json', 'tsv', 'csv'], default='json',
+                        help='format query results are requested in from the endpoint (default: json)')
+    parser.add_argument('-k', '--compress', action='store_true', help='gzip compress the GML network files')
+    parser.add_argument('-l', '--edgelist', action='store_true',
+                        help='also write each network as a tab-delimited edge list')
+    parser.add_argument('-m', '--cache', default=None,
+                        help='directory storing query analysis results for reuse by later runs (default: no cache)')
 
-        # value entry
-        self.entry = Entry(master, width=50)
-        self.entry.grid(row = 2, columnspan = 3, sticky=N+W)
 
-        # add message to bottom of window
-        self.statusText = StringVar(master)
-        self.statusText.set('\n' + 'To get started, please press Browse or enter the path/name to your query, '
-                            'choose which kind of network you would like to build, then press Go' + '\n')
+    return parser
 
-        self.message = Label(master, textvariable=self.statusText, wraplength=375, justify = CENTER)
-        self.message.grid(row = 5, columnspan = 3)
 
+def Startup():
+    '''
+    Function measures the startup of a command line run: the time from the start of the process (from the start of this
+    script where the start of the process is not available) until the arguments are parsed and the modules needed by
+    the chosen mode are imported. The measurement is printed and stored in STARTUP.
+    :return: dictionary storing the wall time, CPU time, and peak RSS of the startup
+    '''
+    import Instrumentation
 
-    # define button functionality
-    def ButtonGoCall(self):
-        '''Function stores the functionality for the 'GO' button '''
-        val_check = self.Validate()  # check to make sure that input was provided
+    STARTUP.update(wall_time=time.time() - (Instrumentation.ProcessStart() or START), cpu_time=Instrumentation.CPUTime(),
+                   peak_rss_delta=Instrumentation.PeakRSS())
 
-        # if func is correct return 0
-        if val_check != 0:
-            return
+    print 'Startup: {0:.3f}s wall, {1:.3f}s cpu, {2:.1f}MB peak rss'.format(STARTUP['wall_time'], STARTUP['cpu_time'],
+                                                                          STARTUP['peak_rss_delta'])
 
-        input_file = self.entry.get()
-        # output = self.GetOutputName(input_file)
+    return STARTUP
 
-        # run program
-        if self.Checkbutton1() == 1:
-            NETSRepresentation.NETSNetworkBuilder(input_file)
 
-        if self.Checkbutton2() == 1:
-            OWLRepresentation.OWLNetworkBuilder(input_file)
+def Profiler(args):
+    '''Function creates a pipeline profiler for a single network build from the command line arguments '''
+    import Instrumentation
 
-        self.Complete()
+    profiler = Instrumentation.PipelineProfiler(profile=args.profile, report_format=args.report)
 
+    # the startup of the run is reported once, with the first network built
+    if STARTUP:
+        profiler.Record('Startup', **STARTUP)
+        STARTUP.clear()
 
-    def ButtonBrowseCall(self):
-        '''Function stores the functionality for the 'Browse' button '''
-        filename = tkFileDialog.askopenfilename()
-        self.entry.delete(0, END)
-        self.entry.insert(0, filename)
+    return profiler
 
-    def Checkbutton1(self):
-        '''Function stores the functionality for the NETS network checkbutton'''
-        if (self.var1.get()):
-            return 1
 
-    def Checkbutton2(self):
-        '''Function stores the functionality for the OWL network checkbutton'''
-        if (self.var2.get()):
-            return 1
+def CommandLine(args):
+    '''Function stores the information needed to execute the program via the command line '''
 
+    nets = args.both == 'both' or (args.nets == 'owl-nets' and args.owl != 'owl')
+    owl = args.both == 'both' or (args.owl == 'owl' and args.nets != 'owl-nets')
 
-    def Validate(self):
+    # import only the builders the run uses
+    import QueryRunner
 
-        if self.Checkbutton1() != 1 and self.Checkbutton2() != 1:
-            tkMessageBox.showwarning("Error", "Please select your file and indicate the type of network to build")
-            return 99
-        return 0 # means there is no error
+    if nets or args.cache or len(args.input) > 1:
+        import NETSRepresentation
 
-    def Complete(self):
-        tkMessageBox.showinfo("Program Finished", "Program is complete, you can find your files are in the same "
-                                                  "directory as your query")
-        root.quit()
-        return
+    if owl:
+        import OWLRepresentation
 
+    Startup()
 
-def InputParser():
-    ''' Function parses the input information if the user chooses to run the program via the command line '''
+    # all queries in the run share one pooled connection to the endpoint (opened when the first query is run)
+    if os.path.isfile(args.authentication):
+        QueryRunner.Configure(args.authentication, stream=args.stream, result_format=args.results_format)
 
-    parser = argparse.ArgumentParser(
-        description='OWL-NETS: NEtwork Entity Transformation for Statistical Learning. For program to run correctly the '
-                    'input arguments must be formatted as shown below.')
-    parser.add_argument('-a', '--input', help='name/path to SPARQL query file (e.g., Folder/Query1_query)')
-    parser.add_argument('-b', '--owl', help='type "owl" to generate OWL representation')
-    parser.add_argument('-c', '--nets', help='type "owl-nets" to generate OWL-NETS representation')
-    parser.add_argument('-d', '--both', help='type "both" to generate both representations')
+    # queries with the same triple patterns (up to variable names) reuse the query analysis and results of earlier
+    # queries - a batch of queries uses a temporary cache when no cache directory is given
+    location = args.cache or (tempfile.mkdtemp() if len(args.input) > 1 else None)
+    cache = NETSRepresentation.AnalysisCache(location) if location else None
 
+    # the temporary cache of a batch is removed even when a query in the batch fails
+    try:
+        if len(args.input) > 1:
+            import QueryCache
 
-    return parser
+            for group in QueryCache.Groups(args.input):
+                if len(group) > 1:
+                    print 'Equivalent query graphs: ' + ', '.join(group)
 
+        for input1 in args.input:
 
-def CommandLine(args):
-    '''Function stores the information needed to execute the program via the command line '''
+            # runs only OWL-NETS
+            if args.nets == 'owl-nets' and args.owl != 'owl':
+                NETSRepresentation.NETSNetworkBuilder(input1, Profiler(args), args.authentication, args.compress,
+                                                      args.edgelist, cache)
 
-    # runs only OWL-NETS
-    if args.nets == 'owl-nets' and args.owl != 'owl':
-        NETSRepresentation.NETSNetworkBuilder(args.input)
+            # runs only OWL
+            if args.owl == 'owl' and args.nets != 'owl-nets':
+                OWLRepresentation.OWLNetworkBuilder(input1, Profiler(args), args.authentication, args.compress,
+                                                    args.edgelist, cache)
 
-    # runs only OWL
-    if args.owl == 'owl' and args.nets != 'owl-nets':
-        OWLRepresentation.OWLNetworkBuilder(args.input)
+            # runs both OWL-NETS and OWL
+            if args.both == 'both':
+                NETSRepresentation.NETSNetworkBuilder(input1, Profiler(args), args.authentication, args.compress,
+                                                      args.edgelist, cache)
+                OWLRepresentation.OWLNetworkBuilder(input1, Profiler(args), args.authentication, args.compress,
+                                                    args.edgelist, cache)
 
-    # runs both OWL-NETS and OWL
-    if args.both == 'both':
-        NETSRepresentation.NETSNetworkBuilder(args.input)
-        OWLRepresentation.OWLNetworkBuilder(args.input)
+    finally:
+        if location and not args.cache:
+            shutil.rmtree(location)
 
+    QueryRunner.CloseClients()
 
 
     print "Program is complete!"
 
 
+def GUI(parser):
+    '''Function opens the OWL-NETS window, or prints the command line usage when no display or Tk is available '''
+
+    try:
+        import OWL_NETS_GUI
+        OWL_NETS_GUI.Run()
+    except (ImportError, RuntimeError) as error:
+        print >> sys.stderr, 'The OWL-NETS window is not available (' + str(error) + '); run OWL-NETS from the ' \
+                                                                                      'command line with --input'
+        parser.print_usage(sys.stderr)
+        sys.exit(2)
+
+
 
 if __name__ == "__main__":
 
@@ -154,8 +176,4 @@ if __name__ == "__main__":
     if args.input:
         CommandLine(args)
     else:
-        root = Tk()
-        root.lift()
-        root.attributes('-topmost', True)
-        my_gui = ProgramGUI(root)
-        root.mainloop()
\ No newline at end of file
+        GUI(parser)
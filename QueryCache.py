@@ -0,0 +1,358 @@
+##############################################################################################
+# QueryCache.py
+# Purpose: script stores the results of query-graph analysis on disk, keyed by the query's canonical triple patterns
+# version 1.2.0
+# date: 10.19.2026
+##############################################################################################
+
+
+# import module/script dependencies
+import cPickle
+import hashlib
+import inspect
+import os
+import re
+import shutil
+import tempfile
+import networkx as nx
+import QueryParser
+
+
+# version of the cache entry format (part of every cache version)
+FORMAT = 2
+
+# query variables (e.g., ?protein) and the label variables derived from them by QueryParser.NETSQueryParser
+VARIABLE = re.compile(r'\?(\w+)')
+
+
+
+def Version(functions):
+    '''
+    Function derives the version of a cache from the source code of the functions whose results it stores, the cache
+    entry format, and the networkx version (the cached graphs are networkx objects). Any change to the code of the
+    functions gives a new version, so entries written by older code are never read.
+    :param functions: list of functions
+    :return: string containing a hexadecimal digest
+    '''
+    digest = hashlib.sha1(str(FORMAT) + ':' + nx.__version__)
+
+    for function in functions:
+        digest.update(inspect.getsource(function))
+
+    return digest.hexdigest()
+
+
+def Terms(triple):
+    '''
+    Function splits a triple from a SPARQL query into its subject, predicate, and object (an object may be a string
+    containing spaces, as in NETSRepresentation.GraphMaker).
+    :param triple: string containing a triple
+    :return: tuple of three strings
+    '''
+    parts = triple.split()
+
+    return parts[0], parts[1], ' '.join(parts[2:])
+
+
+def Refine(triples, colors):
+    '''
+    Function refines the colors of the variables of a query (Weisfeiler-Lehman refinement): the new color of a variable
+    is the rank of its current color together with the sorted colors of every triple it appears in and its position in
+    the triple, where constants (prefixed names and literals) are colored by their text. Refinement is repeated until
+    the number of colors stops growing. Colors only depend on the structure of the query, not on the variable names.
+    :param triples: list of tuples storing the subject, predicate, and object of each triple
+    :param colors: dictionary where the keys are the variables and the values are integers
+    :return: dictionary where the keys are the variables and the values are integers (ranks from 0)
+    '''
+    count = len(set(colors.values()))
+
+    while True:
+        signatures = dict([(var, []) for var in colors])
+
+        for triple in triples:
+            terms = tuple([(0, colors[term]) if term in colors else (1, term) for term in triple])
+
+            for position, term in enumerate(triple):
+                if term in colors:
+                    signatures[term].append((position,) + terms)
+
+        signatures = dict([(var, (colors[var], tuple(sorted(found)))) for var, found in signatures.items()])
+        ranks = dict([(signature, rank) for rank, signature in enumerate(sorted(set(signatures.values())))])
+        colors = dict([(var, ranks[signature]) for var, signature in signatures.items()])
+
+        if len(ranks) == count:
+            return colors
+
+        count = len(ranks)
+
+
+def Orbit(var, prefix, automorphisms):
+    # returns the variables a variable is mapped to by the automorphisms which fix every variable of the prefix
+    automorphisms = [auto for auto in automorphisms if all([auto[fixed] == fixed for fixed in prefix])]
+    orbit, stack = set([var]), [var]
+
+    while stack:
+        current = stack.pop()
+
+        for auto in automorphisms:
+            if auto[current] not in orbit:
+                orbit.add(auto[current])
+                stack.append(auto[current])
+
+    return orbit
+
+
+def Search(triples, colors, prefix, state):
+    '''
+    Function searches for the canonical labelling of a query. Colors are refined and, while several variables share a
+    color, each of them is in turn given a color of its own and the colors are refined again. Every complete labelling
+    names the variables ?v0, ?v1, ... by color and the smallest sorted list of renamed triples is the canonical form.
+    Two labellings with the same form give an automorphism of the query, which is used to skip variables that lead to
+    labellings already found.
+    :param triples: list of tuples storing the subject, predicate, and object of each triple
+    :param colors: dictionary where the keys are the variables and the values are integers
+    :param prefix: list of the variables given their own color so far
+    :param state: dictionary storing the best form, its mapping, and the automorphisms found
+    '''
+    colors = Refine(triples, colors)
+    cells = {}
+
+    for var, color in colors.items():
+        cells.setdefault(color, []).append(var)
+
+    ties = [color for color in sorted(cells) if len(cells[color]) > 1]
+
+    if not ties:
+        mapping = dict([(var, '?v' + str(color)) for var, color in colors.items()])
+        form = sorted([tuple([mapping.get(term, term) for term in triple]) for triple in triples])
+
+        if state['form'] is None or form < state['form']:
+            state['form'], state['mapping'] = form, mapping
+
+        elif form == state['form']:
+            inverse = dict([(name, var) for var, name in state['mapping'].items()])
+            state['automorphisms'].append(dict([(var, inverse[name]) for var, name in mapping.items()]))
+
+        return
+
+    explored = []
+
+    for var in sorted(cells[ties[0]]):
+        if [other for other in explored if var in Orbit(other, prefix, state['automorphisms'])]:
+            continue
+
+        explored.append(var)
+        individualized = dict([(other, 2 * color + (other != var)) for other, color in colors.items()])
+        Search(triples, individualized, prefix + [var], state)
+
+
+def Canonical(triples):
+    '''
+    Function computes the canonical form of the triple patterns of a query. Queries which differ only in the names of
+    their variables or the order of their triples have the same canonical form. FILTER clauses, LIMIT, and the prefixes
+    and select statement are not triple patterns, so they are not part of the form (see ResultKey).
+    :param triples: list of strings, where each string is a triple from a SPARQL query (QueryParser.QueryParser()[0])
+    :return: a list where list[0] is a string containing the hexadecimal digest of the canonical form and list[1] is a
+    dictionary mapping each variable of the query to its canonical name (?v0, ?v1, ...)
+    '''
+    triples = [Terms(triple) for triple in triples]
+    variables = set([term for triple in triples for term in triple if term.startswith('?')])
+    state = {'form': None, 'mapping': {}, 'automorphisms': []}
+    Search(triples, dict([(var, 0) for var in variables]), [], state)
+
+    return [hashlib.sha1('\n'.join([' '.join(triple) for triple in state['form'] or []])).hexdigest(),
+            state['mapping']]
+
+
+def Key(triples):
+    '''
+    Function derives the cache key of a query from the canonical form of its triple patterns (see Canonical).
+    :param triples: list of strings, where each string is a triple from a SPARQL query
+    :return: string containing a hexadecimal digest
+    '''
+
+    return Canonical(triples)[0]
+
+
+def TripleKey(triples):
+    '''
+    Function derives the cache key of the exact triple patterns of a query (in order, with whitespace normalized). The
+    analysis of a query is stored under this key with the query's own variable names, so running the same query again
+    needs neither its canonical form nor renaming (see NETSRepresentation.QueryAnalysis).
+    :param triples: list of strings, where each string is a triple from a SPARQL query
+    :return: string containing the key
+    '''
+
+    return 'query-' + hashlib.sha1('\n'.join([' '.join(triple.split()) for triple in triples])).hexdigest()
+
+
+def Rename(value, mapping):
+    '''
+    Function renames the variables in a value, e.g., to move the query analysis of one query to an equivalent query.
+    The label variables QueryParser.NETSQueryParser adds for a variable (?protein_name) are renamed with it.
+    :param value: string, networkx graph, or list, tuple, set, or dictionary of them
+    :param mapping: dictionary where the keys are variables and the values are their new names (with '?')
+    :return: a copy of the value with the variables renamed
+    '''
+    if isinstance(value, basestring):
+        def Replace(match):
+            var = match.group(0)
+
+            if var in mapping:
+                return mapping[var]
+
+            if var.endswith('_name') and var[:-5] in mapping:
+                return mapping[var[:-5]] + '_name'
+
+            return var
+
+        return VARIABLE.sub(Replace, value)
+
+    if isinstance(value, nx.Graph):
+        graph = value.__class__()
+        graph.add_nodes_from([(Rename(node, mapping), Rename(data, mapping)) for node, data in value.nodes(data=True)])
+        graph.add_edges_from([(Rename(i, mapping), Rename(j, mapping), Rename(data, mapping))
+                              for i, j, data in value.edges(data=True)])
+        return graph
+
+    if isinstance(value, dict):
+        return dict([(Rename(key, mapping), Rename(item, mapping)) for key, item in value.items()])
+
+    if isinstance(value, (list, tuple, set)):
+        return value.__class__([Rename(item, mapping) for item in value])
+
+    return value
+
+
+def ResultKey(query_text, canonical):
+    '''
+    Function derives the cache key of the results of a query. Queries get the same results when their triple patterns
+    have the same canonical form and their FILTER clauses (with the variables renamed to their canonical names), LIMIT,
+    DISTINCT, and prefixes are the same.
+    :param query_text: a list of lists where list[0] is a list of triples and list[1] is a list of query components
+    (i.e., prefixes and query body), as returned by QueryParser.QueryParser
+    :param canonical: the canonical form of the query's triples (see Canonical)
+    :return: string containing the key
+    '''
+    key, mapping = canonical
+    body = query_text[1][1]
+    prefixes = sorted([' '.join(x.split()) for x in query_text[1][0].split('\n')
+                       if re.search(r'\bprefix\b', x, re.IGNORECASE)])
+    features = sorted([Rename(' '.join(x.split()), mapping) for x in QueryParser.QueryFeature(body).split('\n')
+                       if x.strip()])
+    limit = ' '.join(body[body.index('LIMIT'):].split()) if 'LIMIT' in body else ''
+    distinct = str(re.search(r'\bdistinct\b', body, re.IGNORECASE) is not None)
+
+    return 'results-' + hashlib.sha1('\n'.join([key, distinct, limit] + prefixes + features)).hexdigest()
+
+
+def Groups(inputs):
+    '''
+    Function groups query files whose triple patterns have the same canonical form (see Canonical), i.e., queries that
+    differ only in variable names, triple order, FILTER clauses, or LIMIT.
+    :param inputs: list of strings containing the file path/name of SPARQL queries
+    :return: list of lists of file path/names, one list per distinct canonical form (in the order of the inputs)
+    '''
+    groups = {}
+    order = []
+
+    for input1 in inputs:
+        key = Key(QueryParser.QueryParser(input1)[0])
+
+        if key not in groups:
+            groups[key] = []
+            order.append(key)
+
+        groups[key].append(input1)
+
+    return [groups[key] for key in order]
+
+
+class QueryCache:
+    '''
+    Class stores picklable values on disk with one file per key, in a directory named by the cache version (see
+    Version). Entries are written to a temporary file which is then renamed, so concurrent runs never read a partial
+    entry. Entries read from disk are kept in memory as pickled strings, and every lookup returns a new copy, so a
+    caller can modify the value it gets without changing the cache.
+    :param location: string containing the path of the cache directory (created if it does not exist)
+    :param version: string containing the cache version
+    '''
+
+    def __init__(self, location, version):
+        self.location = location
+        self.version = version
+        self.directory = os.path.join(location, version)
+        self.memory = {}
+        self.canonical = {}
+
+        # several processes may open the same cache at once (e.g., the workers of BuildService)
+        try:
+            os.makedirs(self.directory)
+        except OSError:
+            if not os.path.isdir(self.directory):
+                raise
+
+    def Canonical(self, triples):
+        '''
+        Function returns the canonical form of the triple patterns of a query (see Canonical), computed once per
+        distinct list of triples.
+        :param triples: list of strings, where each string is a triple from a SPARQL query
+        :return: a list where list[0] is the key of the canonical form and list[1] maps the variables to their
+        canonical names
+        '''
+        key = tuple(triples)
+
+        if key not in self.canonical:
+            self.canonical[key] = Canonical(triples)
+
+        return self.canonical[key]
+
+    def Path(self, key):
+        return os.path.join(self.directory, key + '.pickle')
+
+    def Get(self, key):
+        '''
+        Function returns the value stored for a key.
+        :param key: string containing the key
+        :return: the stored value or None if the key is not stored (or the entry cannot be read)
+        '''
+        if key not in self.memory:
+            try:
+                with open(self.Path(key), 'rb') as entry:
+                    self.memory[key] = entry.read()
+            except IOError:
+                return None
+
+        try:
+            return cPickle.loads(self.memory[key])
+        except (cPickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError):
+            del self.memory[key]
+            return None
+
+    def Put(self, key, value):
+        '''
+        Function stores the value of a key.
+        :param key: string containing the key
+        :param value: picklable value
+        '''
+        data = cPickle.dumps(value, cPickle.HIGHEST_PROTOCOL)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+
+        with os.fdopen(handle, 'wb') as entry:
+            entry.write(data)
+
+        os.rename(temporary, self.Path(key))
+        self.memory[key] = data
+
+    def Prune(self):
+        '''
+        Function removes the entries written by other versions of the cache.
+        :return: integer representing the number of versions removed
+        '''
+        stale = [name for name in os.listdir(self.location) if name != self.version and
+                 os.path.isdir(os.path.join(self.location, name))]
+
+        for name in stale:
+            shutil.rmtree(os.path.join(self.location, name))
+
+        return len(stale)
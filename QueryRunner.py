@@ -1,17 +1,23 @@
 ########################
 # QueryRunner.py
 # Purpose: script runs SPARQL queries against a user-specified endpoint
-# version 1.1.0
-# date: 07.23.2017
+# version 1.3.1
+# date: 10.19.2026
 ########################
 
 
 ## import module/script dependencies
+import io
+import json
 import os
-import requests
-from SPARQLWrapper import SPARQLWrapper, JSON
-import urllib2
 from datetime import datetime
+import BindingTable
+
+
+# content types of the supported result formats
+FORMATS = {'json': 'application/sparql-results+json',
+           'tsv': 'text/tab-separated-values',
+           'csv': 'text/csv'}
 
 
 def Authenticate(input_file):
@@ -38,46 +44,149 @@ def Authenticate(input_file):
             return data
 
 
-def RunQuery(query_body, input_file):
+class EndpointClient:
     '''
-    Function takes a string representing the body of a query, and a list of strings needed to authenticate connection
-    to knowledge source. Once authenticated, the function runs the query in query_body and returns a JSON
-    files containing the query results.
-    :param query_body: updated SPARQL query represented as a single string
+    Class stores a persistent connection to a SPARQL endpoint. Connections are pooled and kept alive between queries,
+    responses are requested gzip-compressed, and the response body can be streamed into the parser rather than read
+    into memory first. Results can be requested as SPARQL JSON or as the more compact TSV or CSV formats, which avoid
+    the per-value type wrappers of JSON and are parsed one row at a time. The credentials are sent with every query,
+    so a failed login is reported by the query itself and no separate validation request is made.
+    :param url: string containing the endpoint url
+    :param user: string containing the username (blank if not required)
+    :param password: string containing the password (blank if not required)
+    :param pool_size: integer representing the number of connections kept open to the endpoint
+    :param stream: boolean indicating whether the response body is parsed as it is read
+    :param result_format: string containing the format results are requested in ('json', 'tsv', or 'csv')
+    '''
+
+    def __init__(self, url, user=' ', password=' ', pool_size=4, stream=False, result_format='json'):
+        self.url = url
+        self.stream = stream
+        self.result_format = result_format
+
+        # requests is only imported when a client is created (runs using cached results never load it)
+        import requests
+        import requests.adapters
+
+        self.session = requests.Session()
+
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.session.auth = (user, password)
+        self.session.headers.update({'Accept': FORMATS[result_format],
+                                     'Accept-Encoding': 'gzip, deflate',
+                                     'Connection': 'keep-alive'})
+
+    def Query(self, query_body):
+        '''
+        Function runs a query against the endpoint using a pooled connection.
+        :param query_body: SPARQL query represented as a single string
+        :return: a BindingTable storing the results
+        '''
+        response = self.session.post(self.url, data={'query': query_body}, stream=self.stream)
+
+        if response.status_code != 200:
+            response.raise_for_status()
+
+        # endpoints which cap the rows of a response (e.g., Virtuoso's ResultSetMaxRows) mark a capped response
+        if response.headers.get('X-SPARQL-MaxRows'):
+            response.close()
+            raise ValueError('The endpoint returned at most ' + response.headers['X-SPARQL-MaxRows'] + ' results, so '
+                             'the results are incomplete; raise the row limit of the endpoint or restrict the query')
+
+        if self.stream:
+            response.raw.decode_content = True
+            body = response.raw
+        else:
+            body = io.BytesIO(response.content)
+
+        if self.result_format == 'tsv':
+            return BindingTable.ReadTSV(body)
+
+        if self.result_format == 'csv':
+            return BindingTable.ReadCSV(body)
+
+        return BindingTable.FromJSON(json.load(body))
+
+    def Close(self):
+        self.session.close()
+
+
+# clients shared by all queries in a run, keyed by authentication file
+CLIENTS = {}
+
+# settings of the clients created by Client, keyed by authentication file (see Configure)
+SETTINGS = {}
+
+
+def Configure(input_file, stream=False, result_format='json'):
+    '''
+    Function stores the settings of the EndpointClient for an endpoint without creating it. The client is created with
+    these settings when the first query is run, so a run which only uses cached results never connects to the endpoint.
     :param input_file: a string containing a file path to a file containing authentication information
-    :return: a JSON file containing the output of running the query against the endpoint
+    :param stream: boolean indicating whether the response body is parsed as it is read
+    :param result_format: string containing the format results are requested in
     '''
-    # get authentication information
-    authentication = Authenticate(input_file)
 
-    # CHECK: verify provided endpoint credentials
-    request = requests.get(authentication[0], auth=(authentication[1], authentication[2]))
+    SETTINGS[input_file] = {'stream': stream, 'result_format': result_format}
 
-    if request.status_code != 200:
-        request.raise_for_status()
 
-    else:
-        # set-up endpoint proxy
-        proxy = urllib2.ProxyHandler()
-        opener = urllib2.build_opener(proxy)
-        urllib2.install_opener(opener)
+def Client(input_file, stream=None, result_format=None):
+    '''
+    Function takes a string containing a file path to a file containing authentication information and returns the
+    EndpointClient for that endpoint. The client is created the first time it is requested and shared by every later
+    query, so the connections to the endpoint are reused across a batch of queries.
+    :param input_file: a string containing a file path to a file containing authentication information
+    :param stream: boolean indicating whether the response body is parsed as it is read (only used when the client is
+    created; None uses the setting stored by Configure or False)
+    :param result_format: string containing the format results are requested in (only used when the client is created;
+    None uses the setting stored by Configure or 'json')
+    :return: an EndpointClient for the endpoint
+    '''
+    if input_file not in CLIENTS:
+        settings = SETTINGS.get(input_file, {})
+        stream = settings.get('stream', False) if stream is None else stream
+        result_format = settings.get('result_format', 'json') if result_format is None else result_format
+        authentication = Authenticate(input_file)
+        CLIENTS[input_file] = EndpointClient(authentication[0], authentication[1], authentication[2], stream=stream,
+                                             result_format=result_format)
 
-        # connect to knowledge source
-        endpoint = SPARQLWrapper(authentication[0])
-        endpoint.setCredentials(user = authentication[1], passwd = authentication[2])
-        endpoint.setReturnFormat(JSON)  # query output format
+    return CLIENTS[input_file]
 
-        print str('Started running query at: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
-        # run query against KaBOB
-        endpoint.setQuery(query_body)
-        query_results = endpoint.query().convert()
+def CloseClients():
+    '''Function closes the connections of every shared EndpointClient'''
 
-        print str('Finished running query at: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        print '\n'
+    for client in CLIENTS.values():
+        client.Close()
 
-        # verify that query worked
-        if len(query_results['results'].items()) < 1:
-            print 'ERROR: query returned no results'
-        else:
-            return query_results
\ No newline at end of file
+    CLIENTS.clear()
+
+
+def RunQuery(query_body, input_file):
+    '''
+    Function takes a string representing the body of a query, and a list of strings needed to authenticate connection
+    to knowledge source. The query is run using the shared EndpointClient for the endpoint and the function returns a
+    BindingTable containing the query results.
+    :param query_body: updated SPARQL query represented as a single string
+    :param input_file: a string containing a file path to a file containing authentication information
+    :return: a BindingTable containing the output of running the query against the endpoint
+    '''
+    # connect to knowledge source
+    endpoint = Client(input_file)
+
+    print str('Started running query at: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+    # run query against KaBOB
+    query_results = endpoint.Query(query_body)
+
+    print str('Finished running query at: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    print '\n'
+
+    # verify that query worked
+    if len(query_results) < 1:
+        print 'ERROR: query returned no results'
+
+    return query_results
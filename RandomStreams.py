@@ -0,0 +1,68 @@
+##############################################################################################
+# RandomStreams.py
+# Purpose: script derives independent, reproducible random number streams for experiment tasks
+# version 1.0.0
+# date: 10.19.2026
+##############################################################################################
+
+
+# import module/script dependencies
+import hashlib
+import random
+
+
+# number of bits of a task seed (fits the INTEGER seed column of the result store)
+BITS = 62
+
+
+
+def RootSeed():
+    '''
+    Function draws a new root seed for an experiment from the operating system's entropy source.
+    :return: integer representing the root seed
+    '''
+
+    return random.SystemRandom().getrandbits(BITS)
+
+
+def TaskSeed(root, method, step, iteration):
+    '''
+    Function derives the seed of one experiment task (a method, step, and iteration) from the root seed of the
+    experiment. The seed is a hash of the root seed and the task, so it does not depend on which process runs the task,
+    on the number of processes, or on the order the tasks are run in, and the seeds of different tasks are independent.
+    :param root: integer representing the root seed of the experiment
+    :param method: string containing the name of the method
+    :param step: float representing the fraction of edges sampled
+    :param iteration: integer representing the iteration
+    :return: integer representing the seed of the task
+    '''
+
+    key = '%d:%s:%r:%d' % (root, method, float(step), iteration)
+
+    return int(hashlib.sha256(key).hexdigest(), 16) >> (256 - BITS)
+
+
+def Stream(seed):
+    '''
+    Function creates the random number generator of a task. A task seed (e.g., one read from the result store) always
+    replays the same sampling.
+    :param seed: integer representing the seed of the task
+    :return: random.Random instance
+    '''
+
+    return random.Random(seed)
+
+
+def TaskStream(root, method, step, iteration):
+    '''
+    Function derives the seed of an experiment task and creates its random number generator.
+    :param root: integer representing the root seed of the experiment
+    :param method: string containing the name of the method
+    :param step: float representing the fraction of edges sampled
+    :param iteration: integer representing the iteration
+    :return: tuple where tuple[0] is the seed of the task and tuple[1] is its random.Random instance
+    '''
+
+    seed = TaskSeed(root, method, step, iteration)
+
+    return seed, Stream(seed)
@@ -0,0 +1,232 @@
+##############################################################################################
+# ResultStore.py
+# Purpose: script stores link prediction sweep results as rows of a SQLite table
+# version 1.1.1
+# date: 10.19.2026
+##############################################################################################
+
+
+# import module/script dependencies
+import json
+import os
+import sqlite3
+import numpy as np
+import RandomStreams
+
+
+# columns of the results table (one row per graph, method, step, and iteration)
+COLUMNS = [('graph', 'TEXT'), ('method', 'TEXT'), ('step', 'REAL'), ('iteration', 'INTEGER'), ('seed', 'INTEGER'),
+           ('auc', 'REAL'), ('precision', 'REAL'), ('seconds', 'REAL')]
+
+# aggregate functions supported by ResultStore.Aggregate
+AGGREGATES = {'mean': 'AVG', 'min': 'MIN', 'max': 'MAX', 'sum': 'SUM', 'count': 'COUNT'}
+
+# result stores opened by Record, keyed by process id and database (a forked worker opens its own connection)
+STORES = {}
+
+
+
+class ResultStore:
+    '''
+    Class stores the results of link prediction sweeps in a SQLite database with one row per graph, method, step,
+    iteration, and seed (auc, precision, and wall time in seconds). Rows are committed as they are appended, so a
+    sweep can be read (or resumed) while it runs, and several worker processes can append to the same file. Each
+    append is a single transaction, so a crash never leaves a partial row or a corrupt file. The root seed of each
+    graph's sweep is also stored, so a resumed sweep derives the same iteration seeds. Reads only select the requested
+    columns and aggregation is done by SQLite with GROUP BY.
+    :param location: string containing the file path/name of the database (created if it does not exist)
+    '''
+
+    def __init__(self, location):
+        self.location = location
+        self.connection = sqlite3.connect(location, timeout=60)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS results (' +
+                                ', '.join([name + ' ' + kind for name, kind in COLUMNS]) + ')')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS results_run ON results (graph, method, step)')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS sweeps (graph TEXT PRIMARY KEY, seed INTEGER)')
+        self.connection.commit()
+
+    def Append(self, rows):
+        '''
+        Function appends rows to the results table.
+        :param rows: list of tuples or dictionaries storing the values of the columns (in the order of COLUMNS)
+        :return: integer representing the number of rows appended
+        '''
+        names = [name for name, _ in COLUMNS]
+        rows = [[row.get(name) for name in names] if isinstance(row, dict) else list(row) for row in rows]
+
+        with self.connection:
+            self.connection.executemany('INSERT INTO results VALUES (' + ', '.join(['?'] * len(names)) + ')', rows)
+
+        return len(rows)
+
+    @staticmethod
+    def Where(filters):
+        # converts keyword filters into a WHERE clause (a list or tuple value matches any of its items)
+        clauses, values = [], []
+
+        for name, value in sorted(filters.items()):
+            if name not in dict(COLUMNS):
+                raise ValueError('Unknown result column: ' + str(name))
+
+            value = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            clauses.append(name + ' IN (' + ', '.join(['?'] * len(value)) + ')')
+            values.extend(value)
+
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), values
+
+    def Columns(self, columns, **filters):
+        '''
+        Function reads the requested columns of the rows which match the filters.
+        :param columns: list of strings containing the column names
+        :param filters: column names and the value (or list of values) the rows must match
+        :return: dictionary where the keys are the column names and the values are numpy arrays
+        '''
+        for name in columns:
+            if name not in dict(COLUMNS):
+                raise ValueError('Unknown result column: ' + str(name))
+
+        where, values = self.Where(filters)
+        rows = self.connection.execute('SELECT ' + ', '.join(columns) + ' FROM results' + where, values).fetchall()
+
+        return dict([(name, np.array([row[i] for row in rows])) for i, name in enumerate(columns)])
+
+    def Aggregate(self, values=('auc', 'precision'), by=('graph', 'method', 'step'), function='mean', **filters):
+        '''
+        Function aggregates columns over the rows of each group (e.g., the mean AUC of every graph, method, and step).
+        :param values: list of strings containing the columns which are aggregated
+        :param by: list of strings containing the columns the rows are grouped by
+        :param function: string containing the aggregate function ('mean', 'min', 'max', 'sum', or 'count')
+        :param filters: column names and the value (or list of values) the rows must match
+        :return: dictionary where the keys are the group and aggregated column names and the values are numpy arrays,
+        one element per group (sorted by the group columns)
+        '''
+        names = list(by) + list(values)
+
+        for name in names:
+            if name not in dict(COLUMNS):
+                raise ValueError('Unknown result column: ' + str(name))
+
+        where, parameters = self.Where(filters)
+        select = list(by) + [AGGREGATES[function] + '(' + name + ')' for name in values]
+        group = ' GROUP BY ' + ', '.join(by) + ' ORDER BY ' + ', '.join(by) if by else ''
+        rows = self.connection.execute('SELECT ' + ', '.join(select) + ' FROM results' + where + group,
+                                       parameters).fetchall()
+
+        return dict([(name, np.array([row[i] for row in rows])) for i, name in enumerate(names)])
+
+    def Seed(self, graph, seed=None):
+        '''
+        Function returns the root seed of a graph's sweep. The first call for a graph stores the seed (or a new root
+        seed when seed is None) and later calls return the stored seed, so that resumed sweeps derive the same seeds.
+        :param graph: string containing the name of the graph
+        :param seed: integer representing the root seed (None uses the stored seed or draws a new one)
+        :return: integer representing the root seed
+        '''
+        with self.connection:
+            self.connection.execute('INSERT OR IGNORE INTO sweeps VALUES (?, ?)',
+                                    (graph, RandomStreams.RootSeed() if seed is None else seed))
+            stored = self.connection.execute('SELECT seed FROM sweeps WHERE graph = ?', (graph,)).fetchone()[0]
+
+        if seed is not None and seed != stored:
+            raise ValueError('The sweep of ' + graph + ' was started with root seed ' + str(stored) + ', not ' +
+                             str(seed))
+
+        return stored
+
+    def Completed(self, graph, method, step):
+        '''
+        Function returns the iterations of a sweep which have already been recorded.
+        :param graph: string containing the name of the graph
+        :param method: string containing the name of the method
+        :param step: float representing the fraction of edges sampled
+        :return: set of integers representing the recorded iterations
+        '''
+        rows = self.connection.execute('SELECT DISTINCT iteration FROM results WHERE graph = ? AND method = ? AND '
+                                       'step = ?', (graph, method, step)).fetchall()
+
+        return set([row[0] for row in rows])
+
+    def Merge(self, location):
+        '''
+        Function appends the rows of another result store (e.g., a subset of a sweep run on another machine) which are
+        not already recorded for the same graph, method, step, and iteration. The stores must use the same root seed
+        for the graphs they share.
+        :param location: string containing the file path/name of the other database
+        :return: integer representing the number of rows appended
+        '''
+        other = ResultStore(location)
+
+        try:
+            for graph, seed in other.connection.execute('SELECT graph, seed FROM sweeps').fetchall():
+                self.Seed(graph, seed)
+
+            names = [name for name, _ in COLUMNS]
+            rows = other.connection.execute('SELECT ' + ', '.join(names) + ' FROM results').fetchall()
+        finally:
+            other.Close()
+
+        keys = set(self.connection.execute('SELECT graph, method, step, iteration FROM results').fetchall())
+        new_rows = []
+
+        for row in rows:
+            if tuple(row[:4]) not in keys:
+                keys.add(tuple(row[:4]))
+                new_rows.append(row)
+
+        return self.Append(new_rows)
+
+    def ImportJSON(self, location, graph, method, steps):
+        '''
+        Function appends the results of a sweep written by an earlier version of NetworkInference (a JSON list with one
+        element per step, where each element is a list of [AUC values, precision values] or a list of AUC values).
+        :param location: string containing the file path/name of the JSON results
+        :param graph: string containing the name of the graph
+        :param method: string containing the name of the method
+        :param steps: list of the fraction of edges sampled at each step
+        :return: integer representing the number of rows appended
+        '''
+        rows = []
+
+        with open(location) as json_data:
+            for step, result in zip(steps, json.load(json_data)):
+                auc, precision = result if len(result) == 2 else (result, [None] * len(result))
+
+                for iteration, (auc_round, prec_round) in enumerate(zip(auc, precision)):
+                    rows.append((graph, method, step, iteration, None, auc_round, prec_round, None))
+
+        return self.Append(rows)
+
+    def Close(self):
+        self.connection.close()
+
+
+def Record(location, graph, method, step, iteration, auc, precision, seconds, seed=None):
+    '''
+    Function appends the result of one sweep iteration to a result store. The function only takes picklable arguments
+    so that it can be passed to worker processes (e.g., with functools.partial). Each process opens the store once and
+    keeps it open for its later iterations (see CloseStores); every row is still committed as it is appended.
+    :param location: string containing the file path/name of the database
+    :param graph: string containing the name of the graph
+    :param method: string containing the name of the method
+    :param step: float representing the fraction of edges sampled
+    :param iteration: integer representing the iteration
+    :param auc: float representing the AUC of the iteration
+    :param precision: float representing the precision of the iteration
+    :param seconds: float representing the wall time of the iteration
+    :param seed: integer representing the seed of the iteration
+    '''
+    key = (os.getpid(), location)
+
+    if key not in STORES:
+        STORES[key] = ResultStore(location)
+
+    STORES[key].Append([(graph, method, step, iteration, seed, auc, precision, seconds)])
+
+
+def CloseStores():
+    '''Function closes the result stores opened by Record in this process'''
+
+    for key in [key for key in STORES if key[0] == os.getpid()]:
+        STORES.pop(key).Close()